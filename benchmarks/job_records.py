@@ -0,0 +1,61 @@
+"""
+Compares the construction cost and memory of the jobs built by parsers,
+as validated pydantic models and as trusted JobRecord.
+
+    python -m benchmarks.job_records
+"""
+
+import timeit
+import tracemalloc
+from typing import Any, Dict
+
+from sauron.models import ConditionModel, JobRecord
+from sauron.parsers import RuleEngineParser
+
+from .parse_formats import build_rule
+
+JOB: Dict[str, Any] = {"name": "is_positive", "args": {"number": 1}}
+
+
+def construction_ns(build, number: int = 20000) -> float:
+    return min(timeit.repeat(build, number=number, repeat=5)) / number * 1e9
+
+
+def memory_per_job(build, count: int = 10000) -> float:
+    tracemalloc.start()
+    jobs = [build() for _ in range(count)]
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del jobs
+    return current / count
+
+
+def main(jobs_count: int = 500):
+    builders = {
+        "JobModel": lambda: ConditionModel(**JOB),
+        "model_construct": lambda: ConditionModel.model_construct(**JOB),
+        "JobRecord": lambda: JobRecord(
+            JOB["name"], dict(JOB["args"]), "condition"
+        ),
+    }
+    print(f"{'job':>16} {'ns/job':>8} {'bytes/job':>10}")
+    for label, build in builders.items():
+        print(
+            f"{label:>16} {construction_ns(build):>8.0f} "
+            f"{memory_per_job(build):>10.0f}"
+        )
+
+    rule = build_rule(jobs_count)
+    print(f"\nparsing a rule with {jobs_count} jobs, ms")
+    for trusted in (False, True):
+        parser = RuleEngineParser(trusted=trusted)
+        elapsed = min(
+            timeit.repeat(
+                lambda parser=parser: parser.parse(rule), number=20, repeat=5
+            )
+        )
+        print(f"  trusted={trusted!s:<5} {elapsed / 20 * 1000:8.3f}")
+
+
+if __name__ == "__main__":
+    main()
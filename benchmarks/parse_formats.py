@@ -0,0 +1,52 @@
+"""
+Compares the time spent decoding the same rule as json and as yaml.
+
+    python -m benchmarks.parse_formats
+"""
+
+import json
+import timeit
+
+from sauron.parsers import RuleEngineParser
+
+
+def build_rule(jobs_count: int) -> dict:
+    return {
+        "conditions": [
+            {"name": f"condition_{i}", "args": {"value": i, "limit": 10}}
+            for i in range(jobs_count // 2)
+        ],
+        "actions": [
+            {"name": f"action_{i}", "args": {"rate": 0.1, "label": "x"}}
+            for i in range(jobs_count // 2)
+        ],
+    }
+
+
+def main(repeat: int = 20):
+    print(f"{'jobs':>6} {'json (ms)':>10} {'yaml (ms)':>10} {'speedup':>8}")
+    for jobs_count in (10, 100, 500):
+        rule_text = json.dumps(build_rule(jobs_count))
+        timings = {}
+        for fmt in ("json", "yaml"):
+            timings[fmt] = (
+                min(
+                    timeit.repeat(
+                        lambda fmt=fmt, rule_text=rule_text: (
+                            RuleEngineParser().parse(rule_text, fmt=fmt)
+                        ),
+                        number=1,
+                        repeat=repeat,
+                    )
+                )
+                * 1000
+            )
+        print(
+            f"{jobs_count:>6} {timings['json']:>10.3f} "
+            f"{timings['yaml']:>10.3f} "
+            f"{timings['yaml'] / timings['json']:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
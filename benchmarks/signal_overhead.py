@@ -0,0 +1,65 @@
+"""
+Compares the cost of running a rule with and without signal receivers.
+
+    python -m benchmarks.signal_overhead
+"""
+
+import timeit
+
+from sauron.rule_engine import RuleEngine
+
+SIGNAL_NAMES = (
+    "pre_engine_run",
+    "post_engine_run",
+    "pre_job_call",
+    "post_job_call",
+)
+
+
+def build_engine(jobs_count: int):
+    engine = RuleEngine()
+
+    @engine.condition()
+    def always_true(session) -> bool:
+        return True
+
+    @engine.action()
+    def noop(session) -> None:
+        return None
+
+    rule = engine.compile(
+        {
+            "conditions": [{"name": "always_true"}] * (jobs_count // 2),
+            "actions": [{"name": "noop"}] * (jobs_count // 2),
+        }
+    )
+    return engine, rule
+
+
+def receiver(sender, **kwargs):
+    return None
+
+
+def measure(engine, rule, number: int) -> float:
+    def run():
+        engine.run(rule, {})
+
+    return min(timeit.repeat(run, number=number, repeat=5)) / number * 1e6
+
+
+def main(jobs_count: int = 10, number: int = 2000):
+    engine, rule = build_engine(jobs_count)
+    signals_off = measure(engine, rule, number)
+
+    for name in SIGNAL_NAMES:
+        engine.get_signal(name).connect(receiver, sender=engine)
+    signals_on = measure(engine, rule, number)
+
+    print(f"rule with {jobs_count} jobs, microseconds per run")
+    print(f"  signals off: {signals_off:8.2f}")
+    print(f"  signals on:  {signals_on:8.2f}")
+    print(f"  overhead:    {signals_on / signals_off - 1:8.1%}")
+
+
+if __name__ == "__main__":
+    main()
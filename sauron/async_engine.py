@@ -0,0 +1,274 @@
+import asyncio
+from time import perf_counter_ns
+from typing import Any, Dict, MutableMapping, Optional, Tuple, cast
+
+from .compiled import CompiledJob, CompiledRule, RuleInput
+from .context import ExecutionContext
+from .engine import Engine
+from .profiler import RunProfile, SamplingProfiler
+from .rule_engine import RuleEngine
+from .tracing import Span
+
+
+class AsyncEngine(Engine):
+    """
+    Engine whose jobs can be coroutine functions. Coroutine jobs are
+    awaited, regular jobs run inline or, with run_sync_in_thread, in the
+    default thread pool so they don't block the event loop.
+
+    With concurrent_conditions, consecutive conditions are evaluated
+    concurrently and the first falsy one cancels the coroutine ones still
+    pending. Regular conditions still running in threads are abandoned
+    """
+
+    supports_async_jobs: bool = True
+    run_sync_in_thread: bool = False
+    concurrent_conditions: bool = False
+
+    def __init__(
+        self,
+        *args,
+        run_sync_in_thread: Optional[bool] = None,
+        concurrent_conditions: Optional[bool] = None,
+        **kwargs,
+    ):
+        super().__init__(*args, **kwargs)
+        if run_sync_in_thread is not None:
+            self.run_sync_in_thread = run_sync_in_thread
+        if concurrent_conditions is not None:
+            self.concurrent_conditions = concurrent_conditions
+
+    def _check_sync_rule(self, compiled_rule: CompiledRule) -> None:
+        for job in compiled_rule.jobs:
+            if job.is_async:
+                raise ValueError(
+                    f"Job '{job.name}' is a coroutine function, use arun"
+                )
+
+    def _call_job(self, job: CompiledJob, context: ExecutionContext) -> Any:
+        if job.is_async:
+            raise ValueError(
+                f"Job '{job.name}' is a coroutine function, use arun"
+            )
+        return super()._call_job(job, context)
+
+    async def _acall_job(
+        self,
+        job: CompiledJob,
+        context: ExecutionContext,
+        sync_in_thread: bool = False,
+    ) -> Any:
+        if context.span is not None:
+            return await self._acall_job_traced(job, context, sync_in_thread)
+        profile = context.profile
+
+        job_start = perf_counter_ns() if profile is not None else 0
+        if job.memo_key is not None:
+            key, found, result = self._memo_lookup(job, context)
+            if profile is not None:
+                profile.add("memo", "lookup", job_start, perf_counter_ns())
+            if found:
+                self._record_result(job, context, result)
+                if profile is not None:
+                    profile.add(
+                        job.name, job.job_type, job_start, perf_counter_ns()
+                    )
+                return result
+
+        timed = self.metrics.timing or profile is not None
+        signal_start = perf_counter_ns() if profile is not None else 0
+        self._before_job_call(job, context)
+        call_start = perf_counter_ns() if timed else 0
+        result = await self._await_call(job, context, sync_in_thread)
+        call_end = perf_counter_ns() if timed else 0
+        self._after_job_call(
+            job,
+            context,
+            result,
+            call_end - call_start if self.metrics.timing else None,
+        )
+
+        if profile is not None:
+            signal_end = perf_counter_ns()
+            profile.add("pre_job_call", "signal", signal_start, call_start)
+            profile.add("call", "call", call_start, call_end)
+            profile.add("post_job_call", "signal", call_end, signal_end)
+        if job.memo_key is not None:
+            self._memo_store(key, result, context)
+        if profile is not None:
+            profile.add(job.name, job.job_type, job_start, perf_counter_ns())
+        return result
+
+    async def _await_call(
+        self,
+        job: CompiledJob,
+        context: ExecutionContext,
+        sync_in_thread: bool,
+    ) -> Any:
+        if job.is_async:
+            return await job.call(session=context.session)
+        if sync_in_thread or self.run_sync_in_thread:
+            return await asyncio.to_thread(job.call, session=context.session)
+        return job.call(session=context.session)
+
+    async def _acall_job_traced(
+        self,
+        job: CompiledJob,
+        context: ExecutionContext,
+        sync_in_thread: bool,
+    ) -> Any:
+        job_span, job_context = self._start_job_span(job, context)
+        if job_span is None:
+            return await self._acall_job(job, job_context, sync_in_thread)
+        try:
+            result = await self._acall_job(job, job_context, sync_in_thread)
+        except BaseException as error:
+            self._end_job_span(job_span, job, error=error)
+            raise
+        self._end_job_span(job_span, job, result)
+        return result
+
+    async def _arun_jobs(
+        self, context: ExecutionContext
+    ) -> MutableMapping[str, Any]:
+        """
+        Awaits the jobs in order, stopping at the first falsy condition
+        """
+        self.results_policy.start_run(context.session)
+        jobs = self._plan_rule(context.compiled_rule).jobs
+        index = 0
+        while index < len(jobs):
+            job = jobs[index]
+            if self.concurrent_conditions and job.job_type == "condition":
+                group_end = index + 1
+                while (
+                    group_end < len(jobs)
+                    and jobs[group_end].job_type == "condition"
+                ):
+                    group_end += 1
+                if group_end - index > 1:
+                    passed = await self._arun_conditions(
+                        jobs[index:group_end], context
+                    )
+                    if not passed:
+                        break
+                    index = group_end
+                    continue
+
+            result = await self._acall_job(job, context)
+            if job.job_type == "condition" and not result:
+                break
+            index += 1
+        return context.session
+
+    async def _arun_conditions(
+        self,
+        conditions: Tuple[CompiledJob, ...],
+        context: ExecutionContext,
+    ) -> bool:
+        """
+        Evaluates the conditions concurrently, regular ones in threads.
+        Results are recorded in completion order and the first falsy
+        condition cancels the ones still pending. Threads can't be
+        interrupted: cancelled regular conditions are not waited for and
+        their results are dropped, but they run until they return
+        """
+        tasks = [
+            asyncio.ensure_future(
+                self._acall_job(job, context, sync_in_thread=True)
+            )
+            for job in conditions
+        ]
+        try:
+            for completed in asyncio.as_completed(tasks):
+                result = await completed
+                if not result:
+                    return False
+            return True
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def arun(
+        self,
+        rule: RuleInput,
+        session: Optional[MutableMapping[str, Any]] = None,
+        memo: Optional[Dict[Any, Any]] = None,
+        transactional: bool = False,
+    ):
+        """
+        Asynchronous version of Engine.run
+        """
+        if transactional:
+            journal, snapshot = self._begin_transaction(session)
+            try:
+                await self.arun(rule, journal, memo)
+            except BaseException:
+                journal.rollback(snapshot)
+                raise
+            journal.commit(snapshot)
+            return
+        span = self.tracer.start_span("sauron.run")
+        try:
+            profile = (
+                self.profiler.sample() if self.profiler is not None else None
+            )
+            await self._arun(rule, session, memo, span, profile)
+        except BaseException as error:
+            if span is not None:
+                span.record_exception(error)
+            raise
+        finally:
+            if span is not None:
+                span.end()
+
+    async def _arun(
+        self,
+        rule: RuleInput,
+        session: Optional[MutableMapping[str, Any]],
+        memo: Optional[Dict[Any, Any]],
+        span: Optional[Span],
+        profile: Optional[RunProfile] = None,
+    ):
+        """
+        Asynchronous version of Engine._run. Spans of conditions evaluated
+        concurrently overlap in profile
+        """
+        run_start = perf_counter_ns() if profile is not None else 0
+        self._emit("pre_engine_run", rule=rule, session=session)
+        if profile is not None:
+            profile.add(
+                "pre_engine_run", "signal", run_start, perf_counter_ns()
+            )
+
+        if session is None:
+            session = self._default_session
+
+        timed = self.metrics.timing or profile is not None
+        tick_start = perf_counter_ns() if timed else 0
+        context = ExecutionContext(
+            self._compile(rule, profile=profile),
+            session,
+            rule,
+            memo,
+            profile=profile,
+            span=span,
+        )
+        self._local.context = context
+        await self._arun_jobs(context)
+        tick_end = perf_counter_ns() if timed else 0
+        self.metrics.record_run(
+            tick_end - tick_start if self.metrics.timing else None
+        )
+
+        self._emit("post_engine_run", rule=rule, session=session)
+        if profile is not None:
+            run_end = perf_counter_ns()
+            profile.add("post_engine_run", "signal", tick_end, run_end)
+            profile.add("run", "run", run_start, run_end)
+            cast(SamplingProfiler, self.profiler).finish(profile)
+
+
+class AsyncRuleEngine(AsyncEngine, RuleEngine):
+    pass
@@ -0,0 +1,72 @@
+from typing import Any, Callable, Iterator, List, MutableMapping, Sequence
+
+
+class SessionBatch:
+    """
+    Columnar view of the sessions a vectorized condition is evaluated
+    against. Only sessions that passed every previous condition are part of
+    the batch
+    """
+
+    __slots__ = ("sessions",)
+
+    def __init__(self, sessions: Sequence[MutableMapping[str, Any]]):
+        self.sessions = sessions
+
+    def __len__(self) -> int:
+        return len(self.sessions)
+
+    def __iter__(self) -> Iterator[MutableMapping[str, Any]]:
+        return iter(self.sessions)
+
+    def column(self, key: str, default: Any = None) -> List[Any]:
+        """
+        Values of key across the batch, default for sessions without it
+        """
+        return [session.get(key, default) for session in self.sessions]
+
+    def array(self, key: str, dtype: Any = None, default: Any = None):
+        """
+        Values of key across the batch as a numpy array, numpy must be
+        installed
+        """
+        try:
+            import numpy  # type: ignore[import-not-found]
+        except ImportError:
+            raise ImportError(
+                "numpy is required by SessionBatch.array, "
+                "use SessionBatch.column without it"
+            ) from None
+        return numpy.asarray(self.column(key, default), dtype=dtype)
+
+
+def as_mask(job_name: str, mask: Any, size: int) -> List[bool]:
+    """
+    Mask returned by a vectorized condition as a list of bools, numpy
+    arrays and any other sequence of truthy values are accepted
+    """
+    if hasattr(mask, "tolist"):
+        mask = mask.tolist()
+    mask = [bool(passed) for passed in mask]
+    if len(mask) != size:
+        raise ValueError(
+            f"Condition '{job_name}' returned a mask of {len(mask)} values "
+            f"for a batch of {size} sessions"
+        )
+    return mask
+
+
+class RowCondition:
+    """
+    Calls a vectorized condition with a batch of a single session, so it
+    can also be part of rules run session by session
+    """
+
+    __slots__ = ("function",)
+
+    def __init__(self, function: Callable):
+        self.function = function
+
+    def __call__(self, session: MutableMapping[str, Any], **kwargs) -> bool:
+        mask = self.function(batch=SessionBatch((session,)), **kwargs)
+        return as_mask(self.function.__name__, mask, 1)[0]
@@ -0,0 +1,101 @@
+import hashlib
+import json as json_lib
+import time
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Dict, Hashable, NamedTuple, Optional
+
+
+class CacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+
+class MemoInfo(NamedTuple):
+    hits: int
+    misses: int
+
+    @property
+    def hit_ratio(self) -> float:
+        calls = self.hits + self.misses
+        return self.hits / calls if calls else 0.0
+
+
+class LRUCache:
+    """
+    Bounded mapping that evicts the least recently used entry once maxsize
+    is reached, and optionally entries older than ttl seconds. Safe to
+    share between threads
+    """
+
+    def __init__(self, maxsize: int = 128, ttl: Optional[float] = None):
+        if maxsize <= 0:
+            raise ValueError("maxsize must be a positive integer")
+        if ttl is not None and ttl <= 0:
+            raise ValueError("ttl must be a positive number of seconds")
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._data: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._expires: Dict[Hashable, float] = {}
+        self._lock = Lock()
+
+    def get(self, key: Hashable, default: Optional[Any] = None) -> Any:
+        with self._lock:
+            try:
+                value = self._data[key]
+            except KeyError:
+                self.misses += 1
+                return default
+            if self.ttl is not None and self._expires[key] < time.monotonic():
+                del self._data[key]
+                del self._expires[key]
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            if self.ttl is not None:
+                self._expires[key] = time.monotonic() + self.ttl
+            if len(self._data) > self.maxsize:
+                evicted_key, _ = self._data.popitem(last=False)
+                self._expires.pop(evicted_key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self._expires.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def info(self) -> CacheInfo:
+        return CacheInfo(self.hits, self.misses, self.maxsize, len(self))
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._data
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+def content_key(data: Any) -> bytes:
+    """
+    Digest identifying a raw rule by its content. Strings are hashed as
+    they are, other inputs are hashed from a canonical json dump so equal
+    dicts and lists share the same key
+    """
+    if isinstance(data, str):
+        raw = b"s" + data.encode("utf-8")
+    else:
+        raw = b"o" + json_lib.dumps(
+            data, sort_keys=True, separators=(",", ":"), default=repr
+        ).encode("utf-8")
+    return hashlib.blake2b(raw, digest_size=16).digest()
@@ -0,0 +1,176 @@
+import argparse
+import importlib
+import json
+import os
+import sys
+from collections import deque
+from collections.abc import Mapping, MutableSequence, Set
+from contextlib import ExitStack
+from typing import IO, Any, Deque, Dict, Iterator, Optional, Sequence, Type
+
+from .engine import Engine
+from .rule_engine import RuleEngine
+
+ENGINES: Dict[str, Type[Engine]] = {"rule": RuleEngine, "job": Engine}
+
+# rule formats told by the file extension, others are detected
+RULE_EXTENSIONS = {".json": "json", ".yaml": "yaml", ".yml": "yaml"}
+
+
+# values sessions can hold to be written by json_default
+SUPPORTED_TYPES = "JSON values, mappings, mutable sequences and sets"
+
+
+def json_default(value: Any) -> Any:
+    """
+    Serializes what jobs and results policies leave in sessions besides
+    plain JSON values: mappings as objects, mutable sequences and sets as
+    lists
+    """
+    if isinstance(value, Mapping):
+        return dict(value)
+    if isinstance(value, (MutableSequence, Set)) and not isinstance(
+        value, bytearray
+    ):
+        return list(value)
+    raise TypeError(
+        f"Object of type {type(value).__name__} is not JSON serializable"
+    )
+
+
+def read_sessions(
+    stream: IO[str],
+    name: str,
+    line_numbers: Optional[Deque[int]] = None,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Decodes a session from each line of a JSON lines stream, one line at a
+    time, blank lines are skipped. The line number of every session is
+    appended to line_numbers when given
+    """
+    for line_number, line in enumerate(stream, start=1):
+        if not line.strip():
+            continue
+        try:
+            session = json.loads(line)
+        except json.JSONDecodeError as error:
+            raise ValueError(f"{name}:{line_number}: {error.msg}") from None
+        if not isinstance(session, dict):
+            raise ValueError(
+                f"{name}:{line_number}: expected a JSON object, "
+                f"got {type(session).__name__}"
+            )
+        if line_numbers is not None:
+            line_numbers.append(line_number)
+        yield session
+
+
+def load_rule(engine: Engine, path: str):
+    with open(path, encoding="utf-8") as rule_file:
+        rule = rule_file.read()
+    extension = os.path.splitext(path)[1].lower()
+    return engine.compile(rule, fmt=RULE_EXTENSIONS.get(extension))
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="sauron", description="Sauron rule engine"
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+    run_command = commands.add_parser(
+        "run",
+        help="run a rule against every session of a JSON lines file",
+        description=(
+            "Runs a rule against each JSON object of the input, one per "
+            "line, writing every session once its jobs ran"
+        ),
+    )
+    run_command.add_argument(
+        "--rule", required=True, help="rule file, in json or yaml"
+    )
+    run_command.add_argument(
+        "--jobs",
+        required=True,
+        action="append",
+        metavar="MODULE",
+        help="module to import jobs from, can be repeated",
+    )
+    run_command.add_argument(
+        "--input", default="-", help="JSON lines input, - for stdin"
+    )
+    run_command.add_argument(
+        "--output", default="-", help="JSON lines output, - for stdout"
+    )
+    run_command.add_argument(
+        "--engine",
+        choices=sorted(ENGINES),
+        default="rule",
+        help="rule for conditions/actions rules, job for lists of jobs",
+    )
+    run_command.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="run the sessions in this many worker processes",
+    )
+    run_command.add_argument(
+        "--chunksize",
+        type=int,
+        default=256,
+        help="sessions sent to a worker at a time",
+    )
+    return parser
+
+
+def run(args: argparse.Namespace) -> int:
+    engine = ENGINES[args.engine]()
+    for module_name in args.jobs:
+        engine.import_jobs(importlib.import_module(module_name))
+    compiled_rule = load_rule(engine, args.rule)
+
+    with ExitStack() as stack:
+        input_stream = (
+            sys.stdin
+            if args.input == "-"
+            else stack.enter_context(open(args.input, encoding="utf-8"))
+        )
+        output_stream = (
+            sys.stdout
+            if args.output == "-"
+            else stack.enter_context(open(args.output, "w", encoding="utf-8"))
+        )
+        # sessions run in order, so they pop the line numbers in order
+        line_numbers: Deque[int] = deque()
+        sessions = engine.run_many(
+            compiled_rule,
+            read_sessions(input_stream, args.input, line_numbers),
+            executor="process" if args.workers else None,
+            workers=args.workers,
+            chunksize=args.chunksize,
+        )
+        for session in sessions:
+            line_number = line_numbers.popleft()
+            try:
+                line = json.dumps(session, default=json_default)
+            except (TypeError, ValueError) as error:
+                raise ValueError(
+                    f"{args.input}:{line_number}: session can't be written "
+                    f"as JSON: {error}, supported types are {SUPPORTED_TYPES}"
+                ) from None
+            output_stream.write(line)
+            output_stream.write("\n")
+    return 0
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.workers is not None and args.workers <= 0:
+        parser.error("--workers must be a positive integer")
+    if args.chunksize <= 0:
+        parser.error("--chunksize must be a positive integer")
+    try:
+        return run(args)
+    except (OSError, ImportError, ValueError) as error:
+        print(f"{parser.prog}: error: {error}", file=sys.stderr)
+        return 1
@@ -0,0 +1,70 @@
+from types import MappingProxyType
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Hashable,
+    List,
+    Mapping,
+    NamedTuple,
+    Optional,
+    Tuple,
+    Union,
+)
+
+from .models import Job
+
+
+class CompiledJob(NamedTuple):
+    """
+    A job resolved against the engine callables, ready to be called with
+    just the session
+    """
+
+    name: str
+    job_type: str
+    function: Callable
+    args: Mapping[str, Any]
+    call: Callable
+    model: Job
+    is_async: bool = False
+
+    pure: bool = False
+    memo_key: Optional[Hashable] = None
+    session_keys: Tuple[str, ...] = ()
+    # conditions taking a SessionBatch and returning a mask, function is
+    # then the batch callable and call evaluates a single session
+    vectorized: bool = False
+    # name and args digest of pure and cacheable jobs, telling the same
+    # callable called with other args apart
+    args_key: Optional[Hashable] = None
+
+    def __reduce__(self):
+        # mappingproxy can't be pickled, so args travel as a plain dict
+        return (
+            _rebuild_compiled_job,
+            (tuple(self._replace(args=dict(self.args))),),
+        )
+
+
+def _rebuild_compiled_job(fields: Tuple[Any, ...]) -> CompiledJob:
+    job = CompiledJob(*fields)
+    return job._replace(args=MappingProxyType(job.args))
+
+
+class CompiledRule(NamedTuple):
+    """
+    Immutable result of Engine.compile, can be passed to Engine.run as many
+    times as needed without parsing or validating the rule again
+    """
+
+    jobs: Tuple[CompiledJob, ...]
+
+    @property
+    def parsed_rule(self) -> List[Job]:
+        return [job.model for job in self.jobs]
+
+
+# rules accepted by Engine.compile and Engine.run: json or yaml strings,
+# rule dicts, lists of jobs, or rules already compiled
+RuleInput = Union[str, Dict[str, Any], List[Dict[str, Any]], CompiledRule]
@@ -0,0 +1,34 @@
+from typing import TYPE_CHECKING, Any, Dict, MutableMapping, Optional
+
+from .compiled import CompiledRule
+
+if TYPE_CHECKING:
+    from .profiler import RunProfile
+    from .tracing import Span
+
+
+class ExecutionContext:
+    """
+    State of a single run of a rule. Everything a run changes lives here,
+    so runs of the same engine in different threads don't share state
+    """
+
+    __slots__ = ("rule", "compiled_rule", "session", "memo", "profile", "span")
+
+    def __init__(
+        self,
+        compiled_rule: CompiledRule,
+        session: MutableMapping[str, Any],
+        rule: Optional[Any] = None,
+        memo: Optional[Dict[Any, Any]] = None,
+        profile: "Optional[RunProfile]" = None,
+        span: "Optional[Span]" = None,
+    ):
+        self.compiled_rule = compiled_rule
+        self.session = session
+        self.rule = compiled_rule if rule is None else rule
+        self.memo: Dict[Any, Any] = {} if memo is None else memo
+        # spans of the run, only set when the run is sampled by the profiler
+        self.profile = profile
+        # span of the run, only set when the run is traced
+        self.span = span
@@ -1,12 +1,18 @@
 import inspect
-import time
+import operator
+import threading
 from collections import OrderedDict
-from types import ModuleType
+from functools import partial
+from time import perf_counter_ns
+from types import MappingProxyType, ModuleType
 from typing import (
     Any,
     Callable,
     Dict,
+    Generator,
+    Iterable,
     List,
+    MutableMapping,
     Optional,
     Tuple,
     Type,
@@ -14,25 +20,47 @@ from typing import (
     cast,
 )
 
-from blinker import signal
+from blinker import Namespace
 from blinker.base import NamedSignal
 
-from .exporters import DefaultExporter
-from .models import JobModel
+from .batch import RowCondition, SessionBatch, as_mask
+from .cache import CacheInfo, LRUCache, MemoInfo, content_key
+from .compiled import CompiledJob, CompiledRule, RuleInput
+from .context import ExecutionContext
+from .exporters import DefaultExporter, OpenMetricsExporter
+from .metrics import MetricsRegistry
+from .models import Job, JobModel
+from .parallel import run_in_processes
 from .parsers import DefaultParser
+from .profiler import RunProfile, SamplingProfiler
+from .results import AllResults, ResultsPolicy, StreamResults
+from .session import Session
+from .tracing import NoOpTracer, Span, Tracer
+from .validation import coerce_args, job_signature
+
+_missing = object()
 
 
 class Engine:
+    """
+    Engine configuration (callables, caches, metrics and signals) belongs to
+    each instance, while the state of each run lives in its own
+    ExecutionContext, so run can be called from many threads at once
+    """
+
     job_model_class: Type[JobModel] = JobModel
     parser_class: Type[DefaultParser] = DefaultParser
     exporter_class: Type[DefaultExporter] = DefaultExporter
+    metrics_exporter_class: Type[OpenMetricsExporter] = OpenMetricsExporter
 
-    parsed_rule: List[JobModel] = []
-
-    session: Dict[str, Any] = {}
-    runtime_metrics: Dict[str, Any] = {}
+    supports_async_jobs: bool = False
 
-    signals: Dict[str, NamedSignal] = {}
+    signal_names: Tuple[str, ...] = (
+        "pre_engine_run",
+        "post_engine_run",
+        "pre_job_call",
+        "post_job_call",
+    )
 
     def __init__(
         self,
@@ -40,13 +68,35 @@ class Engine:
         job_model: Optional[Type[JobModel]] = None,
         parser_class: Optional[Type[DefaultParser]] = None,
         exporter_class: Optional[Type[DefaultExporter]] = None,
+        parse_cache_size: Optional[int] = None,
+        condition_cache_size: Optional[int] = None,
+        condition_cache_ttl: Optional[float] = None,
+        timing: bool = True,
+        profile_every: Optional[int] = None,
+        tracer: Optional[Tracer] = None,
+        trusted_rules: bool = False,
+        results_policy: Optional[ResultsPolicy] = None,
     ):
         """
         - Sessions can be initialized with a context provided by the user
         - Job Model and Parser can be changed
+        - Parsed rules can be cached, keeping up to parse_cache_size rules
+        - Results of cacheable jobs can be reused across runs, keeping up to
+          condition_cache_size results for condition_cache_ttl seconds
+        - Jobs and runs are timed unless timing is False, in which case
+          metrics only count calls
+        - With profile_every, one run out of every profile_every is
+          profiled, see Engine.profiler
+        - Runs and jobs are traced by tracer, nothing is traced by default
+        - Rules from trusted sources can skip validation with trusted_rules,
+          their jobs are parsed as compact JobRecord
+        - results_policy decides what sessions keep of each job call, every
+          result is kept in session["results"] by default
         """
-        if context:
-            self.session = context
+        self._local = threading.local()
+        self._default_session: MutableMapping[str, Any] = (
+            context if context else {}
+        )
 
         if job_model:
             self.job_model_class = job_model
@@ -56,26 +106,102 @@ class Engine:
 
         if exporter_class:
             self.exporter_class = exporter_class
+
+        self.trusted_rules = trusted_rules
+        self.results_policy: ResultsPolicy = (
+            results_policy if results_policy is not None else AllResults()
+        )
+
+        self.parse_cache: Optional[LRUCache] = None
+        # compiled rules of the parsed rules served by the parse cache
+        self._compile_cache: Optional[LRUCache] = None
+        if parse_cache_size:
+            self.parse_cache = LRUCache(parse_cache_size)
+            self._compile_cache = LRUCache(parse_cache_size)
+
+        self.condition_cache: Optional[LRUCache] = None
+        if condition_cache_size:
+            self.condition_cache = LRUCache(
+                condition_cache_size, ttl=condition_cache_ttl
+            )
+        self._memo_hits = 0
+        self._memo_misses = 0
+        self._memo_lock = threading.Lock()
+
         self.callables_collected: "OrderedDict[str, Dict[str, Any]]" = (
             OrderedDict()
         )
+        self.job_modules: List[str] = []
+
+        self.metrics = MetricsRegistry(timing=timing)
+        self.tracer: Tracer = tracer if tracer is not None else NoOpTracer()
+        self.profiler: Optional[SamplingProfiler] = None
+        if profile_every:
+            self.profiler = SamplingProfiler(profile_every)
+
+        # signals live in a namespace of their own, so dispatching a job
+        # signal only goes through the receivers of this engine
+        self.signal_namespace = Namespace()
+        self.signals: Dict[str, NamedSignal] = {
+            signal_name: self.signal_namespace.signal(signal_name)
+            for signal_name in self.signal_names
+        }
+
+    @property
+    def runtime_metrics(self) -> Dict[str, Any]:
+        """
+        Mean runtime of each job and duration of the last run in seconds,
+        the full counters and histograms are kept in engine.metrics
+        """
+        return self.metrics.runtime_metrics()
 
-        self.runtime_metrics["jobs"] = {}
-        self.runtime_metrics["total_runtime"] = 0
+    @property
+    def session(self) -> MutableMapping[str, Any]:
+        """
+        Session of the last run made by the current thread, or the default
+        session used by runs that don't get one
+        """
+        context: Optional[ExecutionContext] = getattr(
+            self._local, "context", None
+        )
+        if context is None:
+            return self._default_session
+        return context.session
 
-        self.signals["pre_engine_run"] = signal("pre_engine_run")
-        self.signals["post_engine_run"] = signal("post_engine_run")
-        self.signals["pre_job_call"] = signal("pre_job_call")
-        self.signals["post_job_call"] = signal("post_job_call")
+    @session.setter
+    def session(self, session: MutableMapping[str, Any]) -> None:
+        self._default_session = session
+        self._local.context = None
+
+    @property
+    def parsed_rule(self) -> List[Job]:
+        """
+        Jobs of the last rule parsed by the current thread
+        """
+        return getattr(self._local, "parsed_rule", [])
 
     def _add_callable(
-        self, function: Callable, verbose_name: str, job_type: str = "job"
+        self,
+        function: Callable,
+        verbose_name: str,
+        job_type: str = "job",
+        pure: bool = False,
+        cacheable: bool = False,
+        session_keys: Tuple[str, ...] = (),
+        vectorized: bool = False,
     ):
         self.callables_collected[function.__name__] = {
             "function": function,
             "verbose_name": verbose_name,
             "type": job_type,
+            "pure": pure,
+            "cacheable": cacheable,
+            "session_keys": tuple(session_keys),
+            "vectorized": vectorized,
         }
+        # compiled rules captured the callables registered before this one
+        if self._compile_cache is not None:
+            self._compile_cache.clear()
 
     def job(self, *args, **kwargs):
         """
@@ -118,6 +244,8 @@ class Engine:
                     (job[0], {"callable": job[1], "verbose_name": job[0]})
                     for job in pre_raw_job_list
                 ]
+        if job_module.__name__ not in self.job_modules:
+            self.job_modules.append(job_module.__name__)
         for job in raw_job_list:
             callable_func = job[1].get("callable")
             verbose_name = job[1].get("verbose_name", job[0])
@@ -128,11 +256,17 @@ class Engine:
                 callable_func,
                 verbose_name=verbose_name,
                 job_type=job_type,
+                pure=job[1].get("pure", False),
+                cacheable=job[1].get("cacheable", False),
+                session_keys=job[1].get("session_keys", ()),
+                vectorized=job[1].get("vectorized", False),
             )
 
-    def apply_job_call(
-        self, job: JobModel, session: Dict[str, Any]
-    ) -> Tuple[Dict[str, Any], Any]:
+    def _compile_job(self, job: Job) -> CompiledJob:
+        """
+        Resolves the callable of a parsed job and binds its arguments, once
+        checked and converted against the signature of the callable
+        """
         job_data = self.callables_collected.get(job.name)
         if job_data is None:
             raise ValueError(
@@ -141,82 +275,702 @@ class Engine:
         target_func: Callable = cast(Callable, job_data.get("function"))
         if target_func is None:
             raise ValueError(f"Job '{job.name}' has no callable function")
+        is_async = inspect.iscoroutinefunction(target_func)
+        if is_async and not self.supports_async_jobs:
+            raise ValueError(
+                f"Job '{job.name}' is a coroutine function, "
+                "it can only be run by an async engine"
+            )
 
-        pre_signal_payload = {
-            "job_name": job.name,
-            "job": job,
-            "session": session,
-        }
-        self.signals["pre_job_call"].send(self, **pre_signal_payload)  # type: ignore[arg-type]
+        vectorized = job_data.get("vectorized", False)
+        if vectorized and is_async:
+            raise ValueError(
+                f"Job '{job.name}' is a coroutine function, "
+                "vectorized conditions must be regular functions"
+            )
+        session_arg = "batch" if vectorized else "session"
+        signature = job_data.get("signature")
+        if signature is None:
+            signature = job_data["signature"] = job_signature(
+                target_func, session_arg
+            )
+        args = coerce_args(job.name, signature, job.args or {}, session_arg)
+        row_func = RowCondition(target_func) if vectorized else target_func
+        bound_func = partial(row_func, **args) if args else row_func
+        pure = job_data.get("pure", False)
+        cacheable = job_data.get("cacheable", False)
+        args_key = None
+        if pure or cacheable:
+            args_key = (job.name, content_key(args))
+        return CompiledJob(
+            name=job.name,
+            job_type=job.job_type,
+            function=target_func,
+            args=MappingProxyType(args),
+            call=bound_func,
+            model=job,
+            is_async=is_async,
+            pure=pure,
+            memo_key=args_key if cacheable else None,
+            session_keys=job_data.get("session_keys", ()),
+            vectorized=vectorized,
+            args_key=args_key,
+        )
 
-        if job.args:
-            tick_start = time.time()
-            result = target_func(session=session, **job.args)
-            tick_end = time.time()
-        else:
-            tick_start = time.time()
-            result = target_func(session=session)
-            tick_end = time.time()
-
-        self.runtime_metrics["jobs"].setdefault(
-            job.name, tick_end - tick_start
-        )
-        # append result of function called into session
-        results = session.get("results", None)
-        if not results:
-            session["results"] = []
-        session["results"].append({"job": job.name, "return": result})
-        self.session = session
-
-        post_signal_payload = {
-            "job_name": job.name,
-            "job": job,
-            "session": session,
-        }
-        self.signals["post_job_call"].send(self, **post_signal_payload)  # type: ignore[arg-type]
+    def _emit(self, signal_name: str, **payload: Any) -> None:
+        """
+        Sends an engine signal, only when someone is listening
+        """
+        signal = self.signals[signal_name]
+        if signal.receivers:
+            signal.send(self, **payload)  # type: ignore[arg-type]
+
+    def _before_job_call(
+        self, job: CompiledJob, context: ExecutionContext
+    ) -> None:
+        # payloads are only built when someone is listening
+        pre_job_call = self.signals["pre_job_call"]
+        if pre_job_call.receivers:
+            pre_signal_payload = {
+                "job_name": job.name,
+                "job": job.model,
+                "session": context.session,
+            }
+            pre_job_call.send(self, **pre_signal_payload)  # type: ignore[arg-type]
+
+    def _record_result(
+        self, job: CompiledJob, context: ExecutionContext, result: Any
+    ) -> None:
+        self.results_policy.record(context.session, job.name, result)
+
+    def _after_job_call(
+        self,
+        job: CompiledJob,
+        context: ExecutionContext,
+        result: Any,
+        runtime_ns: Optional[int],
+    ) -> None:
+        self.metrics.record_job(
+            job.name,
+            runtime_ns,
+            bool(result) if job.job_type == "condition" else None,
+        )
+        self._record_result(job, context, result)
+
+        post_job_call = self.signals["post_job_call"]
+        if post_job_call.receivers:
+            post_signal_payload = {
+                "job_name": job.name,
+                "job": job.model,
+                "session": context.session,
+            }
+            post_job_call.send(self, **post_signal_payload)  # type: ignore[arg-type]
+
+    def _memo_lookup(
+        self, job: CompiledJob, context: ExecutionContext
+    ) -> Tuple[Any, bool, Any]:
+        """
+        Looks for a previous result of a cacheable job, first in the memo of
+        the current evaluation and then in the condition cache. The key
+        depends on the job name, its args and its session_keys values
+        """
+        session_values: Any = tuple(
+            context.session.get(key) for key in job.session_keys
+        )
+        try:
+            hash(session_values)
+        except TypeError:
+            session_values = content_key(session_values)
+        key = (job.memo_key, session_values)
+
+        memo = context.memo
+        result = memo.get(key, _missing)
+        if result is _missing and self.condition_cache is not None:
+            result = self.condition_cache.get(key, _missing)
+            if result is not _missing:
+                memo[key] = result
+
+        with self._memo_lock:
+            if result is _missing:
+                self._memo_misses += 1
+                return key, False, None
+            self._memo_hits += 1
+        return key, True, result
+
+    def _memo_store(
+        self, key: Any, result: Any, context: ExecutionContext
+    ) -> None:
+        context.memo[key] = result
+        if self.condition_cache is not None:
+            self.condition_cache.set(key, result)
+
+    def memo_info(self) -> MemoInfo:
+        """
+        Hits and misses of cacheable jobs, counting both the memo of each
+        evaluation and the condition cache
+        """
+        return MemoInfo(self._memo_hits, self._memo_misses)
 
-        return (session, result)
+    def _call_job(self, job: CompiledJob, context: ExecutionContext) -> Any:
+        """
+        Calls the job with the session of context. Profiled runs also record
+        spans for the memo lookup, the signals and the call itself
+        """
+        if context.span is not None:
+            return self._call_job_traced(job, context)
+        profile = context.profile
+
+        job_start = perf_counter_ns() if profile is not None else 0
+        if job.memo_key is not None:
+            key, found, result = self._memo_lookup(job, context)
+            if profile is not None:
+                profile.add("memo", "lookup", job_start, perf_counter_ns())
+            if found:
+                self._record_result(job, context, result)
+                if profile is not None:
+                    profile.add(
+                        job.name, job.job_type, job_start, perf_counter_ns()
+                    )
+                return result
+
+        timed = self.metrics.timing or profile is not None
+        signal_start = perf_counter_ns() if profile is not None else 0
+        self._before_job_call(job, context)
+        call_start = perf_counter_ns() if timed else 0
+        result = job.call(session=context.session)
+        call_end = perf_counter_ns() if timed else 0
+        self._after_job_call(
+            job,
+            context,
+            result,
+            call_end - call_start if self.metrics.timing else None,
+        )
 
-    def parse(self, unparsed_rule: Union[str, Dict[str, Any]]):
+        if profile is not None:
+            signal_end = perf_counter_ns()
+            profile.add("pre_job_call", "signal", signal_start, call_start)
+            profile.add("call", "call", call_start, call_end)
+            profile.add("post_job_call", "signal", call_end, signal_end)
+        if job.memo_key is not None:
+            self._memo_store(key, result, context)
+        if profile is not None:
+            profile.add(job.name, job.job_type, job_start, perf_counter_ns())
+        return result
+
+    def _start_job_span(
+        self, job: CompiledJob, context: ExecutionContext
+    ) -> Tuple[Optional[Span], ExecutionContext]:
         """
-        Parses rules
+        Child span of the run span for the job, along with a copy of the
+        context without span to run the job with
         """
+        job_span = self.tracer.start_span(
+            job.name,
+            parent=context.span,
+            attributes={
+                "job.name": job.name,
+                "job.type": job.job_type,
+                "job.args": dict(job.args),
+            },
+        )
+        return job_span, ExecutionContext(
+            context.compiled_rule,
+            context.session,
+            context.rule,
+            context.memo,
+            profile=context.profile,
+        )
+
+    @staticmethod
+    def _end_job_span(
+        job_span: Span,
+        job: CompiledJob,
+        result: Any = None,
+        error: Optional[BaseException] = None,
+    ) -> None:
+        if error is not None:
+            job_span.record_exception(error)
+        elif job.job_type == "condition":
+            job_span.set_attribute("condition.result", bool(result))
+        job_span.end()
+
+    def _call_job_traced(
+        self, job: CompiledJob, context: ExecutionContext
+    ) -> Any:
+        job_span, job_context = self._start_job_span(job, context)
+        if job_span is None:
+            return self._call_job(job, job_context)
+        try:
+            result = self._call_job(job, job_context)
+        except BaseException as error:
+            self._end_job_span(job_span, job, error=error)
+            raise
+        self._end_job_span(job_span, job, result)
+        return result
+
+    def apply_job_call(
+        self, job: JobModel, session: MutableMapping[str, Any]
+    ) -> Tuple[MutableMapping[str, Any], Any]:
+        compiled_job = self._compile_job(job)
+        context = ExecutionContext(
+            CompiledRule(jobs=(compiled_job,)), session, rule=[job]
+        )
+        return (session, self._call_job(compiled_job, context))
+
+    def parse(
+        self,
+        unparsed_rule: Union[str, Dict[str, Any], List[Dict[str, Any]]],
+        fmt: Optional[str] = None,
+    ):
+        """
+        Parses rules, strings are decoded as fmt ("json" or "yaml") or
+        sniffed when fmt is not given
+        """
+        # custom parsers may keep the baseline __init__(self) and
+        # parse(jobs_input), so options are only given when they are used
         parser: DefaultParser = self.parser_class()
-        parsed_rule: List[JobModel] = parser.parse(unparsed_rule)
-        self.parsed_rule = parsed_rule
+        if self.parse_cache is not None:
+            parser.cache = self.parse_cache
+        if self.trusted_rules:
+            parser.trusted = True
+        parsed_rule: List[Job] = (
+            parser.parse(unparsed_rule)
+            if fmt is None
+            else parser.parse(unparsed_rule, fmt=fmt)
+        )
+        self._local.parsed_rule = parsed_rule
         return parsed_rule
 
+    def parse_cache_info(self) -> Optional[CacheInfo]:
+        """
+        Hits, misses and size of the parse cache, None when it is disabled
+        """
+        if self.parse_cache is None:
+            return None
+        return self.parse_cache.info()
+
+    def compile(
+        self,
+        rule: RuleInput,
+        fmt: Optional[str] = None,
+    ) -> CompiledRule:
+        """
+        Parses the rule and resolves every job against the collected
+        callables, so the result can be run many times without parsing.
+        Callables are captured at compile time: jobs registered or replaced
+        afterwards require compiling the rule again
+        """
+        return self._compile(rule, fmt)
+
+    def _compile(
+        self,
+        rule: RuleInput,
+        fmt: Optional[str] = None,
+        profile: Optional[RunProfile] = None,
+    ) -> CompiledRule:
+        """
+        Same as compile, recording spans for parsing the rule and looking up
+        the callables of its jobs in profile when given
+        """
+        if isinstance(rule, CompiledRule):
+            return rule
+        tick_start = perf_counter_ns() if profile is not None else 0
+        parsed_rule = self.parse(rule, fmt=fmt)
+        tick_middle = perf_counter_ns() if profile is not None else 0
+        compiled_rule = self._compile_parsed(parsed_rule)
+        if profile is not None:
+            profile.add("parse", "parse", tick_start, tick_middle)
+            profile.add("lookup", "lookup", tick_middle, perf_counter_ns())
+        return compiled_rule
+
+    def _compile_parsed(self, parsed_rule: List[Job]) -> CompiledRule:
+        """
+        Resolves the callables of parsed jobs and coerces their args. The
+        parse cache hands out the same jobs for a cached rule, so its
+        compiled rule is cached along with them, keyed by their identity,
+        until a callable is added
+        """
+        cache = self._compile_cache
+        if cache is None:
+            return CompiledRule(
+                jobs=tuple(self._compile_job(job) for job in parsed_rule)
+            )
+        key = tuple(map(id, parsed_rule))
+        entry = cache.get(key)
+        # entries hold their jobs, so their ids can't be reused meanwhile
+        if entry is not None and all(map(operator.is_, entry[0], parsed_rule)):
+            return entry[1]
+        compiled_rule = CompiledRule(
+            jobs=tuple(self._compile_job(job) for job in parsed_rule)
+        )
+        cache.set(key, (tuple(parsed_rule), compiled_rule))
+        return compiled_rule
+
     def run(
         self,
-        rule: Union[str, Dict[str, Any]],
-        session: Optional[Dict[str, Any]] = None,
+        rule: RuleInput,
+        session: Optional[MutableMapping[str, Any]] = None,
+        memo: Optional[Dict[Any, Any]] = None,
+        transactional: bool = False,
     ):
         """
-        Executes each job passing the current session to them
+        Executes each job passing the current session to them. The rule can
+        be given already compiled by Engine.compile. Results of cacheable
+        jobs are kept in memo, pass the same dict to runs evaluating the
+        same session to share them.
+
+        Runs without a session share the engine default session, give each
+        concurrent run its own session.
+
+        Transactional runs give the jobs a journal over the session instead
+        of the session itself, the journal is committed to the session only
+        once every job ran without raising
         """
+        if transactional:
+            return self._run_transaction(rule, session, memo)
+        span = self.tracer.start_span("sauron.run")
+        try:
+            profile = (
+                self.profiler.sample() if self.profiler is not None else None
+            )
+            return self._run(rule, session, memo, span, profile)
+        except BaseException as error:
+            if span is not None:
+                span.record_exception(error)
+            raise
+        finally:
+            if span is not None:
+                span.end()
+
+    def _begin_transaction(
+        self, session: Optional[MutableMapping[str, Any]]
+    ) -> Tuple[Session, int]:
+        """
+        Journal the jobs of a transactional run write to, along with the
+        snapshot to commit or roll back once they ran
+        """
+        if session is None:
+            session = self._default_session
+        journal = (
+            session if isinstance(session, Session) else Session.wrap(session)
+        )
+        return journal, journal.snapshot()
 
-        pre_signal_payload = {"rule": rule, "session": session}
-        self.signals["pre_engine_run"].send(self, **pre_signal_payload)  # type: ignore[arg-type]
+    def _run_transaction(
+        self,
+        rule: RuleInput,
+        session: Optional[MutableMapping[str, Any]],
+        memo: Optional[Dict[Any, Any]],
+    ):
+        journal, snapshot = self._begin_transaction(session)
+        try:
+            self.run(rule, journal, memo)
+        except BaseException:
+            journal.rollback(snapshot)
+            raise
+        journal.commit(snapshot)
+
+    def _run(
+        self,
+        rule: RuleInput,
+        session: Optional[MutableMapping[str, Any]],
+        memo: Optional[Dict[Any, Any]],
+        span: Optional[Span],
+        profile: Optional[RunProfile] = None,
+    ):
+        """
+        Runs the rule, recording the spans of the run in profile when the
+        run was sampled by the profiler
+        """
+        run_start = perf_counter_ns() if profile is not None else 0
+        self._emit("pre_engine_run", rule=rule, session=session)
+        if profile is not None:
+            profile.add(
+                "pre_engine_run", "signal", run_start, perf_counter_ns()
+            )
+
+        if session is None:
+            session = self._default_session
+
+        timed = self.metrics.timing or profile is not None
+        tick_start = perf_counter_ns() if timed else 0
+        context = ExecutionContext(
+            self._compile(rule, profile=profile),
+            session,
+            rule,
+            memo,
+            profile=profile,
+            span=span,
+        )
+        self._local.context = context
+        self._run_jobs(context)
+        tick_end = perf_counter_ns() if timed else 0
+        self.metrics.record_run(
+            tick_end - tick_start if self.metrics.timing else None
+        )
+
+        self._emit("post_engine_run", rule=rule, session=session)
+        if profile is not None:
+            run_end = perf_counter_ns()
+            profile.add("post_engine_run", "signal", tick_end, run_end)
+            profile.add("run", "run", run_start, run_end)
+            cast(SamplingProfiler, self.profiler).finish(profile)
+
+    def _plan_rule(self, compiled_rule: CompiledRule) -> CompiledRule:
+        """
+        Hook to change the order jobs run in, they run as given by default
+        """
+        return compiled_rule
 
-        if not session:
-            session = self.session
+    def _check_sync_rule(self, compiled_rule: CompiledRule) -> None:
+        """
+        Hook rejecting rules that can't run synchronously, checked before
+        their first job runs. Every compiled rule can by default
+        """
 
-        tick_start = time.time()
-        for job in self.parse(rule):
-            session, result = self.apply_job_call(job, session)
+    def _run_jobs(self, context: ExecutionContext) -> MutableMapping[str, Any]:
+        """
+        Calls the jobs in order, stopping at the first falsy condition
+        """
+        self._check_sync_rule(context.compiled_rule)
+        self.results_policy.start_run(context.session)
+        for job in self._plan_rule(context.compiled_rule).jobs:
+            result = self._call_job(job, context)
             if job.job_type == "condition" and not result:
                 break
-        tick_end = time.time()
+        return context.session
+
+    def run_many(
+        self,
+        rule: RuleInput,
+        sessions: Iterable[MutableMapping[str, Any]],
+        executor: Optional[str] = None,
+        workers: Optional[int] = None,
+        chunksize: int = 64,
+        engine_factory: "Optional[Callable[[], Engine]]" = None,
+    ) -> Generator[MutableMapping[str, Any], None, None]:
+        """
+        Executes the rule against each session, lazily yielding every
+        session once its jobs ran. The rule is compiled once for the whole
+        batch, engine signals are sent once (with session=None) and
+        total_runtime adds up the time spent running the whole batch.
+
+        The arguments are checked and the rule compiled right away, before
+        pre_engine_run is sent. post_engine_run is sent once the sessions
+        run out, or when the iterator is closed or fails.
+
+        With executor="process", chunks of chunksize sessions are run by
+        a pool of worker processes. Sessions are yielded in order, but
+        they are the copies mutated by the workers: jobs must be picklable
+        module level functions and job signals are sent by the engines
+        running inside the workers. Workers get an engine with the same
+        configuration, or the one built by engine_factory, a picklable
+        callable. Their metrics are merged into engine.metrics. Engines
+        streaming their results can't use it: the callback would run in
+        the workers
+        """
+        if executor not in (None, "process"):
+            raise ValueError(
+                f"executor must be None or 'process', not {executor}"
+            )
+        if executor == "process" and isinstance(
+            self.results_policy, StreamResults
+        ):
+            raise ValueError(
+                "StreamResults can't be used with executor='process', "
+                "its callback would run in the worker processes"
+            )
+        if chunksize <= 0:
+            raise ValueError("chunksize must be a positive integer")
+        if workers is not None and workers <= 0:
+            raise ValueError("workers must be a positive integer")
+
+        tick_start = perf_counter_ns()
+        compiled_rule = self.compile(rule)
+        compile_ns = perf_counter_ns() - tick_start
+
+        self._emit("pre_engine_run", rule=rule, session=None)
+        return self._run_many(
+            rule,
+            compiled_rule,
+            sessions,
+            executor,
+            workers,
+            chunksize,
+            engine_factory,
+            compile_ns,
+        )
+
+    def _worker_kwargs(self) -> Dict[str, Any]:
+        """
+        Constructor arguments giving the engines of worker processes the
+        configuration of this one. Engines taking other arguments extend
+        it, or are given an engine_factory by run_many callers
+        """
+        # batches are neither traced nor profiled, so the tracer and the
+        # profiler would be of no use to the workers
+        return {
+            "job_model": self.job_model_class,
+            "parser_class": self.parser_class,
+            "exporter_class": self.exporter_class,
+            "parse_cache_size": (
+                self.parse_cache.maxsize if self.parse_cache else None
+            ),
+            "condition_cache_size": (
+                self.condition_cache.maxsize if self.condition_cache else None
+            ),
+            "condition_cache_ttl": (
+                self.condition_cache.ttl if self.condition_cache else None
+            ),
+            "timing": self.metrics.timing,
+            "trusted_rules": self.trusted_rules,
+            "results_policy": self.results_policy,
+        }
+
+    def _run_recorded(self, context: ExecutionContext) -> int:
+        """
+        Runs the jobs of context as one run of a batch, recording it in the
+        metrics. Returns its duration, 0 when timing is disabled
+        """
+        if not self.metrics.timing:
+            self._run_jobs(context)
+            self.metrics.record_run(None)
+            return 0
+        tick_start = perf_counter_ns()
+        self._run_jobs(context)
+        runtime_ns = perf_counter_ns() - tick_start
+        self.metrics.record_run(runtime_ns)
+        return runtime_ns
+
+    def _run_many(
+        self,
+        rule: RuleInput,
+        compiled_rule: CompiledRule,
+        sessions: Iterable[MutableMapping[str, Any]],
+        executor: Optional[str],
+        workers: Optional[int],
+        chunksize: int,
+        engine_factory: "Optional[Callable[[], Engine]]",
+        total_runtime_ns: int,
+    ) -> Generator[MutableMapping[str, Any], None, None]:
+        try:
+            if executor == "process":
+                for chunk, chunk_runtime_ns in run_in_processes(
+                    self,
+                    compiled_rule,
+                    sessions,
+                    workers,
+                    chunksize,
+                    engine_factory,
+                ):
+                    total_runtime_ns += chunk_runtime_ns
+                    yield from chunk
+            else:
+                for session in sessions:
+                    total_runtime_ns += self._run_recorded(
+                        ExecutionContext(compiled_rule, session, rule)
+                    )
+                    yield session
+        finally:
+            self.metrics.total_runtime_ns = total_runtime_ns
+            self._emit("post_engine_run", rule=rule, session=None)
+
+    def run_batch(
+        self,
+        rule: RuleInput,
+        sessions: Iterable[MutableMapping[str, Any]],
+    ) -> List[MutableMapping[str, Any]]:
+        """
+        Executes the rule against a whole batch of sessions, returning the
+        sessions that passed every condition.
+
+        Vectorized conditions are called once with a SessionBatch of the
+        sessions no previous condition rejected, the masks they return are
+        ANDed. Any other job is called session by session, only for the
+        sessions still in the batch. Engine signals are sent once (with
+        session=None), job signals are only sent for jobs called session by
+        session
+        """
+        self._emit("pre_engine_run", rule=rule, session=None)
+
+        metrics = self.metrics
+        tick_start = perf_counter_ns() if metrics.timing else 0
+        compiled_rule = self.compile(rule)
+        self._check_sync_rule(compiled_rule)
+        contexts = [
+            ExecutionContext(compiled_rule, session, rule)
+            for session in sessions
+        ]
+        for context in contexts:
+            self.results_policy.start_run(context.session)
+        for job in self._plan_rule(compiled_rule).jobs:
+            if not contexts:
+                break
+            if job.vectorized:
+                contexts = self._call_vectorized(job, contexts)
+            elif job.job_type == "condition":
+                contexts = [
+                    context
+                    for context in contexts
+                    if self._call_job(job, context)
+                ]
+            else:
+                for context in contexts:
+                    self._call_job(job, context)
+        metrics.record_run(
+            perf_counter_ns() - tick_start if metrics.timing else None
+        )
 
-        self.runtime_metrics["total_runtime"] = tick_end - tick_start
+        self._emit("post_engine_run", rule=rule, session=None)
+        return [context.session for context in contexts]
+
+    def _call_vectorized(
+        self, job: CompiledJob, contexts: List[ExecutionContext]
+    ) -> List[ExecutionContext]:
+        """
+        Calls a vectorized condition once for the sessions of contexts,
+        returning the contexts of the sessions it passed
+        """
+        batch = SessionBatch([context.session for context in contexts])
+        tick_start = perf_counter_ns() if self.metrics.timing else 0
+        mask = as_mask(
+            job.name, job.function(batch=batch, **job.args), len(batch)
+        )
+        runtime_ns = (
+            perf_counter_ns() - tick_start if self.metrics.timing else None
+        )
+        passes = sum(mask)
+        self.metrics.record_vectorized_job(
+            job.name, runtime_ns, passes, len(mask) - passes
+        )
 
-        post_signal_payload = {"rule": rule, "session": session}
-        self.signals["post_engine_run"].send(self, **post_signal_payload)  # type: ignore[arg-type]
+        passed_contexts: List[ExecutionContext] = []
+        for context, passed in zip(contexts, mask, strict=True):
+            self._record_result(job, context, passed)
+            if passed:
+                passed_contexts.append(context)
+        return passed_contexts
 
     def export_metadata(self, fmt: str = "dict"):
         exporter = self.exporter_class()
         return exporter.export_jobs(self.callables_collected, fmt=fmt)
 
+    def export_metrics(self) -> str:
+        """
+        Metrics of the engine in the OpenMetrics text format, safe to call
+        while the engine is running
+        """
+        exporter = self.metrics_exporter_class()
+        return exporter.export(
+            self.metrics,
+            parse_cache_info=self.parse_cache_info(),
+            condition_cache_info=(
+                self.condition_cache.info()
+                if self.condition_cache is not None
+                else None
+            ),
+        )
+
     def get_signal(self, signal_name):
         if signal_name not in self.signals.keys():
             valid_signal_names = self.signals.keys()
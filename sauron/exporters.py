@@ -1,11 +1,45 @@
 import inspect
 import json as json_lib
-from enum import Enum
-from typing import Any, Callable, Dict, Mapping, Union
+from itertools import accumulate
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Union,
+)
 
 from ruamel.yaml import YAML
 from ruamel.yaml.compat import StringIO
 
+from .cache import CacheInfo
+from .metrics import JobMetrics, LatencyHistogram, MetricsRegistry
+from .validation import enum_choices
+
+OPENMETRICS_CONTENT_TYPE = (
+    "application/openmetrics-text; version=1.0.0; charset=utf-8"
+)
+
+# upper bounds of the exported latency buckets, in seconds
+DEFAULT_LATENCY_BUCKETS = (
+    0.00001,
+    0.00005,
+    0.0001,
+    0.0005,
+    0.001,
+    0.005,
+    0.01,
+    0.05,
+    0.1,
+    0.5,
+    1.0,
+    5.0,
+    10.0,
+)
+
 
 class MyYAML(YAML):
     def dump(self, data, stream=None, **kw):
@@ -33,10 +67,8 @@ class DefaultExporter:
         also gets the choices available
         """
         annotation = param.annotation
-        name = annotation.__name__
-        choices = None
-        if Enum in annotation.__mro__:
-            choices = list(annotation.__members__)
+        name = getattr(annotation, "__name__", str(annotation))
+        choices = enum_choices(annotation)
         defaults = param.default
         if defaults is param.empty:
             defaults = None
@@ -118,3 +150,160 @@ class RuleEngineExporter(DefaultExporter):
             return self.yaml.dump(jobs)
         else:
             return jobs
+
+
+class OpenMetricsExporter:
+    """
+    Renders engine metrics in the OpenMetrics text format: latency
+    histograms and call counts of every job and of whole runs, condition
+    passes and short-circuits, and cache statistics.
+
+    The metrics registry is read without taking its lock, so scraping never
+    blocks a run, at the price of counters being a few calls apart when
+    jobs run during the export
+    """
+
+    def __init__(
+        self,
+        prefix: str = "sauron",
+        buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS,
+    ):
+        self.prefix = prefix
+        self.buckets = tuple(sorted(buckets))
+        self._bucket_indexes: Dict[Any, List[int]] = {}
+
+    @staticmethod
+    def _escape(value: str) -> str:
+        return (
+            value.replace("\\", "\\\\")
+            .replace('"', '\\"')
+            .replace("\n", "\\n")
+        )
+
+    def _indexes(self, histogram: LatencyHistogram) -> List[int]:
+        """
+        For every exported bucket, index of the last histogram bucket whose
+        values all fall below it. Histogram buckets straddling an exported
+        bound are counted in the next bucket
+        """
+        key = (histogram.significant_bits, len(histogram.counts))
+        indexes = self._bucket_indexes.get(key)
+        if indexes is None:
+            indexes = []
+            index = -1
+            for bound in self.buckets:
+                bound_ns = bound * 1e9
+                while (
+                    index + 1 < len(histogram.counts)
+                    and histogram._upper_bound(index + 1) <= bound_ns
+                ):
+                    index += 1
+                indexes.append(index)
+            self._bucket_indexes[key] = indexes
+        return indexes
+
+    def _histogram_lines(
+        self, name: str, labels: str, job_metrics: JobMetrics
+    ) -> List[str]:
+        histogram = job_metrics.histogram
+        cumulative = list(accumulate(list(histogram.counts)))
+        separator = "," if labels else ""
+        label_set = f"{{{labels}}}" if labels else ""
+        lines = []
+        for bound, index in zip(
+            self.buckets, self._indexes(histogram), strict=True
+        ):
+            count = cumulative[index] if index >= 0 else 0
+            lines.append(
+                f'{name}_bucket{{{labels}{separator}le="{bound}"}} {count}'
+            )
+        count = cumulative[-1]
+        lines.append(f'{name}_bucket{{{labels}{separator}le="+Inf"}} {count}')
+        lines.append(f"{name}_count{label_set} {count}")
+        lines.append(f"{name}_sum{label_set} {job_metrics.total_ns / 1e9}")
+        return lines
+
+    def _cache_lines(self, cache_name: str, info: CacheInfo) -> List[str]:
+        name = f"{self.prefix}_{cache_name}"
+        return [
+            f"# TYPE {name}_hits counter",
+            f"{name}_hits_total {info.hits}",
+            f"# TYPE {name}_misses counter",
+            f"{name}_misses_total {info.misses}",
+            f"# TYPE {name}_size gauge",
+            f"{name}_size {info.currsize}",
+            f"# TYPE {name}_max_size gauge",
+            f"{name}_max_size {info.maxsize}",
+        ]
+
+    def export(
+        self,
+        metrics: MetricsRegistry,
+        parse_cache_info: Optional[CacheInfo] = None,
+        condition_cache_info: Optional[CacheInfo] = None,
+    ) -> str:
+        prefix = self.prefix
+        jobs = sorted(metrics.jobs.items(), key=lambda item: item[0])
+        labels = {
+            job_name: f'job="{self._escape(job_name)}"' for job_name, _ in jobs
+        }
+
+        lines = [
+            f"# TYPE {prefix}_job_duration_seconds histogram",
+            f"# UNIT {prefix}_job_duration_seconds seconds",
+        ]
+        for job_name, job_metrics in jobs:
+            lines.extend(
+                self._histogram_lines(
+                    f"{prefix}_job_duration_seconds",
+                    labels[job_name],
+                    job_metrics,
+                )
+            )
+
+        lines.append(f"# TYPE {prefix}_job_calls counter")
+        for job_name, job_metrics in jobs:
+            lines.append(
+                f"{prefix}_job_calls_total{{{labels[job_name]}}} "
+                f"{job_metrics.count}"
+            )
+
+        conditions = [
+            (job_name, job_metrics)
+            for job_name, job_metrics in jobs
+            if job_metrics.passes or job_metrics.failures
+        ]
+        lines.append(f"# TYPE {prefix}_condition_passes counter")
+        for job_name, job_metrics in conditions:
+            lines.append(
+                f"{prefix}_condition_passes_total{{{labels[job_name]}}} "
+                f"{job_metrics.passes}"
+            )
+        lines.append(f"# TYPE {prefix}_condition_short_circuits counter")
+        for job_name, job_metrics in conditions:
+            lines.append(
+                f"{prefix}_condition_short_circuits_total"
+                f"{{{labels[job_name]}}} {job_metrics.failures}"
+            )
+
+        lines.extend(
+            [
+                f"# TYPE {prefix}_run_duration_seconds histogram",
+                f"# UNIT {prefix}_run_duration_seconds seconds",
+                *self._histogram_lines(
+                    f"{prefix}_run_duration_seconds", "", metrics.runs
+                ),
+                f"# TYPE {prefix}_runs counter",
+                f"{prefix}_runs_total {metrics.runs.count}",
+            ]
+        )
+
+        if parse_cache_info is not None:
+            lines.extend(self._cache_lines("parse_cache", parse_cache_info))
+        if condition_cache_info is not None:
+            lines.extend(
+                self._cache_lines("condition_cache", condition_cache_info)
+            )
+
+        lines.append("# EOF")
+        return "\n".join(lines) + "\n"
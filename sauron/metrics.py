@@ -0,0 +1,265 @@
+from threading import Lock
+from typing import Any, Dict, Iterator, Mapping, Optional, Tuple
+
+# one minute, in nanoseconds
+DEFAULT_MAX_VALUE_NS = 60 * 10**9
+
+
+class LatencyHistogram:
+    """
+    Streaming histogram of nanosecond values in fixed memory. Buckets are
+    linear up to 2 ** significant_bits and then split every power of two
+    into 2 ** (significant_bits - 1) buckets, as HDR histograms do, so any
+    recorded value is reported within a relative error of
+    1 / 2 ** (significant_bits - 1). Values above max_value_ns land in the
+    last bucket
+    """
+
+    __slots__ = ("significant_bits", "max_value_ns", "counts")
+
+    def __init__(
+        self,
+        significant_bits: int = 6,
+        max_value_ns: int = DEFAULT_MAX_VALUE_NS,
+    ):
+        if significant_bits < 1:
+            raise ValueError("significant_bits must be a positive integer")
+        if max_value_ns <= 0:
+            raise ValueError("max_value_ns must be a positive integer")
+        self.significant_bits = significant_bits
+        self.max_value_ns = max_value_ns
+        self.counts = [0] * (self._index(max_value_ns) + 1)
+
+    def _index(self, value: int) -> int:
+        bits = self.significant_bits
+        if value < 1 << bits:
+            return value
+        shift = value.bit_length() - bits
+        return (shift << (bits - 1)) + (value >> shift)
+
+    def _upper_bound(self, index: int) -> int:
+        """
+        Highest value counted by the bucket at index
+        """
+        bits = self.significant_bits
+        if index < 1 << bits:
+            return index
+        shift = (index >> (bits - 1)) - 1
+        mantissa = index - (shift << (bits - 1))
+        return ((mantissa + 1) << shift) - 1
+
+    def record(self, value: int) -> None:
+        index = self._index(value) if value > 0 else 0
+        if index >= len(self.counts):
+            index = len(self.counts) - 1
+        self.counts[index] += 1
+
+    @property
+    def count(self) -> int:
+        return sum(self.counts)
+
+    def quantile(self, q: float) -> int:
+        """
+        Value below which a fraction q of the recorded values fall, 0 when
+        nothing was recorded
+        """
+        if not 0 <= q <= 1:
+            raise ValueError("q must be between 0 and 1")
+        total = self.count
+        if not total:
+            return 0
+        rank = max(1, round(q * total))
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if seen >= rank:
+                return self._upper_bound(index)
+        return self._upper_bound(len(self.counts) - 1)  # pragma: no cover
+
+    def buckets(self) -> Iterator[Tuple[int, int]]:
+        """
+        Upper bound and count of every bucket holding values
+        """
+        for index, bucket_count in enumerate(self.counts):
+            if bucket_count:
+                yield self._upper_bound(index), bucket_count
+
+    def clear(self) -> None:
+        self.counts = [0] * len(self.counts)
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        """
+        Adds the counts of a histogram with the same buckets
+        """
+        if len(other.counts) != len(self.counts):
+            raise ValueError("histograms have different buckets")
+        self.counts = [
+            count + other_count
+            for count, other_count in zip(
+                self.counts, other.counts, strict=True
+            )
+        ]
+
+
+class JobMetrics:
+    """
+    Counters of a single job, or of whole runs. Timings are nanoseconds,
+    min_ns is None until a call is timed
+    """
+
+    __slots__ = (
+        "count",
+        "total_ns",
+        "min_ns",
+        "max_ns",
+        "passes",
+        "failures",
+        "histogram",
+    )
+
+    def __init__(
+        self,
+        significant_bits: int = 6,
+        max_value_ns: int = DEFAULT_MAX_VALUE_NS,
+    ):
+        self.count = 0
+        self.total_ns = 0
+        self.min_ns: Optional[int] = None
+        self.max_ns = 0
+        self.passes = 0
+        self.failures = 0
+        self.histogram = LatencyHistogram(significant_bits, max_value_ns)
+
+    @property
+    def mean_ns(self) -> float:
+        return self.total_ns / self.count if self.count else 0.0
+
+    def record(
+        self, runtime_ns: Optional[int], passed: Optional[bool] = None
+    ) -> None:
+        """
+        Counts a call, runtime_ns is None when the call wasn't timed and
+        passed is None for anything but conditions
+        """
+        if runtime_ns is not None:
+            if self.min_ns is None or runtime_ns < self.min_ns:
+                self.min_ns = runtime_ns
+            if runtime_ns > self.max_ns:
+                self.max_ns = runtime_ns
+            self.total_ns += runtime_ns
+            self.histogram.record(runtime_ns)
+        self.count += 1
+        if passed is not None:
+            if passed:
+                self.passes += 1
+            else:
+                self.failures += 1
+
+    def merge(self, other: "JobMetrics") -> None:
+        """
+        Adds the counters of other, recorded somewhere else
+        """
+        if other.min_ns is not None and (
+            self.min_ns is None or other.min_ns < self.min_ns
+        ):
+            self.min_ns = other.min_ns
+        self.max_ns = max(self.max_ns, other.max_ns)
+        self.total_ns += other.total_ns
+        self.count += other.count
+        self.passes += other.passes
+        self.failures += other.failures
+        self.histogram.merge(other.histogram)
+
+
+class MetricsRegistry:
+    """
+    Runtime metrics of an engine: counters, min, max and a latency
+    histogram for every job and for whole runs, plus pass and fail counts
+    of conditions. With timing disabled the clock is never read and only
+    the counters are kept
+    """
+
+    def __init__(
+        self,
+        timing: bool = True,
+        significant_bits: int = 6,
+        max_value_ns: int = DEFAULT_MAX_VALUE_NS,
+    ):
+        self.timing = timing
+        self.significant_bits = significant_bits
+        self.max_value_ns = max_value_ns
+        self.jobs: Dict[str, JobMetrics] = {}
+        self.runs = JobMetrics(significant_bits, max_value_ns)
+        # duration of the last run, or of the last batch for run_many
+        self.total_runtime_ns = 0
+        self._lock = Lock()
+
+    def _job_metrics(self, job_name: str) -> JobMetrics:
+        job_metrics = self.jobs.get(job_name)
+        if job_metrics is None:
+            job_metrics = self.jobs[job_name] = JobMetrics(
+                self.significant_bits, self.max_value_ns
+            )
+        return job_metrics
+
+    def record_job(
+        self,
+        job_name: str,
+        runtime_ns: Optional[int],
+        passed: Optional[bool] = None,
+    ) -> None:
+        with self._lock:
+            self._job_metrics(job_name).record(runtime_ns, passed)
+
+    def record_vectorized_job(
+        self,
+        job_name: str,
+        runtime_ns: Optional[int],
+        passes: int,
+        failures: int,
+    ) -> None:
+        """
+        Counts one call of a vectorized condition, along with how many
+        sessions of its batch passed or failed it
+        """
+        with self._lock:
+            job_metrics = self._job_metrics(job_name)
+            job_metrics.record(runtime_ns)
+            job_metrics.passes += passes
+            job_metrics.failures += failures
+
+    def record_run(self, runtime_ns: Optional[int]) -> None:
+        with self._lock:
+            self.runs.record(runtime_ns)
+            self.total_runtime_ns = runtime_ns or 0
+
+    def merge(
+        self, jobs: Mapping[str, JobMetrics], runs: Optional[JobMetrics] = None
+    ) -> None:
+        """
+        Adds metrics recorded by another registry, like the ones of worker
+        processes. total_runtime_ns is left as it is
+        """
+        with self._lock:
+            for job_name, other in jobs.items():
+                self._job_metrics(job_name).merge(other)
+            if runs is not None:
+                self.runs.merge(runs)
+
+    def clear(self) -> None:
+        with self._lock:
+            self.jobs = {}
+            self.runs = JobMetrics(self.significant_bits, self.max_value_ns)
+            self.total_runtime_ns = 0
+
+    def runtime_metrics(self) -> Dict[str, Any]:
+        """
+        Mean runtime of each job and duration of the last run, in seconds
+        """
+        return {
+            "jobs": {
+                job_name: job_metrics.mean_ns / 1e9
+                for job_name, job_metrics in list(self.jobs.items())
+            },
+            "total_runtime": self.total_runtime_ns / 1e9,
+        }
@@ -1,4 +1,4 @@
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional, Union
 
 from pydantic import BaseModel, Field
 
@@ -21,3 +21,47 @@ class ActionModel(JobModel):
 class RuleModel(BaseModel):
     conditions: List[ConditionModel]
     actions: List[ActionModel]
+
+
+class JobRecord:
+    """
+    Compact and unvalidated stand-in for JobModel, built by parsers for
+    rules coming from trusted sources
+    """
+
+    __slots__ = ("job_type", "name", "args")
+
+    def __init__(
+        self,
+        name: str,
+        args: Optional[Dict[str, Any]] = None,
+        job_type: str = "job",
+    ):
+        self.job_type = job_type
+        self.name = name
+        self.args: Dict[str, Any] = {} if args is None else args
+
+    def model_dump(self) -> Dict[str, Any]:
+        return {
+            "job_type": self.job_type,
+            "name": self.name,
+            "args": self.args,
+        }
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, (JobRecord, JobModel)):
+            return NotImplemented
+        return (self.job_type, self.name, self.args) == (
+            other.job_type,
+            other.name,
+            other.args,
+        )
+
+    def __repr__(self) -> str:
+        return (
+            f"JobRecord(job_type={self.job_type!r}, name={self.name!r}, "
+            f"args={self.args!r})"
+        )
+
+
+Job = Union[JobModel, JobRecord]
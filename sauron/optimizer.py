@@ -0,0 +1,106 @@
+import math
+from threading import Lock
+from typing import Dict, Hashable, List, Tuple
+
+from .cache import LRUCache
+from .compiled import CompiledJob, CompiledRule
+
+
+class ConditionStats:
+    __slots__ = ("calls", "passes", "total_runtime")
+
+    def __init__(self):
+        self.calls = 0
+        self.passes = 0
+        self.total_runtime = 0.0
+
+    @property
+    def average_cost(self) -> float:
+        return self.total_runtime / self.calls if self.calls else 0.0
+
+    @property
+    def pass_rate(self) -> float:
+        return self.passes / self.calls if self.calls else 1.0
+
+    @property
+    def rank(self) -> float:
+        """
+        Expected cost per rejected call, the lower the earlier a condition
+        should run to maximize short-circuits
+        """
+        rejection_rate = 1.0 - self.pass_rate
+        if rejection_rate <= 0:
+            return math.inf
+        return self.average_cost / rejection_rate
+
+
+class ConditionOptimizer:
+    """
+    Reorders pure conditions by their observed cost and selectivity, so
+    cheap conditions that usually fail run first. Conditions are tracked by
+    their args_key, job name and args, and orders are only recomputed every
+    reorder_interval calls.
+    Only consecutive pure conditions swap places: other jobs keep their
+    position and act as barriers
+    """
+
+    def __init__(
+        self,
+        min_calls: int = 10,
+        reorder_interval: int = 100,
+        maxsize: int = 128,
+    ):
+        self.min_calls = min_calls
+        self.reorder_interval = reorder_interval
+        self.stats: Dict[Hashable, ConditionStats] = {}
+        self._recorded = 0
+        self._version = 0
+        self._plans = LRUCache(maxsize)
+        self._lock = Lock()
+
+    def record(self, args_key: Hashable, runtime: float, passed: bool) -> None:
+        with self._lock:
+            stats = self.stats.get(args_key)
+            if stats is None:
+                stats = self.stats[args_key] = ConditionStats()
+            stats.calls += 1
+            stats.total_runtime += runtime
+            if passed:
+                stats.passes += 1
+            self._recorded += 1
+            if self._recorded % self.reorder_interval == 0:
+                self._version += 1
+
+    def _rank(self, job: CompiledJob) -> float:
+        stats = self.stats.get(job.args_key)
+        if stats is None or stats.calls < self.min_calls:
+            # unknown conditions go first, so they gather statistics
+            return -math.inf
+        return stats.rank
+
+    def _order(self, jobs: Tuple[CompiledJob, ...]) -> Tuple[CompiledJob, ...]:
+        ordered: List[CompiledJob] = []
+        group: List[CompiledJob] = []
+        for job in jobs:
+            if job.job_type == "condition" and job.pure:
+                group.append(job)
+                continue
+            ordered.extend(sorted(group, key=self._rank))
+            group = []
+            ordered.append(job)
+        ordered.extend(sorted(group, key=self._rank))
+        return tuple(ordered)
+
+    def plan(self, compiled_rule: CompiledRule) -> CompiledRule:
+        key = id(compiled_rule.jobs)
+        cached = self._plans.get(key)
+        # the original jobs are kept in the entry, so ids can't be reused
+        if (
+            cached is not None
+            and cached[0] is compiled_rule.jobs
+            and cached[1] == self._version
+        ):
+            return cached[2]
+        planned = CompiledRule(jobs=self._order(compiled_rule.jobs))
+        self._plans.set(key, (compiled_rule.jobs, self._version, planned))
+        return planned
@@ -0,0 +1,121 @@
+import importlib
+import os
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from functools import partial
+from itertools import islice
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    MutableMapping,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+from .compiled import CompiledRule
+from .context import ExecutionContext
+from .metrics import JobMetrics
+
+if TYPE_CHECKING:
+    from .engine import Engine
+
+# state of each worker process, set once by the pool initializer
+_worker_state: Dict[str, Any] = {}
+
+
+def _init_worker(
+    engine_factory: "Callable[[], Engine]",
+    job_modules: Sequence[str],
+    compiled_rule: CompiledRule,
+):
+    engine = engine_factory()
+    for module_name in job_modules:
+        engine.import_jobs(importlib.import_module(module_name))
+    _worker_state["engine"] = engine
+    _worker_state["compiled_rule"] = compiled_rule
+
+
+def _run_chunk(
+    sessions: List[MutableMapping[str, Any]],
+) -> Tuple[
+    List[MutableMapping[str, Any]], int, Dict[str, JobMetrics], JobMetrics
+]:
+    """
+    Runs the rule against a chunk of sessions, returning them along with
+    the time spent running them and the metrics they recorded
+    """
+    engine: "Engine" = _worker_state["engine"]
+    compiled_rule: CompiledRule = _worker_state["compiled_rule"]
+    engine.metrics.clear()
+    runtime_ns = 0
+    for session in sessions:
+        runtime_ns += engine._run_recorded(
+            ExecutionContext(compiled_rule, session)
+        )
+    return sessions, runtime_ns, engine.metrics.jobs, engine.metrics.runs
+
+
+def chunked(
+    sessions: Iterable[MutableMapping[str, Any]], chunksize: int
+) -> Iterator[List[MutableMapping[str, Any]]]:
+    iterator = iter(sessions)
+    while True:
+        chunk = list(islice(iterator, chunksize))
+        if not chunk:
+            return
+        yield chunk
+
+
+def run_in_processes(
+    engine: "Engine",
+    compiled_rule: CompiledRule,
+    sessions: Iterable[MutableMapping[str, Any]],
+    workers: Optional[int] = None,
+    chunksize: int = 64,
+    engine_factory: "Optional[Callable[[], Engine]]" = None,
+) -> Iterator[Tuple[List[MutableMapping[str, Any]], int]]:
+    """
+    Fans chunks of sessions out to a pool of worker processes, yielding
+    each chunk of mutated sessions with the nanoseconds spent running it,
+    in the same order the sessions were given. The metrics recorded by the
+    workers are merged into the metrics of engine.
+
+    Workers build their engine with engine_factory, by default the class
+    of engine with the configuration given by Engine._worker_kwargs. The
+    factory, the compiled rule and the job modules imported by the engine
+    are sent to each worker only once, and only a few chunks per worker
+    are in flight at any time
+    """
+    if chunksize <= 0:
+        raise ValueError("chunksize must be a positive integer")
+    workers = workers or os.cpu_count() or 1
+    if engine_factory is None:
+        engine_factory = partial(type(engine), **engine._worker_kwargs())
+
+    def merged(
+        future: Future,
+    ) -> Tuple[List[MutableMapping[str, Any]], int]:
+        chunk, runtime_ns, jobs, runs = future.result()
+        engine.metrics.merge(jobs, runs)
+        return chunk, runtime_ns
+
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(engine_factory, tuple(engine.job_modules), compiled_rule),
+    ) as executor:
+        max_pending = 2 * workers
+        pending: Deque[Future] = deque()
+        for chunk in chunked(sessions, chunksize):
+            pending.append(executor.submit(_run_chunk, chunk))
+            if len(pending) >= max_pending:
+                yield merged(pending.popleft())
+        while pending:
+            yield merged(pending.popleft())
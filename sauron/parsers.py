@@ -1,52 +1,175 @@
-from json.decoder import JSONDecodeError
-from typing import List, Type, Union
+import json as json_lib
+from typing import Any, Callable, Iterator, List, Optional, Type, Union
 
-from ruamel.yaml import YAML
+from ruamel.yaml import YAML, YAMLError
 
-from sauron.models import ActionModel, ConditionModel, JobModel
+from sauron.cache import LRUCache, content_key
+from sauron.models import (
+    ActionModel,
+    ConditionModel,
+    Job,
+    JobModel,
+    JobRecord,
+)
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None  # type: ignore[assignment]
+
+json_loads: Callable[[str], Any] = (
+    orjson.loads if orjson is not None else json_lib.loads
+)
+
+RULE_FORMATS = ("json", "yaml")
 
 
 class DefaultParser:
     single_model: Type[JobModel] = JobModel
 
-    def __init__(self):
-        self.yaml = YAML(typ="safe")
+    # defaults for subclasses that don't call DefaultParser.__init__
+    cache: Optional[LRUCache] = None
+    trusted: bool = False
+    _yaml: Optional[YAML] = None
+
+    def __init__(
+        self, cache: Optional[LRUCache] = None, trusted: bool = False
+    ):
+        """
+        - Parsed jobs are kept in cache when given
+        - Jobs of trusted rules are not validated, and are built as compact
+          JobRecord instead of JobModel
+        """
+        self._yaml: Optional[YAML] = None
+        self.cache = cache
+        self.trusted = trusted
+
+    @property
+    def yaml(self) -> YAML:
+        """
+        The YAML loader is only built when a rule actually needs it
+        """
+        if self._yaml is None:
+            self._yaml = YAML(typ="safe")
+        return self._yaml
+
+    @yaml.setter
+    def yaml(self, loader: YAML) -> None:
+        self._yaml = loader
+
+    def _decode_string(self, jobs_input: str, fmt: Optional[str] = None):
+        """
+        Decodes a json or yaml string. Without an explicit fmt, strings that
+        look like json go through the json decoder and only fall back to
+        yaml when that fails
+        """
+        if fmt not in (None, *RULE_FORMATS):
+            raise ValueError(f"fmt must be one of {RULE_FORMATS}, not {fmt}")
+
+        if fmt == "json" or (
+            fmt is None and jobs_input.lstrip()[:1] in ("[", "{")
+        ):
+            try:
+                return json_loads(jobs_input)
+            except ValueError:
+                if fmt == "json":
+                    raise ValueError(
+                        "jobs param is not a valid json string"
+                    ) from None
+        try:
+            return self.yaml.load(jobs_input)
+        except YAMLError:
+            raise ValueError(
+                "jobs param is not a valid json or yaml string"
+            ) from None
+
+    def _make_job(
+        self,
+        model_class: Type[JobModel],
+        job_dict: dict,
+        job_type: Optional[str] = None,
+    ) -> Job:
+        """
+        Builds a job of model_class from its dictionary, or a JobRecord for
+        trusted rules. A given job_type takes precedence over the one in
+        the dictionary, which is left untouched
+        """
+        if self.trusted:
+            try:
+                name = job_dict["name"]
+            except (KeyError, TypeError):
+                raise ValueError(
+                    "each job must be a dict with a name"
+                ) from None
+            if job_type is None:
+                job_type = job_dict.get(
+                    "job_type", model_class.model_fields["job_type"].default
+                )
+            return JobRecord(name, dict(job_dict.get("args") or {}), job_type)
+        if job_type is not None and job_dict.get("job_type", job_type) != (
+            job_type
+        ):
+            job_dict = {**job_dict, "job_type": job_type}
+        return model_class(**job_dict)
 
-    def _parse_single_job(self, job_dict) -> JobModel:
+    def _parse_single_job(self, job_dict) -> Job:
         """
         Method that know how to parse a single job dictionary
         """
-        return self.single_model(**job_dict)
+        return self._make_job(self.single_model, job_dict)
 
-    def _parse_jobs_from_list(self, jobs_input) -> List[JobModel]:
+    def _parse_jobs_from_list(self, jobs_input) -> List[Job]:
         """
         Method that know how to parse a list for jobs
         """
         parsed_jobs: List = []
         for raw_job in jobs_input:
-            current_job: JobModel = self._parse_single_job(raw_job)
+            current_job: Job = self._parse_single_job(raw_job)
             parsed_jobs.append(current_job)
         return parsed_jobs
 
-    def _parse_jobs_from_string(self, jobs_input) -> List[JobModel]:
+    def _parse_jobs_from_string(
+        self, jobs_input, fmt: Optional[str] = None
+    ) -> List[Job]:
         """
         Method that know how to parse a list for jobs described by a
-        json-string with the list of jobs
+        json or yaml string with the list of jobs
         """
-        try:
-            jobs: list = self.yaml.load(jobs_input)
-        except JSONDecodeError:
-            raise ValueError("jobs param is not a valid json string") from None
-        else:
-            return self._parse_jobs_from_list(jobs)
+        jobs: list = self._decode_string(jobs_input, fmt)
+        return self._parse_jobs_from_list(jobs)
 
-    def parse(self, jobs_input) -> List[JobModel]:
+    def parse(self, jobs_input, fmt: Optional[str] = None) -> List[Job]:
         """
-        Main method called to parse any jobs
+        Main method called to parse any jobs. Strings are decoded according
+        to fmt ("json" or "yaml"), guessed when not given. When the parser
+        has a cache, jobs already parsed from the same content, format and
+        trusted flag are reused
         """
-        jobs_list_data: List[JobModel] = []
+        if self.cache is None:
+            return self._parse_jobs(jobs_input, fmt)
+
+        # the same content gives different jobs in another format, or when
+        # it is trusted
+        key = (content_key(jobs_input), fmt, self.trusted)
+        cached_jobs = self.cache.get(key)
+        if cached_jobs is None:
+            cached_jobs = tuple(self._parse_jobs(jobs_input, fmt))
+            self.cache.set(key, cached_jobs)
+        return list(cached_jobs)
+
+    def _parse_jobs(self, jobs_input, fmt: Optional[str] = None) -> List[Job]:
+        """
+        Method that know how to parse any jobs
+        """
+        jobs_list_data: List[Job] = []
         if isinstance(jobs_input, str):
-            jobs_list_data = self._parse_jobs_from_string(jobs_input)
+            # fmt is only passed when given, for subclasses overriding
+            # _parse_jobs_from_string(jobs_input)
+            jobs_list_data = (
+                self._parse_jobs_from_string(jobs_input)
+                if fmt is None
+                else self._parse_jobs_from_string(jobs_input, fmt)
+            )
         elif isinstance(jobs_input, list):
             # jobs_input is a python list
             jobs_list_data = self._parse_jobs_from_list(jobs_input)
@@ -58,73 +181,73 @@ class DefaultParser:
 class RuleEngineParser(DefaultParser):
     single_model: Type[JobModel] = JobModel
 
-    def __init__(self):
-        self.yaml = YAML(typ="safe")
-
-    def _parse_jobs_from_string(self, jobs_input: str) -> List[JobModel]:
+    def _parse_jobs_from_string(
+        self, jobs_input: str, fmt: Optional[str] = None
+    ) -> List[Job]:
         """
         Method that know how to parse a list for jobs described by a
-        json-string with the list of jobs
+        json or yaml string with the conditions and actions
         """
-        try:
-            decoded_jobs: dict = self.yaml.load(jobs_input)
-            conditions: list = decoded_jobs.get("conditions", [])
-            actions: list = decoded_jobs.get("actions", [])
-            for condition in conditions:
-                condition["job_type"] = "condition"
-            for action in actions:
-                action["job_type"] = "action"
-            jobs: list = conditions + actions
-        except JSONDecodeError:
-            raise ValueError("jobs param is not a valid json string") from None
-        else:
-            return self._parse_jobs_from_list(jobs)
+        decoded_jobs: Union[list, dict] = self._decode_string(jobs_input, fmt)
+        if isinstance(decoded_jobs, list):
+            return self._parse_jobs_from_list(decoded_jobs)
+        return list(self._iter_rule_jobs(decoded_jobs))
 
-    def _parse_single_job(
-        self, job_dict: dict, job_type: str = "job"
-    ) -> JobModel:
+    def _parse_single_job(self, job_dict: dict, job_type: str = "job") -> Job:
         """
         Method that know how to parse a single job dictionary
         """
         if job_type == "condition":
-            return ConditionModel(**job_dict)
+            return self._make_job(ConditionModel, job_dict)
         elif job_type == "action":
-            return ActionModel(**job_dict)
+            return self._make_job(ActionModel, job_dict)
         else:
-            return JobModel(**job_dict)
+            return self._make_job(JobModel, job_dict)
+
+    def _iter_rule_jobs(self, rule: dict) -> Iterator[Job]:
+        """
+        Lazily parses the conditions and then the actions of a rule. The
+        type of each job comes from the list holding it, the rule itself
+        is never changed
+        """
+        for raw_job in rule.get("conditions", []):
+            yield self._make_job(ConditionModel, raw_job, "condition")
+        for raw_job in rule.get("actions", []):
+            yield self._make_job(ActionModel, raw_job, "action")
 
-    def _parse_jobs_from_list(self, jobs_input: list) -> List[JobModel]:
+    def _parse_jobs_from_list(self, jobs_input: list) -> List[Job]:
         """
         Method that know how to parse a list for jobs
         """
         parsed_jobs: List = []
         for raw_job in jobs_input:
             job_type: str = raw_job.get("job_type", "job")
-            current_job: JobModel = self._parse_single_job(raw_job, job_type)
+            current_job: Job = self._parse_single_job(raw_job, job_type)
             parsed_jobs.append(current_job)
         return parsed_jobs
 
-    def parse(self, jobs_input: Union[List, str, dict]) -> List[JobModel]:
+    def _parse_jobs(
+        self, jobs_input: Union[List, str, dict], fmt: Optional[str] = None
+    ) -> List[Job]:
         """
-        Main method called to parse any jobs
+        Method that know how to parse any jobs
         """
-        jobs_list_data: List[JobModel] = []
+        jobs_list_data: List[Job] = []
         if isinstance(jobs_input, str):
-            jobs_list_data = self._parse_jobs_from_string(jobs_input)
+            # fmt is only passed when given, for subclasses overriding
+            # _parse_jobs_from_string(jobs_input)
+            jobs_list_data = (
+                self._parse_jobs_from_string(jobs_input)
+                if fmt is None
+                else self._parse_jobs_from_string(jobs_input, fmt)
+            )
         elif isinstance(jobs_input, list):
             # jobs_input is a python list
             jobs_list_data = self._parse_jobs_from_list(jobs_input)
         elif isinstance(jobs_input, dict):
             # jobs_input is a dict with conditions and actions
             try:
-                conditions: list = jobs_input.get("conditions", [])
-                actions: list = jobs_input.get("actions", [])
-                for condition in conditions:
-                    condition["job_type"] = "condition"
-                for action in actions:
-                    action["job_type"] = "action"
-                jobs: list = conditions + actions
-                jobs_list_data = self._parse_jobs_from_list(jobs)
+                jobs_list_data = list(self._iter_rule_jobs(jobs_input))
             except Exception:
                 raise ValueError(
                     "jobs param must be a dict with 'conditions' and 'actions' keys"
@@ -0,0 +1,92 @@
+import json as json_lib
+import os
+import threading
+from collections import deque
+from itertools import count
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+# name, category, start and end in nanoseconds, args
+Span = Tuple[str, str, int, int, Optional[Dict[str, Any]]]
+
+
+class RunProfile:
+    """
+    Spans recorded during a single sampled run. Spans nest by time: the run
+    span contains the parse, lookup and job spans, and every job span its
+    call and signal spans
+    """
+
+    __slots__ = ("thread_id", "spans")
+
+    def __init__(self):
+        self.thread_id = threading.get_ident()
+        self.spans: List[Span] = []
+
+    def add(
+        self,
+        name: str,
+        category: str,
+        start_ns: int,
+        end_ns: int,
+        args: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        self.spans.append((name, category, start_ns, end_ns, args))
+
+
+class SamplingProfiler:
+    """
+    Profiles one run out of every `every`, keeping the spans of the last
+    maxsize sampled runs. Runs that are not sampled only pay for a counter
+    increment
+    """
+
+    def __init__(self, every: int = 100, maxsize: int = 100):
+        if every <= 0:
+            raise ValueError("every must be a positive integer")
+        self.every = every
+        self.profiles: Deque[RunProfile] = deque(maxlen=maxsize)
+        self._counter = count()
+
+    def sample(self) -> Optional[RunProfile]:
+        """
+        A new profile when the current run is sampled, None otherwise
+        """
+        if next(self._counter) % self.every:
+            return None
+        return RunProfile()
+
+    def finish(self, profile: RunProfile) -> None:
+        self.profiles.append(profile)
+
+    def clear(self) -> None:
+        self.profiles.clear()
+
+    def chrome_trace(self) -> Dict[str, Any]:
+        """
+        Sampled runs in the Chrome trace event format, which can be loaded
+        by chrome://tracing, Perfetto or speedscope
+        """
+        pid = os.getpid()
+        events = []
+        for profile in list(self.profiles):
+            for name, category, start_ns, end_ns, args in profile.spans:
+                event: Dict[str, Any] = {
+                    "name": name,
+                    "cat": category,
+                    "ph": "X",
+                    "ts": start_ns / 1000,
+                    "dur": (end_ns - start_ns) / 1000,
+                    "pid": pid,
+                    "tid": profile.thread_id,
+                }
+                if args:
+                    event["args"] = args
+                events.append(event)
+        return {"traceEvents": events, "displayTimeUnit": "ns"}
+
+    def dump(self, path: str) -> None:
+        """
+        Writes the sampled runs to path as a Chrome trace json file
+        """
+        with open(path, "w") as trace_file:
+            json_lib.dump(self.chrome_trace(), trace_file, default=repr)
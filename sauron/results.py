@@ -0,0 +1,133 @@
+from abc import ABC, abstractmethod
+from collections import deque
+from collections.abc import Mapping
+from typing import Any, Callable, Iterator, MutableMapping
+
+RESULTS_KEY = "results"
+
+
+class JobResult(Mapping):
+    """
+    Compact record of a job call. Reads and compares like the
+    {"job": ..., "return": ...} dicts sessions used to hold, use dict(record)
+    to serialize it
+    """
+
+    __slots__ = ("job", "value")
+
+    def __init__(self, job: str, value: Any):
+        self.job = job
+        self.value = value
+
+    def __getitem__(self, key: str) -> Any:
+        if key == "job":
+            return self.job
+        if key == "return":
+            return self.value
+        raise KeyError(key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(("job", "return"))
+
+    def __len__(self) -> int:
+        return 2
+
+    def __repr__(self) -> str:
+        return f"JobResult(job={self.job!r}, value={self.value!r})"
+
+
+class ResultsPolicy(ABC):
+    """
+    Decides what the session keeps of each job call. start_run is called
+    before the first job of every run of a session
+    """
+
+    # optional hook, policies keeping every run have nothing to reset
+    def start_run(self, session: MutableMapping[str, Any]) -> None:  # noqa: B027
+        pass
+
+    @abstractmethod
+    def record(
+        self, session: MutableMapping[str, Any], job_name: str, result: Any
+    ) -> None: ...
+
+
+class AllResults(ResultsPolicy):
+    """
+    Default policy, appends a {"job": ..., "return": ...} dict to
+    session["results"] for every job call, across every run of the session
+    """
+
+    def record(
+        self, session: MutableMapping[str, Any], job_name: str, result: Any
+    ) -> None:
+        results = session.get(RESULTS_KEY, None)
+        if not results:
+            results = session[RESULTS_KEY] = []
+        results.append({"job": job_name, "return": result})
+
+
+class NoResults(ResultsPolicy):
+    """
+    Keeps nothing, sessions don't get a results key
+    """
+
+    def record(
+        self, session: MutableMapping[str, Any], job_name: str, result: Any
+    ) -> None:
+        pass
+
+
+class LastResults(ResultsPolicy):
+    """
+    Keeps the last maxsize results of the session in a ring buffer
+    """
+
+    def __init__(self, maxsize: int):
+        if maxsize <= 0:
+            raise ValueError("maxsize must be a positive integer")
+        self.maxsize = maxsize
+
+    def record(
+        self, session: MutableMapping[str, Any], job_name: str, result: Any
+    ) -> None:
+        results = session.get(RESULTS_KEY, None)
+        if results is None or getattr(results, "maxlen", None) != self.maxsize:
+            results = session[RESULTS_KEY] = deque(
+                results or (), maxlen=self.maxsize
+            )
+        results.append(JobResult(job_name, result))
+
+
+class RunResults(ResultsPolicy):
+    """
+    Keeps the results of the last run of the session only
+    """
+
+    def start_run(self, session: MutableMapping[str, Any]) -> None:
+        session[RESULTS_KEY] = []
+
+    def record(
+        self, session: MutableMapping[str, Any], job_name: str, result: Any
+    ) -> None:
+        results = session.get(RESULTS_KEY, None)
+        if results is None:
+            results = session[RESULTS_KEY] = []
+        results.append(JobResult(job_name, result))
+
+
+class StreamResults(ResultsPolicy):
+    """
+    Hands every result to callback(session, job_result) instead of keeping
+    it in the session
+    """
+
+    def __init__(
+        self, callback: Callable[[MutableMapping[str, Any], JobResult], Any]
+    ):
+        self.callback = callback
+
+    def record(
+        self, session: MutableMapping[str, Any], job_name: str, result: Any
+    ) -> None:
+        self.callback(session, JobResult(job_name, result))
@@ -1,7 +1,10 @@
-from typing import Callable, Optional, Type
+from typing import Any, Callable, Dict, Optional, Type
 
+from .compiled import CompiledJob, CompiledRule
+from .context import ExecutionContext
 from .engine import Engine
 from .exporters import DefaultExporter, RuleEngineExporter
+from .optimizer import ConditionOptimizer
 from .parsers import DefaultParser, RuleEngineParser
 
 
@@ -9,14 +12,71 @@ class RuleEngine(Engine):
     parser_class: Type[DefaultParser] = RuleEngineParser
     exporter_class: Type[DefaultExporter] = RuleEngineExporter
 
+    def __init__(self, *args, optimize_conditions: bool = False, **kwargs):
+        """
+        - With optimize_conditions, conditions registered with pure=True
+          are reordered by their observed cost and pass rate
+        """
+        super().__init__(*args, **kwargs)
+        self.condition_optimizer: Optional[ConditionOptimizer] = None
+        if optimize_conditions:
+            self.condition_optimizer = ConditionOptimizer()
+
+    def _worker_kwargs(self) -> Dict[str, Any]:
+        worker_kwargs = super()._worker_kwargs()
+        worker_kwargs["optimize_conditions"] = (
+            self.condition_optimizer is not None
+        )
+        return worker_kwargs
+
+    def _plan_rule(self, compiled_rule: CompiledRule) -> CompiledRule:
+        if self.condition_optimizer is None:
+            return compiled_rule
+        return self.condition_optimizer.plan(compiled_rule)
+
+    def _after_job_call(
+        self,
+        job: CompiledJob,
+        context: ExecutionContext,
+        result: Any,
+        runtime_ns: Optional[int],
+    ) -> None:
+        super()._after_job_call(job, context, result, runtime_ns)
+        if (
+            self.condition_optimizer is not None
+            and job.pure
+            and job.job_type == "condition"
+        ):
+            self.condition_optimizer.record(
+                job.args_key, runtime_ns or 0, bool(result)
+            )
+
     def condition(self, *args, **kwargs):
+        """
+        Decorator for conditions:
+        - pure=True marks conditions without side effects, which can be
+          reordered by the condition optimizer
+        - cacheable=True marks conditions whose result only depends on
+          their args and on the session_keys values, so it can be reused
+        - vectorized=True marks conditions taking a SessionBatch as batch and
+          returning one truthy value per session, see Engine.run_batch
+        """
+
         def decorator(function: Callable):
             verbose_name: Optional[str] = kwargs.get("verbose_name", None)
             if args:
                 verbose_name = args[0]
             if verbose_name is None:
                 verbose_name = function.__name__
-            self._add_callable(function, verbose_name, job_type="condition")
+            self._add_callable(
+                function,
+                verbose_name,
+                job_type="condition",
+                pure=kwargs.get("pure", False),
+                cacheable=kwargs.get("cacheable", False),
+                session_keys=kwargs.get("session_keys", ()),
+                vectorized=kwargs.get("vectorized", False),
+            )
             return function
 
         return decorator
@@ -0,0 +1,140 @@
+from time import perf_counter_ns
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    List,
+    MutableMapping,
+    NamedTuple,
+    Optional,
+    Tuple,
+)
+
+from .cache import content_key
+from .compiled import CompiledJob, CompiledRule, RuleInput
+from .context import ExecutionContext
+from .engine import Engine
+
+
+class RuleNode(NamedTuple):
+    conditions: Tuple[int, ...]
+    actions: Tuple[CompiledJob, ...]
+
+
+class RuleSet:
+    """
+    Many rules evaluated together against the same session. Identical
+    conditions (same name and args) across rules are compiled into a single
+    shared node, evaluated at most once per session. Rules are indexed by
+    node, so a failing node rejects every rule depending on it without
+    their conditions being looked at again.
+
+    Evaluation happens in two phases: the conditions of every rule are
+    matched first, then the actions of each matching rule run, in the order
+    the rules were given. Actions can't change which rules match
+    """
+
+    def __init__(
+        self,
+        engine: Engine,
+        rules: Iterable[RuleInput],
+    ):
+        self.engine = engine
+        self.nodes: List[CompiledJob] = []
+        self.rules: List[RuleNode] = []
+        # indexes of the rules depending on each node
+        self.dependents: List[Tuple[int, ...]] = []
+
+        node_ids: Dict[Tuple[str, bytes], int] = {}
+        for rule in rules:
+            conditions: List[int] = []
+            actions: List[CompiledJob] = []
+            for job in engine.compile(rule).jobs:
+                if job.job_type != "condition":
+                    actions.append(job)
+                    continue
+                key = (job.name, content_key(dict(job.args)))
+                node_id = node_ids.get(key)
+                if node_id is None:
+                    node_id = node_ids[key] = len(self.nodes)
+                    self.nodes.append(job)
+                conditions.append(node_id)
+            self.rules.append(RuleNode(tuple(conditions), tuple(actions)))
+
+        dependents: List[List[int]] = [[] for _ in self.nodes]
+        for rule_index, rule_node in enumerate(self.rules):
+            for node_id in set(rule_node.conditions):
+                dependents[node_id].append(rule_index)
+        self.dependents = [tuple(indexes) for indexes in dependents]
+        engine._check_sync_rule(
+            CompiledRule(
+                jobs=tuple(self.nodes)
+                + tuple(job for rule in self.rules for job in rule.actions)
+            )
+        )
+
+    def _match(self, context: ExecutionContext) -> List[int]:
+        values: List[Optional[bool]] = [None] * len(self.nodes)
+        rejected = [False] * len(self.rules)
+        matched: List[int] = []
+        for rule_index, rule in enumerate(self.rules):
+            if rejected[rule_index]:
+                continue
+            for node_id in rule.conditions:
+                value = values[node_id]
+                if value is None:
+                    result = self.engine._call_job(
+                        self.nodes[node_id], context
+                    )
+                    value = values[node_id] = bool(result)
+                    if not value:
+                        for dependent in self.dependents[node_id]:
+                            rejected[dependent] = True
+                if not value:
+                    break
+            else:
+                matched.append(rule_index)
+        return matched
+
+    def _context(
+        self, session: MutableMapping[str, Any], memo: Optional[Dict[Any, Any]]
+    ) -> ExecutionContext:
+        return ExecutionContext(
+            CompiledRule(jobs=tuple(self.nodes)), session, self, memo
+        )
+
+    def match(
+        self,
+        session: MutableMapping[str, Any],
+        memo: Optional[Dict[Any, Any]] = None,
+    ) -> List[int]:
+        """
+        Indexes of the rules whose conditions all pass
+        """
+        return self._match(self._context(session, memo))
+
+    def run(
+        self,
+        session: MutableMapping[str, Any],
+        memo: Optional[Dict[Any, Any]] = None,
+    ) -> List[int]:
+        """
+        Fires the actions of every matching rule, returning their indexes
+        """
+        engine = self.engine
+        engine._emit("pre_engine_run", rule=self, session=session)
+
+        timing = engine.metrics.timing
+        tick_start = perf_counter_ns() if timing else 0
+        context = self._context(session, memo)
+        engine.results_policy.start_run(session)
+        matched = self._match(context)
+        for rule_index in matched:
+            for job in self.rules[rule_index].actions:
+                engine._call_job(job, context)
+        engine.metrics.record_run(
+            perf_counter_ns() - tick_start if timing else None
+        )
+
+        engine._emit("post_engine_run", rule=self, session=session)
+        return matched
@@ -0,0 +1,443 @@
+from collections import deque
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    MutableMapping,
+    MutableSequence,
+    Optional,
+    Tuple,
+    cast,
+)
+
+# marks keys deleted by an overlay layer
+_deleted = object()
+
+# marks keys missing from every layer and the base
+_missing = object()
+
+# containers copied into the top layer before they can be changed in place,
+# lists and dicts are read through views and copied on their first change
+_COPIED_ON_READ = (set, deque)
+_CONTAINERS = (dict, list, *_COPIED_ON_READ)
+
+
+def _unwrap(value: Any) -> Any:
+    """
+    Container behind a view, so views are never stored in a session
+    """
+    if isinstance(value, _SessionView):
+        return value._current()
+    return value
+
+
+class _SessionView:
+    """
+    Copy-on-write view of a list or dict of a session. Reads go to the
+    container, the first change copies it, and the containers holding it,
+    into the top layer of the session
+    """
+
+    __slots__ = ("_session", "_parent", "_key", "_target")
+
+    def __init__(
+        self,
+        session: "Session",
+        parent: Optional["_SessionView"],
+        key: Any,
+        target: Any,
+    ):
+        self._session = session
+        self._parent = parent
+        self._key = key
+        self._target = target
+
+    def _current(self) -> Any:
+        if self._session._has_copies:
+            self._target = self._session._resolve(self._target)
+        return self._target
+
+    def _writable(self) -> Any:
+        target = self._current()
+        session = self._session
+        copy = session._own(target)
+        if copy is not target:
+            session._replace(self._parent, self._key, target, copy)
+            self._target = copy
+        return copy
+
+    def _child(self, key: Any, value: Any) -> Any:
+        view = _VIEWS.get(type(value))
+        if view is not None:
+            return view(self._session, self, key, value)
+        if isinstance(value, _CONTAINERS):
+            return self._session._wrap(value, self, key)
+        return value
+
+    def __eq__(self, other: object) -> bool:
+        return bool(self._current() == _unwrap(other))
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return repr(self._current())
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        # pickled and copied as the container it shows
+        target = self._current()
+        return type(target), (target,)
+
+
+class SessionDict(_SessionView, MutableMapping):
+    """
+    View of a dict read from a Session
+    """
+
+    __slots__ = ()
+
+    def __getitem__(self, key: Any) -> Any:
+        return self._child(key, self._current()[key])
+
+    def __setitem__(self, key: Any, value: Any) -> None:
+        self._writable()[key] = _unwrap(value)
+
+    def __delitem__(self, key: Any) -> None:
+        del self._writable()[key]
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._current()
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self._current())
+
+    def __len__(self) -> int:
+        return len(self._current())
+
+    def copy(self) -> Dict[Any, Any]:
+        return dict(self.items())
+
+
+class SessionList(_SessionView, MutableSequence):
+    """
+    View of a list read from a Session
+    """
+
+    __slots__ = ()
+
+    def __getitem__(self, index: Any) -> Any:
+        target = self._current()
+        if isinstance(index, slice):
+            return [
+                self._child(position, target[position])
+                for position in range(*index.indices(len(target)))
+            ]
+        value = target[index]
+        return self._child(index % len(target), value)
+
+    def __setitem__(self, index: Any, value: Any) -> None:
+        if isinstance(index, slice):
+            value = [_unwrap(item) for item in value]
+        else:
+            value = _unwrap(value)
+        self._writable()[index] = value
+
+    def __delitem__(self, index: Any) -> None:
+        del self._writable()[index]
+
+    def __iter__(self) -> Iterator[Any]:
+        for index, value in enumerate(self._current()):
+            yield self._child(index, value)
+
+    def __len__(self) -> int:
+        return len(self._current())
+
+    def __add__(self, other: Iterable[Any]) -> List[Any]:
+        return list(self) + list(other)
+
+    def __radd__(self, other: Iterable[Any]) -> List[Any]:
+        return list(other) + list(self)
+
+    def insert(self, index: int, value: Any) -> None:
+        self._writable().insert(index, _unwrap(value))
+
+    def append(self, value: Any) -> None:
+        self._writable().append(_unwrap(value))
+
+    def extend(self, values: Iterable[Any]) -> None:
+        values = [_unwrap(value) for value in values]
+        self._writable().extend(values)
+
+    def sort(self, *, key: Any = None, reverse: bool = False) -> None:
+        self._writable().sort(key=key, reverse=reverse)
+
+    def reverse(self) -> None:
+        self._writable().reverse()
+
+    def copy(self) -> List[Any]:
+        return list(self)
+
+
+# views of the exact types, subclasses are looked up with isinstance
+_VIEWS: Dict[type, type] = {dict: SessionDict, list: SessionList}
+
+
+class Session(MutableMapping):
+    """
+    Session made of a mutable overlay over a shared read-only base. Writes
+    and deletes only touch the overlay, so many sessions can share the same
+    base, like a large order payload, without copying it.
+
+    The overlay is a stack of layers: snapshot pushes a new layer, rollback
+    discards the layers pushed since a snapshot and commit merges them.
+    Lists and dicts, of the base too, are read through SessionDict and
+    SessionList views: nothing is copied until a view is changed, then the
+    container, and the ones holding it, are copied once into the top layer.
+    Sets and deques are copied into the top layer when read. Other objects
+    are shared and must not be changed in place
+    """
+
+    __slots__ = ("base", "_layers", "_owned", "_copies", "_has_copies")
+
+    def __init__(
+        self,
+        base: Optional[Mapping[str, Any]] = None,
+        overlay: Optional[Mapping[str, Any]] = None,
+    ):
+        self.base: Mapping[str, Any] = {} if base is None else base
+        self._layers: List[MutableMapping[str, Any]] = [dict(overlay or {})]
+        # per layer, containers it copied by id, and their copies by the
+        # id of the container they were copied from
+        self._owned: List[Dict[int, Any]] = [{}]
+        self._copies: List[Dict[int, Tuple[Any, Any]]] = [{}]
+        self._has_copies = False
+
+    @classmethod
+    def wrap(cls, session: MutableMapping[str, Any]) -> "Session":
+        """
+        Session whose bottom layer is session itself instead of a copy, so
+        committing a snapshot writes the changes to it
+        """
+        wrapped = cls()
+        wrapped._layers[0] = session
+        return wrapped
+
+    def _get(self, key: str) -> Any:
+        for layer in reversed(self._layers):
+            if key in layer:
+                value = layer[key]
+                return _missing if value is _deleted else value
+        return self.base.get(key, _missing)
+
+    def _resolve(self, container: Any) -> Any:
+        """
+        Latest copy of container
+        """
+        for copies in self._copies:
+            entry = copies.get(id(container))
+            while entry is not None and entry[0] is container:
+                container = entry[1]
+                entry = copies.get(id(container))
+        return container
+
+    def _own(self, container: Any) -> Any:
+        """
+        Copy of container owned by the top layer, made once per layer
+        """
+        owned = self._owned[-1]
+        if owned.get(id(container)) is container:
+            return container
+        copies = self._copies[-1]
+        entry = copies.get(id(container))
+        if entry is not None and entry[0] is container:
+            return entry[1]
+        copy = container.copy()
+        owned[id(copy)] = copy
+        copies[id(container)] = (container, copy)
+        self._has_copies = True
+        return copy
+
+    def _replace(
+        self,
+        parent: Optional[_SessionView],
+        key: Any,
+        container: Any,
+        copy: Any,
+    ) -> None:
+        """
+        Puts copy where container was read from, the key of the session
+        or of the parent view
+        """
+        if parent is None:
+            if self._resolve(self._get(key)) is copy:
+                self._layers[-1][key] = copy
+            return
+        holder = parent._writable()
+        try:
+            if self._resolve(holder[key]) is copy:
+                holder[key] = copy
+                return
+        except (KeyError, IndexError):
+            pass
+        if isinstance(holder, list):
+            # moved by a change made since it was read
+            for index, value in enumerate(holder):
+                if self._resolve(value) is copy:
+                    holder[index] = copy
+                    return
+
+    def _wrap(
+        self, value: Any, parent: Optional[_SessionView], key: Any
+    ) -> Any:
+        if isinstance(value, dict):
+            return SessionDict(self, parent, key, value)
+        if isinstance(value, list):
+            return SessionList(self, parent, key, value)
+        if isinstance(value, _COPIED_ON_READ):
+            value = self._resolve(value)
+            copy = self._own(value)
+            if copy is not value:
+                self._replace(parent, key, value, copy)
+            return copy
+        return value
+
+    def __getitem__(self, key: str) -> Any:
+        value = self._get(key)
+        if value is _missing:
+            raise KeyError(key)
+        return self._wrap(value, None, key)
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        self._layers[-1][key] = _unwrap(value)
+
+    def __delitem__(self, key: str) -> None:
+        if key not in self:
+            raise KeyError(key)
+        self._layers[-1][key] = _deleted
+
+    def __contains__(self, key: object) -> bool:
+        return self._get(cast(str, key)) is not _missing
+
+    def _merged(self) -> Dict[str, Any]:
+        merged = dict(self.base)
+        for layer in self._layers:
+            merged.update(layer)
+        return merged
+
+    def __iter__(self) -> Iterator[str]:
+        return (
+            key
+            for key, value in self._merged().items()
+            if value is not _deleted
+        )
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __repr__(self) -> str:
+        return f"Session({dict(self)!r})"
+
+    def __getstate__(self) -> Tuple[Any, ...]:
+        # ids do not survive pickling, the copies made are kept as a list
+        owned = [list(containers.values()) for containers in self._owned]
+        return self.base, self._layers, owned
+
+    def __setstate__(self, state: Tuple[Any, ...]) -> None:
+        self.base, self._layers, owned = state
+        self._owned = [
+            {id(container): container for container in containers}
+            for containers in owned
+        ]
+        self._copies = [{} for _ in self._layers]
+        self._has_copies = False
+
+    @property
+    def depth(self) -> int:
+        """
+        Number of snapshots taken and not yet rolled back or committed
+        """
+        return len(self._layers) - 1
+
+    def changes(self) -> Dict[str, Any]:
+        """
+        Keys written over the base, deleted keys are left out
+        """
+        changes: Dict[str, Any] = {}
+        for layer in self._layers:
+            changes.update(layer)
+        return {
+            key: value
+            for key, value in changes.items()
+            if value is not _deleted
+        }
+
+    def snapshot(self) -> int:
+        """
+        Starts a new layer, returning the snapshot to pass to rollback or
+        commit
+        """
+        self._layers.append({})
+        self._owned.append({})
+        self._copies.append({})
+        return len(self._layers) - 1
+
+    def _check_snapshot(self, snapshot: Optional[int]) -> int:
+        if snapshot is None:
+            if len(self._layers) == 1:
+                raise ValueError("no active snapshot")
+            snapshot = len(self._layers) - 1
+        if not 0 < snapshot < len(self._layers):
+            raise ValueError(f"snapshot {snapshot} is not active")
+        return snapshot
+
+    def rollback(self, snapshot: Optional[int] = None) -> None:
+        """
+        Discards every change made since the snapshot, the last one by
+        default
+        """
+        snapshot = self._check_snapshot(snapshot)
+        del self._layers[snapshot:]
+        del self._owned[snapshot:]
+        del self._copies[snapshot:]
+        self._has_copies = any(self._copies)
+
+    def commit(self, snapshot: Optional[int] = None) -> None:
+        """
+        Keeps the changes made since the snapshot, the last one by default,
+        merging them into the layer below it. Only the keys written, or
+        whose containers were changed, are merged
+        """
+        snapshot = self._check_snapshot(snapshot)
+        changes: Dict[str, Any] = {}
+        for layer in self._layers[snapshot:]:
+            changes.update(layer)
+        target = self._layers[snapshot - 1]
+        for key, value in changes.items():
+            if value is _deleted and snapshot == 1 and key not in self.base:
+                # nothing below the bottom layer to hide
+                target.pop(key, None)
+            else:
+                target[key] = value
+        owned = self._owned[snapshot - 1]
+        copies = self._copies[snapshot - 1]
+        for index in range(snapshot, len(self._layers)):
+            owned.update(self._owned[index])
+            copies.update(self._copies[index])
+        del self._layers[snapshot:]
+        del self._owned[snapshot:]
+        del self._copies[snapshot:]
+
+    def fork(self) -> "Session":
+        """
+        New session over the same base, starting with the current changes
+        """
+        changes: Dict[str, Any] = {}
+        for layer in self._layers:
+            changes.update(layer)
+        forked = Session(self.base)
+        forked._layers[0] = changes
+        # the containers copied so far are now shared with the fork
+        self._owned = [{} for _ in self._layers]
+        return forked
@@ -0,0 +1,121 @@
+from abc import ABC, abstractmethod
+from threading import Lock
+from time import perf_counter_ns
+from typing import Any, Dict, List, Optional
+
+
+class Span(ABC):
+    """
+    Interface of the spans returned by tracers
+    """
+
+    __slots__ = ()
+
+    @abstractmethod
+    def set_attribute(self, key: str, value: Any) -> None: ...
+
+    @abstractmethod
+    def record_exception(self, error: BaseException) -> None: ...
+
+    @abstractmethod
+    def end(self) -> None: ...
+
+
+class Tracer(ABC):
+    """
+    Interface of tracers. Engines start a span for each run and a child
+    span for each job of a traced run. start_span may return None to skip
+    tracing a run, which then costs nothing more than an untraced one
+    """
+
+    @abstractmethod
+    def start_span(
+        self,
+        name: str,
+        parent: Optional[Span] = None,
+        attributes: Optional[Dict[str, Any]] = None,
+    ) -> Optional[Span]: ...
+
+
+class NoOpTracer(Tracer):
+    """
+    Default tracer of engines, traces nothing
+    """
+
+    def start_span(
+        self,
+        name: str,
+        parent: Optional[Span] = None,
+        attributes: Optional[Dict[str, Any]] = None,
+    ) -> Optional[Span]:
+        return None
+
+
+class RecordedSpan(Span):
+    __slots__ = (
+        "tracer",
+        "name",
+        "parent",
+        "attributes",
+        "error",
+        "start_ns",
+        "end_ns",
+    )
+
+    def __init__(
+        self,
+        tracer: "InMemoryTracer",
+        name: str,
+        parent: Optional["RecordedSpan"] = None,
+        attributes: Optional[Dict[str, Any]] = None,
+    ):
+        self.tracer = tracer
+        self.name = name
+        self.parent = parent
+        self.attributes: Dict[str, Any] = dict(attributes or {})
+        self.error: Optional[BaseException] = None
+        self.start_ns = perf_counter_ns()
+        self.end_ns: Optional[int] = None
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def record_exception(self, error: BaseException) -> None:
+        self.error = error
+
+    def end(self) -> None:
+        self.end_ns = perf_counter_ns()
+        self.tracer._finish(self)
+
+    def __repr__(self) -> str:
+        return f"RecordedSpan({self.name!r}, {self.attributes!r})"
+
+
+class InMemoryTracer(Tracer):
+    """
+    Keeps every finished span in memory, in the order they ended. Meant for
+    tests and debugging
+    """
+
+    def __init__(self):
+        self.spans: List[RecordedSpan] = []
+        self._lock = Lock()
+
+    def start_span(
+        self,
+        name: str,
+        parent: Optional[Span] = None,
+        attributes: Optional[Dict[str, Any]] = None,
+    ) -> RecordedSpan:
+        return RecordedSpan(self, name, parent, attributes)  # type: ignore[arg-type]
+
+    def _finish(self, span: RecordedSpan) -> None:
+        with self._lock:
+            self.spans.append(span)
+
+    def children(self, span: RecordedSpan) -> List[RecordedSpan]:
+        return [child for child in self.spans if child.parent is span]
+
+    def clear(self) -> None:
+        with self._lock:
+            self.spans = []
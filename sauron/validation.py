@@ -0,0 +1,229 @@
+import inspect
+import typing
+from enum import Enum
+from types import NoneType, UnionType
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    List,
+    Mapping,
+    NamedTuple,
+    Optional,
+    Tuple,
+    Type,
+    cast,
+)
+
+_missing = object()
+
+_TRUE_STRINGS = ("true", "1", "yes", "on")
+_FALSE_STRINGS = ("false", "0", "no", "off")
+
+
+class ArgSpec(NamedTuple):
+    annotation: Any
+    default: Any = _missing
+
+    @property
+    def required(self) -> bool:
+        return self.default is _missing
+
+
+class JobSignature(NamedTuple):
+    """
+    What a job function accepts, read once from its signature.
+    accepts_session tells whether it takes the session, or batch for
+    vectorized conditions
+    """
+
+    args: Mapping[str, ArgSpec]
+    accepts_session: bool
+    accepts_kwargs: bool
+
+
+def enum_choices(annotation: Any) -> Optional[List[str]]:
+    """
+    Names of the members of an Enum annotation, None for anything else
+    """
+    if isinstance(annotation, type) and issubclass(annotation, Enum):
+        return list(annotation.__members__)
+    return None
+
+
+def job_signature(
+    function: Callable, session_arg: str = "session"
+) -> JobSignature:
+    """
+    Args of a job function besides session_arg, the argument the session is
+    passed as
+    """
+    try:
+        hints = typing.get_type_hints(function)
+    except Exception:
+        # unresolvable forward references, fall back to raw annotations
+        hints = {}
+    args: Dict[str, ArgSpec] = {}
+    accepts_session = False
+    accepts_kwargs = False
+    for name, parameter in inspect.signature(function).parameters.items():
+        if parameter.kind is parameter.VAR_KEYWORD:
+            accepts_kwargs = True
+            continue
+        if parameter.kind in (
+            parameter.VAR_POSITIONAL,
+            parameter.POSITIONAL_ONLY,
+        ):
+            continue
+        if name == session_arg:
+            accepts_session = True
+            continue
+        default = (
+            _missing
+            if parameter.default is parameter.empty
+            else parameter.default
+        )
+        args[name] = ArgSpec(hints.get(name, parameter.annotation), default)
+    return JobSignature(
+        args, accepts_session or accepts_kwargs, accepts_kwargs
+    )
+
+
+def _to_bool(value: Any) -> bool:
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, str) and value.lower() in _TRUE_STRINGS:
+        return True
+    if isinstance(value, str) and value.lower() in _FALSE_STRINGS:
+        return False
+    if isinstance(value, int) and value in (0, 1):
+        return bool(value)
+    raise ValueError(f"expected bool, got {value!r}")
+
+
+def _to_int(value: Any) -> int:
+    if isinstance(value, int) and not isinstance(value, bool):
+        return value
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    if isinstance(value, str):
+        try:
+            return int(value)
+        except ValueError:
+            pass
+    raise ValueError(f"expected int, got {value!r}")
+
+
+def _to_float(value: Any) -> float:
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return float(value)
+    if isinstance(value, str):
+        try:
+            return float(value)
+        except ValueError:
+            pass
+    raise ValueError(f"expected float, got {value!r}")
+
+
+def _to_enum(value: Any, annotation: Type[Enum]) -> Enum:
+    """
+    Enum members can be given by name, as listed by the exporters, or by
+    value
+    """
+    if isinstance(value, annotation):
+        return value
+    if isinstance(value, str) and value in annotation.__members__:
+        return annotation[value]
+    try:
+        return cast(Any, annotation)(value)
+    except ValueError:
+        raise ValueError(
+            f"{value!r} is not one of {enum_choices(annotation)}"
+        ) from None
+
+
+def _to_union(value: Any, members: Tuple[Any, ...]) -> Any:
+    for member in members:
+        member_class = typing.get_origin(member) or member
+        if isinstance(member_class, type) and isinstance(value, member_class):
+            return value
+    for member in members:
+        try:
+            return _coerce(value, member)
+        except ValueError:
+            continue
+    raise ValueError(f"{value!r} doesn't match any of {members}")
+
+
+_CONVERTERS: Dict[Any, Callable[[Any], Any]] = {
+    bool: _to_bool,
+    int: _to_int,
+    float: _to_float,
+}
+
+
+def _coerce(value: Any, annotation: Any) -> Any:
+    """
+    Value converted to the annotation, raising ValueError when it can't be.
+    Annotations the engine knows nothing about accept any value
+    """
+    converter = _CONVERTERS.get(annotation)
+    if converter is not None:
+        return converter(value)
+    origin = typing.get_origin(annotation)
+    if origin is typing.Union or origin is UnionType:
+        return _to_union(value, typing.get_args(annotation))
+    if origin is not None:
+        # only the container type of generics like List[int] is checked
+        annotation = origin
+    if not isinstance(annotation, type):
+        return value
+    if annotation is NoneType and value is not None:
+        raise ValueError(f"expected None, got {value!r}")
+    if issubclass(annotation, Enum):
+        return _to_enum(value, annotation)
+    if annotation in (str, dict, list) and not isinstance(value, annotation):
+        raise ValueError(f"expected {annotation.__name__}, got {value!r}")
+    return value
+
+
+def coerce_args(
+    job_name: str,
+    signature: JobSignature,
+    args: Mapping[str, Any],
+    session_arg: str = "session",
+) -> Dict[str, Any]:
+    """
+    Checks the args a rule gives to a job against its signature, returning
+    them converted to the annotated types. Every problem found is reported
+    in a single ValueError
+    """
+    errors: List[str] = []
+    if not signature.accepts_session:
+        errors.append(f"the function doesn't accept a {session_arg} argument")
+
+    coerced: Dict[str, Any] = {}
+    for name, value in args.items():
+        spec = signature.args.get(name)
+        if spec is None:
+            if not signature.accepts_kwargs:
+                errors.append(f"unexpected argument '{name}'")
+            coerced[name] = value
+            continue
+        if value is None and spec.default is None:
+            coerced[name] = value
+            continue
+        try:
+            coerced[name] = _coerce(value, spec.annotation)
+        except ValueError as error:
+            errors.append(f"argument '{name}': {error}")
+
+    for name, spec in signature.args.items():
+        if spec.required and name not in args:
+            errors.append(f"missing argument '{name}'")
+
+    if errors:
+        raise ValueError(
+            f"Job '{job_name}' has invalid args: " + "; ".join(errors)
+        )
+    return coerced
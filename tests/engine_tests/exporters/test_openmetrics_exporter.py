@@ -0,0 +1,89 @@
+from sauron.exporters import OpenMetricsExporter
+from sauron.metrics import MetricsRegistry
+from sauron.rule_engine import RuleEngine
+
+
+def samples(text):
+    return dict(
+        line.rsplit(" ", 1) for line in text.splitlines() if line[:1] != "#"
+    )
+
+
+class TestOpenMetricsExporter:
+    def test_engine_metrics(self):
+        # given:
+        engine = RuleEngine(parse_cache_size=8)
+
+        @engine.condition()
+        def is_positive(session, number: int = 0) -> bool:
+            return number > 0
+
+        @engine.action()
+        def mark(session) -> None:
+            session["marked"] = True
+
+        for number in (1, -1, 2):
+            engine.run(
+                {
+                    "conditions": [
+                        {"name": "is_positive", "args": {"number": number}}
+                    ],
+                    "actions": [{"name": "mark"}],
+                },
+                {},
+            )
+
+        # when:
+        text = engine.export_metrics()
+        exported = samples(text)
+
+        # then:
+        assert text.endswith("# EOF\n")
+        assert exported['sauron_job_calls_total{job="is_positive"}'] == "3"
+        assert exported['sauron_job_calls_total{job="mark"}'] == "2"
+        assert (
+            exported['sauron_condition_passes_total{job="is_positive"}'] == "2"
+        )
+        assert (
+            exported[
+                'sauron_condition_short_circuits_total{job="is_positive"}'
+            ]
+            == "1"
+        )
+        assert (
+            exported[
+                'sauron_job_duration_seconds_bucket{job="mark",le="+Inf"}'
+            ]
+            == "2"
+        )
+        assert exported["sauron_runs_total"] == "3"
+        assert exported["sauron_parse_cache_misses_total"] == "3"
+        assert exported["sauron_parse_cache_max_size"] == "8"
+        assert "sauron_condition_cache_hits_total" not in exported
+
+    def test_histogram_buckets_are_cumulative(self):
+        # given:
+        registry = MetricsRegistry()
+        for runtime_ns in (1_000, 20_000, 2_000_000, 20 * 10**9):
+            registry.record_job("job", runtime_ns)
+        exporter = OpenMetricsExporter(prefix="rules", buckets=(1e-5, 1e-3, 1))
+
+        # when:
+        exported = samples(exporter.export(registry))
+
+        # then:
+        name = "rules_job_duration_seconds"
+        assert exported[f'{name}_bucket{{job="job",le="1e-05"}}'] == "1"
+        assert exported[f'{name}_bucket{{job="job",le="0.001"}}'] == "2"
+        assert exported[f'{name}_bucket{{job="job",le="1"}}'] == "3"
+        assert exported[f'{name}_bucket{{job="job",le="+Inf"}}'] == "4"
+        assert exported[f'{name}_count{{job="job"}}'] == "4"
+        assert float(exported[f'{name}_sum{{job="job"}}']) == 20.002021
+
+    def test_label_values_are_escaped(self):
+        registry = MetricsRegistry()
+        registry.record_job('say "hi"\n', 10)
+
+        text = OpenMetricsExporter().export(registry)
+
+        assert 'sauron_job_calls_total{job="say \\"hi\\"\\n"} 1' in text
@@ -1,3 +1,7 @@
+from ruamel.yaml import YAML
+
+from sauron.engine import Engine
+from sauron.models import JobRecord
 from sauron.parsers import DefaultParser
 
 
@@ -63,3 +67,46 @@ class TestCaseOne:
         assert result[1].name == "print_the_equation"
         assert result[1].args == {"lower_number": 3, "greater_number": 10}
         assert result[1].job_type == "action"
+
+
+class BaselineParser(DefaultParser):
+    """
+    Custom parser written against the original parser interface
+    """
+
+    def __init__(self):
+        self.yaml = YAML(typ="safe")
+
+    def _parse_jobs_from_string(self, jobs_input):  # type: ignore[override]
+        return self._parse_jobs_from_list(self.yaml.load(jobs_input))
+
+
+class TestCustomParsers:
+    rule = '[{"name": "first_condition", "job_type": "condition"}]'
+
+    def test_engine_uses_parsers_with_the_original_interface(self):
+        engine = Engine(parser_class=BaselineParser)
+
+        jobs = engine.parse(self.rule)
+
+        assert jobs[0].name == "first_condition"
+
+    def test_parsers_overriding_parse(self):
+        class ListParser(DefaultParser):
+            def parse(self, jobs_input):  # type: ignore[override]
+                return self._parse_jobs_from_list(jobs_input)
+
+        engine = Engine(parser_class=ListParser)
+
+        assert engine.parse([{"name": "first_condition"}])[0].job_type == "job"
+
+    def test_configured_options_are_set_on_the_parser(self):
+        engine = Engine(
+            parser_class=BaselineParser, parse_cache_size=4, trusted_rules=True
+        )
+
+        engine.parse(self.rule)
+        jobs = engine.parse(self.rule)
+
+        assert isinstance(jobs[0], JobRecord)
+        assert engine.parse_cache_info().hits == 1
@@ -0,0 +1,157 @@
+import pytest
+
+from sauron.cache import LRUCache, content_key
+from sauron.engine import Engine
+from sauron.models import JobRecord
+from sauron.parsers import DefaultParser, RuleEngineParser
+from sauron.rule_engine import RuleEngine
+
+test_string = """
+[
+    {
+        "name": "first_condition",
+        "args": {"lower_number": 3, "greater_number": 10},
+        "job_type": "condition"
+    }
+]
+"""
+
+
+class TestLRUCache:
+    def test_evicts_least_recently_used(self):
+        cache = LRUCache(maxsize=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        assert cache.get("a") == 1
+        cache.set("c", 3)
+        assert "a" in cache
+        assert "b" not in cache
+        assert "c" in cache
+
+    def test_counts_hits_and_misses(self):
+        cache = LRUCache(maxsize=2)
+        cache.set("a", 1)
+        cache.get("a")
+        cache.get("missing")
+        info = cache.info()
+        assert (info.hits, info.misses, info.maxsize, info.currsize) == (
+            1,
+            1,
+            2,
+            1,
+        )
+
+    def test_rejects_invalid_maxsize(self):
+        with pytest.raises(ValueError):
+            LRUCache(maxsize=0)
+
+
+class TestContentKey:
+    def test_equal_dicts_share_key(self):
+        assert content_key({"a": 1, "b": [1, 2]}) == content_key(
+            {"b": [1, 2], "a": 1}
+        )
+
+    def test_string_and_decoded_data_differ(self):
+        assert content_key("[]") != content_key([])
+
+
+class TestParserCache:
+    def test_cached_string_is_not_decoded_again(self, monkeypatch):
+        cache = LRUCache(maxsize=4)
+        first = DefaultParser(cache=cache).parse(test_string)
+
+        parser = DefaultParser(cache=cache)
+
+        def fail_load(*args, **kwargs):
+            raise AssertionError("cached rules must not be decoded")
+
+        monkeypatch.setattr(parser, "_parse_jobs", fail_load)
+        second = parser.parse(test_string)
+        assert second == first
+        assert second is not first
+        assert cache.info().hits == 1
+
+    def test_rule_engine_parser_caches_dicts(self):
+        cache = LRUCache(maxsize=4)
+        RuleEngineParser(cache=cache).parse(
+            {"conditions": [{"name": "a"}], "actions": [{"name": "b"}]}
+        )
+        jobs = RuleEngineParser(cache=cache).parse(
+            {"conditions": [{"name": "a"}], "actions": [{"name": "b"}]}
+        )
+        assert [job.job_type for job in jobs] == ["condition", "action"]
+        assert cache.info().hits == 1
+
+    def test_format_is_part_of_the_key(self):
+        cache = LRUCache(maxsize=4)
+        yaml_rule = "- name: first_condition"
+        DefaultParser(cache=cache).parse(yaml_rule)
+
+        with pytest.raises(ValueError, match="not a valid json"):
+            DefaultParser(cache=cache).parse(yaml_rule, fmt="json")
+        assert cache.info().hits == 0
+
+    def test_trusted_flag_is_part_of_the_key(self):
+        cache = LRUCache(maxsize=4)
+        DefaultParser(cache=cache).parse(test_string)
+
+        jobs = DefaultParser(cache=cache, trusted=True).parse(test_string)
+
+        assert isinstance(jobs[0], JobRecord)
+        assert cache.info().hits == 0
+
+
+class TestEngineParseCache:
+    def test_cache_disabled_by_default(self):
+        assert Engine().parse_cache_info() is None
+
+    def test_engine_exposes_cache_counters(self):
+        engine = RuleEngine(parse_cache_size=1)
+        rule = '{"conditions": [{"name": "a"}], "actions": []}'
+        engine.parse(rule)
+        engine.parse(rule)
+        engine.parse('{"conditions": [], "actions": [{"name": "b"}]}')
+        info = engine.parse_cache_info()
+        assert info is not None
+        assert (info.hits, info.misses, info.currsize) == (1, 2, 1)
+
+    def test_cached_rules_are_compiled_once(self, monkeypatch):
+        engine = RuleEngine(parse_cache_size=4)
+
+        @engine.condition()
+        def is_above(session, number: int) -> bool:
+            return number > 1
+
+        rule = (
+            '{"conditions": [{"name": "is_above", "args": {"number": "2"}}]}'
+        )
+        compiled = engine.compile(rule)
+        monkeypatch.setattr(
+            engine,
+            "_compile_job",
+            lambda job: pytest.fail("cached rule compiled again"),
+        )
+
+        assert engine.compile(rule) is compiled
+        engine.run(rule, {})
+        assert engine.parse_cache_info().hits == 2
+
+    def test_adding_callables_invalidates_compiled_rules(self):
+        engine = RuleEngine(parse_cache_size=4)
+
+        def check(value):
+            def is_ready(session) -> bool:
+                return value
+
+            return is_ready
+
+        engine.condition()(check(False))
+        rule = '{"conditions": [{"name": "is_ready"}]}'
+        compiled = engine.compile(rule)
+
+        replacement = engine.condition()(check(True))
+        recompiled = engine.compile(rule)
+
+        assert recompiled is not compiled
+        assert recompiled.jobs[0].function is replacement
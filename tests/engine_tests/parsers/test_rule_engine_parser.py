@@ -0,0 +1,43 @@
+import copy
+
+from sauron.models import ActionModel, ConditionModel
+from sauron.parsers import RuleEngineParser
+
+RULE = {
+    "conditions": [{"name": "is_positive", "args": {"number": 1}}],
+    "actions": [
+        {"name": "mark"},
+        {"name": "notify", "job_type": "condition"},
+    ],
+}
+
+
+class TestRuleEngineParser:
+    def test_rule_dicts_are_not_mutated(self):
+        rule = copy.deepcopy(RULE)
+
+        RuleEngineParser().parse(rule)
+
+        assert rule == RULE
+
+    def test_job_types_come_from_the_rule(self):
+        jobs = RuleEngineParser().parse(RULE)
+
+        assert [type(job) for job in jobs] == [
+            ConditionModel,
+            ActionModel,
+            ActionModel,
+        ]
+        assert [job.job_type for job in jobs] == [
+            "condition",
+            "action",
+            "action",
+        ]
+        assert jobs[0].args == {"number": 1}
+
+    def test_strings_with_a_list_of_jobs(self):
+        jobs = RuleEngineParser().parse(
+            '[{"name": "is_positive", "job_type": "condition"}]'
+        )
+
+        assert [type(job) for job in jobs] == [ConditionModel]
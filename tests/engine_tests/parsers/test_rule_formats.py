@@ -0,0 +1,55 @@
+import pytest
+
+from sauron.parsers import DefaultParser, RuleEngineParser
+
+json_rule = '[{"name": "first_condition", "args": {"lower_number": 3}}]'
+yaml_rule = """
+- name: first_condition
+  args:
+    lower_number: 3
+"""
+
+
+class TestRuleFormats:
+    def test_json_rule_skips_yaml_loader(self):
+        parser = DefaultParser()
+        result = parser.parse(json_rule)
+        assert result[0].args == {"lower_number": 3}
+        assert parser._yaml is None
+
+    def test_yaml_rule_is_loaded_by_yaml(self):
+        parser = DefaultParser()
+        result = parser.parse(yaml_rule)
+        assert result[0].args == {"lower_number": 3}
+        assert parser._yaml is not None
+
+    def test_yaml_flow_style_falls_back_to_yaml(self):
+        result = RuleEngineParser().parse(
+            "{conditions: [{name: first_condition}], actions: []}"
+        )
+        assert result[0].name == "first_condition"
+        assert result[0].job_type == "condition"
+
+    def test_explicit_format(self):
+        assert DefaultParser().parse(json_rule, fmt="json")[0].args == {
+            "lower_number": 3
+        }
+        assert DefaultParser().parse(json_rule, fmt="yaml")[0].args == {
+            "lower_number": 3
+        }
+
+    @pytest.mark.parametrize(
+        "rule, fmt",
+        [
+            (yaml_rule, "json"),
+            ("[{'name': ", None),
+            ("- name: a\n  - b", "yaml"),
+        ],
+    )
+    def test_invalid_rule_raises_value_error(self, rule, fmt):
+        with pytest.raises(ValueError):
+            DefaultParser().parse(rule, fmt=fmt)
+
+    def test_unknown_format_raises_value_error(self):
+        with pytest.raises(ValueError):
+            DefaultParser().parse(json_rule, fmt="toml")
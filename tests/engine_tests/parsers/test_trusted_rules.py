@@ -0,0 +1,60 @@
+from typing import Any, Dict
+
+import pytest
+
+from sauron.models import ConditionModel, JobRecord
+from sauron.parsers import DefaultParser, RuleEngineParser
+from sauron.rule_engine import RuleEngine
+
+RULE: Dict[str, Any] = {
+    "conditions": [{"name": "is_positive", "args": {"number": 1}}],
+    "actions": [{"name": "mark"}],
+}
+
+
+class TestTrustedRules:
+    def test_jobs_are_records(self):
+        jobs = RuleEngineParser(trusted=True).parse(RULE)
+
+        assert [type(job) for job in jobs] == [JobRecord, JobRecord]
+        assert [job.job_type for job in jobs] == ["condition", "action"]
+        assert jobs == RuleEngineParser().parse(RULE)
+        assert (
+            jobs[0].model_dump()
+            == ConditionModel(**RULE["conditions"][0]).model_dump()
+        )
+
+    def test_records_dont_share_args_with_the_rule(self):
+        jobs = RuleEngineParser(trusted=True).parse(RULE)
+
+        jobs[0].args["number"] = 2
+
+        assert RULE["conditions"][0]["args"] == {"number": 1}
+
+    def test_default_parser(self):
+        jobs = DefaultParser(trusted=True).parse(
+            '[{"name": "is_positive", "job_type": "condition"}]'
+        )
+
+        assert jobs == [JobRecord("is_positive", {}, "condition")]
+
+    def test_jobs_need_a_name(self):
+        with pytest.raises(ValueError):
+            DefaultParser(trusted=True).parse([{"args": {}}])
+
+    def test_engine_runs_trusted_rules(self):
+        engine = RuleEngine(trusted_rules=True)
+
+        @engine.condition()
+        def is_positive(session, number: int = 0) -> bool:
+            return number > 0
+
+        @engine.action()
+        def mark(session) -> None:
+            session["marked"] = True
+
+        session = {}
+        engine.run(RULE, session)
+
+        assert session["marked"] is True
+        assert all(isinstance(job, JobRecord) for job in engine.parsed_rule)
@@ -0,0 +1,86 @@
+import pytest
+
+from sauron.rule_engine import RuleEngine
+
+SIGNAL_NAMES = [
+    "pre_engine_run",
+    "post_engine_run",
+    "pre_job_call",
+    "post_job_call",
+]
+
+
+def build_engine():
+    engine = RuleEngine()
+
+    @engine.condition()
+    def always_true(session) -> bool:
+        return True
+
+    @engine.action()
+    def mark(session) -> None:
+        session["marked"] = True
+
+    return engine
+
+
+RULE = {"conditions": [{"name": "always_true"}], "actions": [{"name": "mark"}]}
+
+
+class TestSignalDispatch:
+    def test_nothing_is_sent_without_receivers(self, monkeypatch):
+        # given:
+        engine = build_engine()
+        for name in SIGNAL_NAMES:
+
+            def fail(*args, **kwargs):
+                raise AssertionError("signal sent without receivers")
+
+            monkeypatch.setattr(engine.signals[name], "send", fail)
+
+        # when:
+        session = {}
+        engine.run(RULE, session)
+
+        # then:
+        assert session["marked"] is True
+
+    @pytest.mark.parametrize("signal_name", SIGNAL_NAMES)
+    def test_connected_receivers_still_fire(self, signal_name):
+        # given:
+        engine = build_engine()
+        calls = []
+
+        def receiver(sender, **kwargs):
+            calls.append(sorted(kwargs))
+
+        engine.get_signal(signal_name).connect(receiver, sender=engine)
+
+        # when:
+        engine.run(RULE, {})
+
+        # then:
+        assert calls
+        assert "session" in calls[0]
+
+    def test_engines_do_not_share_signals(self):
+        # given:
+        engine = build_engine()
+        other_engine = build_engine()
+        calls = []
+
+        def receiver(sender, **kwargs):
+            calls.append(sender)
+
+        other_engine.get_signal("pre_job_call").connect(receiver)
+
+        # when:
+        engine.run(RULE, {})
+
+        # then:
+        assert engine.get_signal("pre_job_call").receivers == {}
+        assert calls == []
+        assert (
+            engine.signals["pre_job_call"]
+            is not (other_engine.signals["pre_job_call"])
+        )
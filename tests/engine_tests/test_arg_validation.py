@@ -0,0 +1,141 @@
+from enum import Enum
+from typing import List, Optional, Union
+
+import pytest
+
+from sauron.rule_engine import RuleEngine
+
+
+class Color(str, Enum):
+    red = "R"
+    green = "G"
+
+
+def build_engine():
+    engine = RuleEngine()
+    calls = []
+
+    @engine.condition()
+    def is_color(session, color: Color) -> bool:
+        calls.append(color)
+        return color is Color.red
+
+    @engine.condition()
+    def is_above(session, number: int, ratio: float = 1.0) -> bool:
+        calls.append((number, ratio))
+        return number * ratio > 10
+
+    @engine.action()
+    def tag(
+        session,
+        label: str,
+        tags: Optional[List[str]] = None,
+        enabled: bool = True,
+        amount: Union[int, str] = 0,
+    ) -> None:
+        calls.append((label, tags, enabled, amount))
+
+    @engine.action()
+    def without_session(number: int) -> None:
+        calls.append(number)
+
+    return engine, calls
+
+
+class TestArgValidationCases:
+    @pytest.mark.parametrize(
+        "args, expected",
+        [
+            ({"color": "red"}, Color.red),
+            ({"color": "G"}, Color.green),
+            ({"color": Color.red}, Color.red),
+        ],
+    )
+    def test_enum_choices(self, args, expected):
+        engine, _ = build_engine()
+
+        compiled = engine.compile(
+            {"conditions": [{"name": "is_color", "args": args}]}
+        )
+
+        assert compiled.jobs[0].args == {"color": expected}
+
+    def test_args_are_coerced_once(self):
+        engine, calls = build_engine()
+        compiled = engine.compile(
+            {
+                "conditions": [
+                    {"name": "is_above", "args": {"number": "12", "ratio": 1}}
+                ],
+                "actions": [
+                    {
+                        "name": "tag",
+                        "args": {
+                            "label": "big",
+                            "enabled": "false",
+                            "tags": ["a"],
+                            "amount": "3",
+                        },
+                    }
+                ],
+            }
+        )
+
+        engine.run(compiled, {})
+
+        assert calls == [(12, 1.0), ("big", ["a"], False, "3")]
+        assert isinstance(calls[0][1], float)
+
+    @pytest.mark.parametrize(
+        "job, message",
+        [
+            ({"name": "is_color", "args": {"color": "blue"}}, "not one of"),
+            ({"name": "is_above", "args": {}}, "missing argument 'number'"),
+            (
+                {"name": "is_above", "args": {"number": 1, "numbr": 2}},
+                "unexpected argument 'numbr'",
+            ),
+            ({"name": "is_above", "args": {"number": "many"}}, "expected int"),
+            ({"name": "is_above", "args": {"number": True}}, "expected int"),
+            ({"name": "tag", "args": {"label": 3}}, "expected str"),
+            ({"name": "tag", "args": {"label": "x", "tags": "a"}}, "tags"),
+            ({"name": "without_session", "args": {"number": 1}}, "session"),
+        ],
+    )
+    def test_invalid_rules_are_rejected_before_running(self, job, message):
+        engine, calls = build_engine()
+        session = {}
+
+        with pytest.raises(ValueError, match=message):
+            engine.run(
+                {
+                    "conditions": [
+                        {"name": "is_color", "args": {"color": "red"}}
+                    ],
+                    "actions": [job],
+                },
+                session,
+            )
+
+        assert calls == []
+        assert session == {}
+
+    def test_every_problem_is_reported(self):
+        engine, _ = build_engine()
+
+        with pytest.raises(ValueError) as error:
+            engine.compile(
+                {
+                    "conditions": [
+                        {
+                            "name": "is_above",
+                            "args": {"ratio": "x", "other": 1},
+                        }
+                    ]
+                }
+            )
+
+        message = str(error.value)
+        assert "argument 'ratio'" in message
+        assert "unexpected argument 'other'" in message
+        assert "missing argument 'number'" in message
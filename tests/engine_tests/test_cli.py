@@ -0,0 +1,210 @@
+import json
+import subprocess
+import sys
+from collections import deque
+
+import pytest
+
+from sauron.cli import json_default, main
+from sauron.results import JobResult
+
+RULE_YAML = """
+conditions:
+  - name: is_even
+actions:
+  - name: square
+"""
+
+JOBS = "tests.utils.job_parallel_module"
+
+
+@pytest.fixture
+def files(tmp_path):
+    rule_path = tmp_path / "rules.yaml"
+    rule_path.write_text(RULE_YAML)
+    input_path = tmp_path / "orders.jsonl"
+    input_path.write_text(
+        "\n".join(json.dumps({"number": n}) for n in range(6)) + "\n\n"
+    )
+    return rule_path, input_path, tmp_path / "out.jsonl"
+
+
+def read_output(path):
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+
+class TestCliRun:
+    def test_writes_a_session_per_line(self, files):
+        rule_path, input_path, output_path = files
+
+        code = main(
+            [
+                "run",
+                "--rule",
+                str(rule_path),
+                "--jobs",
+                JOBS,
+                "--input",
+                str(input_path),
+                "--output",
+                str(output_path),
+            ]
+        )
+
+        assert code == 0
+        sessions = read_output(output_path)
+        assert [session["number"] for session in sessions] == [
+            0,
+            1,
+            4,
+            3,
+            16,
+            5,
+        ]
+        assert sessions[1]["results"] == [{"job": "is_even", "return": False}]
+
+    def test_worker_processes(self, files):
+        rule_path, input_path, output_path = files
+
+        code = main(
+            [
+                "run",
+                "--rule",
+                str(rule_path),
+                "--jobs",
+                JOBS,
+                "--input",
+                str(input_path),
+                "--output",
+                str(output_path),
+                "--workers",
+                "2",
+                "--chunksize",
+                "2",
+            ]
+        )
+
+        assert code == 0
+        sessions = read_output(output_path)
+        assert [session["number"] for session in sessions] == [
+            0,
+            1,
+            4,
+            3,
+            16,
+            5,
+        ]
+
+    def test_reports_invalid_lines(self, files, capsys):
+        rule_path, input_path, output_path = files
+        input_path.write_text('{"number": 2}\n{"number": \n')
+
+        code = main(
+            [
+                "run",
+                "--rule",
+                str(rule_path),
+                "--jobs",
+                JOBS,
+                "--input",
+                str(input_path),
+                "--output",
+                str(output_path),
+            ]
+        )
+
+        assert code == 1
+        assert f"{input_path}:2:" in capsys.readouterr().err
+        # sessions before the invalid line were already written
+        sessions = read_output(output_path)
+        assert [session["number"] for session in sessions] == [4]
+
+    def test_reports_sessions_that_are_not_json(
+        self, files, tmp_path, monkeypatch, capsys
+    ):
+        _, input_path, output_path = files
+        (tmp_path / "decimal_jobs.py").write_text(
+            "from decimal import Decimal\n\n\n"
+            "def add_total(session):\n"
+            "    if session['number'] == 3:\n"
+            "        session['total'] = Decimal('1.5')\n"
+        )
+        rule_path = tmp_path / "jobs.json"
+        rule_path.write_text('[{"name": "add_total"}]')
+        monkeypatch.syspath_prepend(str(tmp_path))
+
+        code = main(
+            [
+                "run",
+                "--rule",
+                str(rule_path),
+                "--jobs",
+                "decimal_jobs",
+                "--engine",
+                "job",
+                "--input",
+                str(input_path),
+                "--output",
+                str(output_path),
+            ]
+        )
+
+        assert code == 1
+        error = capsys.readouterr().err
+        assert f"{input_path}:4: session can't be written as JSON" in error
+        assert "Decimal" in error
+        assert "supported types are" in error
+        assert len(read_output(output_path)) == 3
+
+    def test_rejects_non_positive_workers(self, files):
+        rule_path, input_path, _ = files
+
+        with pytest.raises(SystemExit):
+            main(
+                [
+                    "run",
+                    "--rule",
+                    str(rule_path),
+                    "--jobs",
+                    JOBS,
+                    "--workers",
+                    "0",
+                ]
+            )
+
+    def test_python_m_sauron(self, files):
+        rule_path, input_path, _ = files
+
+        completed = subprocess.run(
+            [
+                sys.executable,
+                "-m",
+                "sauron",
+                "run",
+                "--rule",
+                str(rule_path),
+                "--jobs",
+                JOBS,
+            ],
+            input='{"number": 3}\n',
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+
+        assert json.loads(completed.stdout) == {
+            "number": 3,
+            "results": [{"job": "is_even", "return": False}],
+        }
+
+
+def test_json_default():
+    records = deque([JobResult("square", 4)], maxlen=2)
+
+    assert json.dumps(records, default=json_default) == (
+        '[{"job": "square", "return": 4}]'
+    )
+    assert json_default({"a"}) == ["a"]
+    for value in (object(), b"bytes", (n for n in range(2))):
+        with pytest.raises(TypeError):
+            json_default(value)
@@ -0,0 +1,68 @@
+import pytest
+
+from sauron.compiled import CompiledRule
+from sauron.engine import Engine
+
+engine = Engine()
+
+
+@engine.job("Is Smaller")
+def is_smaller(session, lower_number: int = 0, greater_number: int = 10):
+    return lower_number < greater_number
+
+
+@engine.job("Count Calls")
+def count_calls(session, step: int = 1):
+    session["count"] = session.get("count", 0) + step
+
+
+class TestCompiledRuleCases:
+    rule = [
+        {
+            "name": "is_smaller",
+            "args": {"lower_number": 3, "greater_number": 10},
+            "job_type": "condition",
+        },
+        {"name": "count_calls", "args": {"step": 2}, "job_type": "action"},
+    ]
+
+    def test_compile_resolves_callables_and_args(self):
+        compiled = engine.compile(self.rule)
+        assert isinstance(compiled, CompiledRule)
+        assert [job.name for job in compiled.jobs] == [
+            "is_smaller",
+            "count_calls",
+        ]
+        assert compiled.jobs[0].function is is_smaller
+        assert compiled.jobs[0].job_type == "condition"
+        assert compiled.jobs[1].args == {"step": 2}
+
+    def test_compiled_rule_is_immutable(self):
+        compiled = engine.compile(self.rule)
+        with pytest.raises(AttributeError):
+            compiled.jobs = ()  # type: ignore[misc]
+        with pytest.raises(TypeError):
+            compiled.jobs[1].args["step"] = 5  # type: ignore[index]
+
+    def test_run_accepts_compiled_rule_many_times(self, monkeypatch):
+        compiled = engine.compile(self.rule)
+
+        def fail_parse(*args, **kwargs):
+            raise AssertionError("compiled rules must not be parsed")
+
+        monkeypatch.setattr(engine, "parse", fail_parse)
+        session = {"order": 1}
+        engine.run(compiled, session)
+        engine.run(compiled, session)
+        assert session["count"] == 4
+
+    def test_compile_returns_compiled_rule_unchanged(self):
+        compiled = engine.compile(self.rule)
+        assert engine.compile(compiled) is compiled
+
+    def test_compile_fails_before_running_on_unknown_job(self):
+        rule = self.rule + [{"name": "unknown_job"}]
+        session = {"order": 1}
+        with pytest.raises(ValueError):
+            engine.run(rule, session)
+        assert "count" not in session
@@ -0,0 +1,121 @@
+import pytest
+
+from sauron.metrics import JobMetrics, LatencyHistogram, MetricsRegistry
+from sauron.rule_engine import RuleEngine
+
+
+def build_engine(**kwargs):
+    engine = RuleEngine(**kwargs)
+
+    @engine.condition()
+    def is_positive(session, number: int = 0) -> bool:
+        return number > 0
+
+    @engine.action()
+    def mark(session) -> None:
+        session["marked"] = True
+
+    return engine
+
+
+def rule(number):
+    return {
+        "conditions": [{"name": "is_positive", "args": {"number": number}}],
+        "actions": [{"name": "mark"}],
+    }
+
+
+class TestLatencyHistogramCases:
+    @pytest.mark.parametrize("value", [0, 1, 63, 64, 1000, 123456, 10**9])
+    def test_values_are_kept_within_relative_error(self, value):
+        histogram = LatencyHistogram(significant_bits=6)
+        histogram.record(value)
+
+        reported = histogram.quantile(1.0)
+
+        assert value <= reported <= value * (1 + 1 / 32) + 1
+
+    def test_quantiles(self):
+        histogram = LatencyHistogram()
+        for value in range(1, 1001):
+            histogram.record(value * 1000)
+
+        assert histogram.count == 1000
+        assert histogram.quantile(0.5) == pytest.approx(500_000, rel=0.04)
+        assert histogram.quantile(0.99) == pytest.approx(990_000, rel=0.04)
+
+    def test_memory_is_fixed(self):
+        histogram = LatencyHistogram(max_value_ns=10**6)
+        size = len(histogram.counts)
+
+        histogram.record(10**12)
+
+        assert len(histogram.counts) == size
+        assert list(histogram.buckets()) == [
+            (histogram._upper_bound(size - 1), 1)
+        ]
+
+    def test_empty_histogram(self):
+        assert LatencyHistogram().quantile(0.5) == 0
+        with pytest.raises(ValueError):
+            LatencyHistogram().quantile(2)
+
+
+class TestMetricsCases:
+    def test_job_metrics(self):
+        job_metrics = JobMetrics()
+        for runtime_ns in (30, 10, 20):
+            job_metrics.record(runtime_ns, passed=runtime_ns > 15)
+
+        assert job_metrics.count == 3
+        assert job_metrics.total_ns == 60
+        assert job_metrics.min_ns == 10
+        assert job_metrics.max_ns == 30
+        assert job_metrics.mean_ns == 20
+        assert (job_metrics.passes, job_metrics.failures) == (2, 1)
+
+    def test_engine_keeps_every_run(self):
+        engine = build_engine()
+
+        for number in (1, 2, -1):
+            engine.run(rule(number), {})
+
+        condition = engine.metrics.jobs["is_positive"]
+        action = engine.metrics.jobs["mark"]
+        assert condition.count == 3
+        assert (condition.passes, condition.failures) == (2, 1)
+        assert action.count == 2
+        assert (action.passes, action.failures) == (0, 0)
+        assert condition.histogram.count == 3
+        assert 0 < condition.min_ns <= condition.max_ns
+        assert engine.metrics.runs.count == 3
+        assert engine.runtime_metrics["jobs"]["is_positive"] == (
+            condition.mean_ns / 1e9
+        )
+
+    def test_timing_can_be_disabled(self):
+        engine = build_engine(timing=False)
+
+        engine.run(rule(1), {})
+
+        condition = engine.metrics.jobs["is_positive"]
+        assert condition.count == 1
+        assert condition.passes == 1
+        assert condition.total_ns == 0
+        assert condition.min_ns is None
+        assert condition.histogram.count == 0
+        assert engine.runtime_metrics == {
+            "jobs": {"is_positive": 0.0, "mark": 0.0},
+            "total_runtime": 0.0,
+        }
+
+    def test_clear(self):
+        registry = MetricsRegistry()
+        registry.record_job("job", 10)
+        registry.record_run(20)
+
+        registry.clear()
+
+        assert registry.jobs == {}
+        assert registry.runs.count == 0
+        assert registry.runtime_metrics() == {"jobs": {}, "total_runtime": 0}
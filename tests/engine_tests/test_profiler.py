@@ -0,0 +1,104 @@
+import asyncio
+import json
+
+import pytest
+
+from sauron.async_engine import AsyncRuleEngine
+from sauron.profiler import SamplingProfiler
+from sauron.rule_engine import RuleEngine
+
+RULE = {
+    "conditions": [{"name": "is_positive", "args": {"number": 1}}],
+    "actions": [{"name": "mark"}],
+}
+
+
+def build_engine(engine_class=RuleEngine, **kwargs):
+    engine = engine_class(**kwargs)
+
+    @engine.condition(cacheable=True)
+    def is_positive(session, number: int = 0) -> bool:
+        return number > 0
+
+    @engine.action()
+    def mark(session) -> None:
+        session["marked"] = True
+
+    return engine
+
+
+class TestProfilerCases:
+    def test_profiling_is_disabled_by_default(self):
+        engine = build_engine()
+
+        engine.run(RULE, {})
+
+        assert engine.profiler is None
+
+    def test_one_run_out_of_every_n_is_sampled(self):
+        engine = build_engine(profile_every=3)
+
+        sessions = [{} for _ in range(7)]
+        for session in sessions:
+            engine.run(RULE, session)
+
+        assert all(session["marked"] for session in sessions)
+        assert len(engine.profiler.profiles) == 3
+        assert engine.metrics.runs.count == 7
+
+    def test_span_tree(self):
+        engine = build_engine(profile_every=1)
+
+        engine.run(RULE, {})
+
+        spans = {
+            (name, category): (start_ns, end_ns)
+            for name, category, start_ns, end_ns, _ in (
+                engine.profiler.profiles[0].spans
+            )
+        }
+        assert set(spans) == {
+            ("run", "run"),
+            ("pre_engine_run", "signal"),
+            ("post_engine_run", "signal"),
+            ("parse", "parse"),
+            ("lookup", "lookup"),
+            ("memo", "lookup"),
+            ("is_positive", "condition"),
+            ("mark", "action"),
+            ("pre_job_call", "signal"),
+            ("call", "call"),
+            ("post_job_call", "signal"),
+        }
+        run_start, run_end = spans[("run", "run")]
+        for start_ns, end_ns in spans.values():
+            assert run_start <= start_ns <= end_ns <= run_end
+        assert spans[("lookup", "lookup")][1] <= spans[("memo", "lookup")][0]
+
+    def test_async_runs_are_sampled(self):
+        engine = build_engine(AsyncRuleEngine, profile_every=2)
+
+        for _ in range(3):
+            asyncio.run(engine.arun(RULE, {}))
+
+        assert len(engine.profiler.profiles) == 2
+        names = [span[0] for span in engine.profiler.profiles[0].spans]
+        assert names[-1] == "run"
+        assert {"parse", "is_positive", "call", "mark"} <= set(names)
+
+    def test_dump_chrome_trace(self, tmp_path):
+        engine = build_engine(profile_every=1)
+        engine.run(RULE, {})
+        path = tmp_path / "trace.json"
+
+        engine.profiler.dump(str(path))
+
+        trace = json.loads(path.read_text())
+        events = trace["traceEvents"]
+        assert {event["ph"] for event in events} == {"X"}
+        assert [event["name"] for event in events][-1] == "run"
+        assert all(event["dur"] >= 0 for event in events)
+
+    def test_invalid_rate(self):
+        with pytest.raises(ValueError):
+            SamplingProfiler(0)
@@ -0,0 +1,128 @@
+import json
+import sys
+
+import pytest
+
+from sauron.results import (
+    JobResult,
+    LastResults,
+    NoResults,
+    ResultsPolicy,
+    RunResults,
+    StreamResults,
+)
+from sauron.rule_engine import RuleEngine
+
+RULE = {
+    "conditions": [{"name": "is_positive", "args": {"number": 1}}],
+    "actions": [{"name": "double"}],
+}
+
+
+def build_engine(**kwargs):
+    engine = RuleEngine(**kwargs)
+
+    @engine.condition()
+    def is_positive(session, number: int = 0) -> bool:
+        return number > 0
+
+    @engine.action()
+    def double(session) -> int:
+        return 2
+
+    return engine
+
+
+class TestJobResult:
+    def test_reads_like_a_dict(self):
+        record = JobResult("double", 2)
+
+        assert record == {"job": "double", "return": 2}
+        assert {"job": "double", "return": 2} == record
+        assert record["return"] == 2
+        assert json.dumps(dict(record)) == '{"job": "double", "return": 2}'
+        with pytest.raises(KeyError):
+            record["other"]
+
+    def test_is_smaller_than_a_dict(self):
+        record = JobResult("double", 2)
+
+        assert not hasattr(record, "__dict__")
+        assert sys.getsizeof(record) < sys.getsizeof(dict(record))
+
+
+class TestResultsPolicyCases:
+    def test_every_result_is_kept_by_default(self):
+        engine = build_engine()
+        session = {}
+
+        for _ in range(3):
+            engine.run(RULE, session)
+
+        assert len(session["results"]) == 6
+        assert session["results"][-1] == {"job": "double", "return": 2}
+
+    def test_policies_must_record(self):
+        class Incomplete(ResultsPolicy):
+            pass
+
+        with pytest.raises(TypeError):
+            Incomplete()  # type: ignore[abstract]
+
+    def test_no_results(self):
+        engine = build_engine(results_policy=NoResults())
+        session = {}
+
+        engine.run(RULE, session)
+
+        assert "results" not in session
+
+    def test_last_results(self):
+        engine = build_engine(results_policy=LastResults(3))
+        session = {}
+
+        for _ in range(10):
+            engine.run(RULE, session)
+
+        assert list(session["results"]) == [
+            {"job": "double", "return": 2},
+            {"job": "is_positive", "return": True},
+            {"job": "double", "return": 2},
+        ]
+
+    def test_run_results(self):
+        engine = build_engine(results_policy=RunResults())
+
+        for _ in range(3):
+            engine.run(RULE)
+
+        assert engine.session["results"] == [
+            {"job": "is_positive", "return": True},
+            {"job": "double", "return": 2},
+        ]
+
+    def test_stream_results(self):
+        streamed = []
+        engine = build_engine(
+            results_policy=StreamResults(
+                lambda session, record: streamed.append(
+                    (session["id"], record)
+                )
+            )
+        )
+
+        engine.run(RULE, {"id": 1})
+        engine.run(RULE, {"id": 2})
+
+        assert [
+            (session_id, record["job"]) for session_id, record in streamed
+        ] == [
+            (1, "is_positive"),
+            (1, "double"),
+            (2, "is_positive"),
+            (2, "double"),
+        ]
+
+    def test_invalid_size(self):
+        with pytest.raises(ValueError):
+            LastResults(0)
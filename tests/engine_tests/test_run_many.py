@@ -0,0 +1,104 @@
+import types
+from typing import Any, Dict, List
+
+import pytest
+
+from sauron.engine import Engine
+
+engine = Engine()
+
+
+@engine.job("Is Positive")
+def is_positive(session):
+    return session["number"] > 0
+
+
+@engine.job("Double")
+def double(session):
+    session["number"] *= 2
+
+
+class TestRunManyCases:
+    rule = [
+        {"name": "is_positive", "job_type": "condition"},
+        {"name": "double", "job_type": "action"},
+    ]
+
+    def test_yields_each_session_lazily(self):
+        sessions = ({"number": number} for number in (1, -2, 3))
+        results = engine.run_many(self.rule, sessions)
+        assert isinstance(results, types.GeneratorType)
+        assert [session["number"] for session in results] == [2, -2, 6]
+
+    def test_short_circuits_per_session(self):
+        sessions: List[Dict[str, Any]] = [{"number": -1}, {"number": 1}]
+        list(engine.run_many(self.rule, sessions))
+        assert [result["job"] for result in sessions[0]["results"]] == [
+            "is_positive"
+        ]
+        assert [result["job"] for result in sessions[1]["results"]] == [
+            "is_positive",
+            "double",
+        ]
+
+    def test_parses_once_and_signals_once(self, monkeypatch):
+        parsed = []
+        original_parse = engine.parse
+
+        def counting_parse(*args, **kwargs):
+            parsed.append(args)
+            return original_parse(*args, **kwargs)
+
+        monkeypatch.setattr(engine, "parse", counting_parse)
+        fired = []
+
+        def on_run(sender, **kwargs):
+            fired.append(kwargs["session"])
+
+        engine.get_signal("pre_engine_run").connect(on_run, sender=engine)
+        engine.get_signal("post_engine_run").connect(on_run, sender=engine)
+        try:
+            list(
+                engine.run_many(
+                    self.rule, ({"number": n} for n in range(1, 50))
+                )
+            )
+        finally:
+            engine.get_signal("pre_engine_run").disconnect(on_run)
+            engine.get_signal("post_engine_run").disconnect(on_run)
+
+        assert len(parsed) == 1
+        assert fired == [None, None]
+        assert engine.runtime_metrics["total_runtime"] > 0
+
+    def test_checks_arguments_before_iterating(self):
+        with pytest.raises(ValueError, match="executor"):
+            engine.run_many(self.rule, [], executor="thread")
+        with pytest.raises(ValueError, match="chunksize"):
+            engine.run_many(self.rule, [], chunksize=0)
+        with pytest.raises(ValueError, match="not found"):
+            engine.run_many([{"name": "missing"}], [])
+
+    def test_post_engine_run_is_sent_when_closed_early(self):
+        fired = []
+
+        def on_run(sender, **kwargs):
+            fired.append(kwargs["session"])
+
+        engine.get_signal("post_engine_run").connect(on_run, sender=engine)
+        try:
+            results = engine.run_many(
+                self.rule, ({"number": n} for n in range(1, 50))
+            )
+            assert next(results) == {
+                "number": 2,
+                "results": [
+                    {"job": "is_positive", "return": True},
+                    {"job": "double", "return": None},
+                ],
+            }
+            results.close()
+        finally:
+            engine.get_signal("post_engine_run").disconnect(on_run)
+
+        assert fired == [None]
@@ -0,0 +1,117 @@
+import os
+import pickle
+from functools import partial
+
+import pytest
+
+from sauron.engine import Engine
+from sauron.results import NoResults, RunResults, StreamResults
+from tests.utils import job_parallel_module
+
+rule = [
+    {"name": "is_even", "job_type": "condition"},
+    {"name": "square", "job_type": "action"},
+]
+
+
+@pytest.fixture
+def engine():
+    engine = Engine()
+    engine.import_jobs(job_parallel_module)
+    return engine
+
+
+class TestRunManyParallelCases:
+    def test_compiled_rule_can_be_pickled(self, engine):
+        compiled = engine.compile(rule)
+        unpickled = pickle.loads(pickle.dumps(compiled))
+        assert unpickled == compiled
+
+    def test_records_imported_job_modules(self, engine):
+        assert engine.job_modules == ["tests.utils.job_parallel_module"]
+
+    def test_results_match_serial_run_in_order(self, engine):
+        numbers = list(range(50))
+        parallel = list(
+            engine.run_many(
+                rule,
+                ({"number": n} for n in numbers),
+                executor="process",
+                workers=2,
+                chunksize=7,
+            )
+        )
+        serial = list(engine.run_many(rule, ({"number": n} for n in numbers)))
+
+        assert [s["number"] for s in parallel] == [s["number"] for s in serial]
+        assert [s["results"] for s in parallel] == [
+            s["results"] for s in serial
+        ]
+        pids = {s["pid"] for s in parallel if "pid" in s}
+        assert os.getpid() not in pids
+
+    def test_rejects_unknown_executor(self, engine):
+        with pytest.raises(ValueError):
+            list(engine.run_many(rule, [], executor="thread"))
+
+    def test_rejects_invalid_chunksize(self, engine):
+        with pytest.raises(ValueError):
+            list(engine.run_many(rule, [], executor="process", chunksize=0))
+
+    def test_rejects_streamed_results(self):
+        engine = Engine(results_policy=StreamResults(print))
+
+        with pytest.raises(ValueError, match="StreamResults"):
+            engine.run_many(rule, [], executor="process")
+
+    def test_workers_keep_the_engine_configuration(self):
+        engine = Engine(results_policy=NoResults(), timing=False)
+        engine.import_jobs(job_parallel_module)
+
+        sessions = list(
+            engine.run_many(
+                rule,
+                ({"number": n} for n in range(10)),
+                executor="process",
+                workers=2,
+                chunksize=3,
+            )
+        )
+
+        assert all("results" not in session for session in sessions)
+        assert engine.metrics.jobs["is_even"].total_ns == 0
+
+    def test_worker_metrics_are_merged(self, engine):
+        list(
+            engine.run_many(
+                rule,
+                ({"number": n} for n in range(10)),
+                executor="process",
+                workers=2,
+                chunksize=3,
+            )
+        )
+
+        is_even = engine.metrics.jobs["is_even"]
+        assert (is_even.count, is_even.passes, is_even.failures) == (10, 5, 5)
+        assert engine.metrics.jobs["square"].count == 5
+        assert engine.metrics.runs.count == 10
+        assert "sauron_job_calls_total" in engine.export_metrics()
+
+    def test_engine_factory(self, engine):
+        sessions = list(
+            engine.run_many(
+                rule,
+                ({"number": n} for n in range(4)),
+                executor="process",
+                workers=1,
+                engine_factory=partial(Engine, results_policy=RunResults()),
+            )
+        )
+
+        assert [len(session["results"]) for session in sessions] == [
+            2,
+            1,
+            2,
+            1,
+        ]
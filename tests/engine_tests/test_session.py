@@ -0,0 +1,221 @@
+import pickle
+
+import pytest
+
+from sauron.engine import Engine
+from sauron.results import LastResults
+from sauron.session import Session, SessionDict, SessionList
+
+
+def build_engine(**kwargs):
+    engine = Engine(**kwargs)
+
+    @engine.job()
+    def add_discount(session, percent: int = 10):
+        session["discount"] = session["order"]["total"] * percent / 100
+        return session["discount"]
+
+    return engine
+
+
+class TestSession:
+    def test_reads_through_to_the_base(self):
+        base = {"order": {"total": 100}, "country": "BR"}
+        session = Session(base)
+
+        assert session["country"] == "BR"
+        assert session.get("missing") is None
+        assert "order" in session
+        assert len(session) == 2
+        assert dict(session) == base
+
+    def test_writes_and_deletes_only_touch_the_overlay(self):
+        base = {"country": "BR", "currency": "BRL"}
+        session = Session(base)
+
+        session["country"] = "PT"
+        session["tax"] = 0.2
+        del session["currency"]
+
+        assert dict(session) == {"country": "PT", "tax": 0.2}
+        assert "currency" not in session
+        assert base == {"country": "BR", "currency": "BRL"}
+        assert session.changes() == {"country": "PT", "tax": 0.2}
+        with pytest.raises(KeyError):
+            del session["currency"]
+
+    def test_rollback_discards_changes_since_the_snapshot(self):
+        session = Session({"country": "BR"}, {"tax": 0.2})
+
+        snapshot = session.snapshot()
+        session["tax"] = 0.5
+        session["country"] = "PT"
+        del session["tax"]
+        session.rollback(snapshot)
+
+        assert dict(session) == {"country": "BR", "tax": 0.2}
+        assert session.depth == 0
+
+    def test_rollback_undoes_in_place_changes_of_the_overlay(self):
+        session = Session(overlay={"results": [1]})
+
+        snapshot = session.snapshot()
+        session["results"].append(2)
+        assert session["results"] == [1, 2]
+        session.rollback(snapshot)
+
+        assert session["results"] == [1]
+
+    def test_rollback_undoes_in_place_changes_of_nested_containers(self):
+        items = ["book"]
+        session = Session(overlay={"order": {"items": items, "tags": {"new"}}})
+
+        snapshot = session.snapshot()
+        session["order"]["items"].append("pen")
+        session["order"]["tags"].add("paid")
+        session["order"]["status"] = "paid"
+        assert session["order"]["items"] == ["book", "pen"]
+        session.rollback(snapshot)
+
+        assert session["order"] == {"items": ["book"], "tags": {"new"}}
+        assert items == ["book"]
+
+    def test_containers_of_the_base_are_copied_on_change(self):
+        base = {"order": {"items": ["book"], "total": 10}, "results": []}
+        session = Session(base)
+
+        snapshot = session.snapshot()
+        session["order"]["items"].append("pen")
+        session["results"].append(1)
+        assert session["order"] == {"items": ["book", "pen"], "total": 10}
+        session.rollback(snapshot)
+        assert session["order"]["items"] == ["book"]
+
+        session["order"]["items"].append("pen")
+        assert base == {
+            "order": {"items": ["book"], "total": 10},
+            "results": [],
+        }
+        assert session.changes() == {
+            "order": {"items": ["book", "pen"], "total": 10}
+        }
+
+    def test_containers_only_read_are_not_copied(self):
+        order = {"items": [{"sku": "book"}], "total": 10}
+        session = Session(overlay={"order": order})
+
+        snapshot = session.snapshot()
+        assert session["order"]["items"][0]["sku"] == "book"
+        assert isinstance(session["order"], SessionDict)
+        assert isinstance(session["order"]["items"], SessionList)
+        session.commit(snapshot)
+
+        assert session.changes()["order"] is order
+
+    def test_views_of_the_same_container_share_changes(self):
+        session = Session({"order": {"items": []}})
+        order = session["order"]
+        items = order["items"]
+
+        session["order"]["status"] = "paid"
+        items.append("book")
+        order["total"] = 10
+
+        assert session["order"] == {
+            "items": ["book"],
+            "status": "paid",
+            "total": 10,
+        }
+        assert pickle.loads(pickle.dumps(order)) == session["order"]
+
+    def test_commit_keeps_changes_since_the_snapshot(self):
+        session = Session({"country": "BR"})
+
+        outer = session.snapshot()
+        session["tax"] = 0.2
+        inner = session.snapshot()
+        session["discount"] = 5
+        session.commit(inner)
+        session.rollback(outer)
+        assert dict(session) == {"country": "BR"}
+
+        outer = session.snapshot()
+        session["tax"] = 0.2
+        session.commit()
+        assert session.changes() == {"tax": 0.2}
+
+    def test_unknown_snapshot_is_rejected(self):
+        session = Session()
+
+        with pytest.raises(ValueError, match="no active snapshot"):
+            session.rollback()
+        snapshot = session.snapshot()
+        session.rollback(snapshot)
+        with pytest.raises(ValueError):
+            session.commit(snapshot)
+
+    def test_fork_shares_the_base(self):
+        base = {"country": "BR"}
+        session = Session(base, {"tax": 0.2})
+
+        forked = session.fork()
+        forked["tax"] = 0.5
+
+        assert forked.base is base
+        assert session["tax"] == 0.2
+        assert dict(forked) == {"country": "BR", "tax": 0.5}
+
+    def test_can_be_pickled(self):
+        session = Session({"country": "BR"}, {"tax": 0.2})
+
+        restored = pickle.loads(pickle.dumps(session))
+
+        assert dict(restored) == {"country": "BR", "tax": 0.2}
+        assert restored.changes() == {"tax": 0.2}
+
+
+class TestEngineSessions:
+    def test_runs_keep_the_base_untouched(self):
+        engine = build_engine()
+        base = {"order": {"total": 200}, "results": []}
+
+        sessions = [Session(base) for _ in range(3)]
+        for session in sessions:
+            engine.run([{"name": "add_discount"}], session)
+
+        assert base == {"order": {"total": 200}, "results": []}
+        assert sessions[0]["discount"] == 20
+        assert sessions[0].changes() == {
+            "discount": 20,
+            "results": [{"job": "add_discount", "return": 20}],
+        }
+
+    def test_rollback_of_a_run(self):
+        engine = build_engine(results_policy=LastResults(2))
+        session = Session({"order": {"total": 200}})
+        engine.run([{"name": "add_discount"}], session)
+
+        snapshot = session.snapshot()
+        engine.run(
+            [{"name": "add_discount", "args": {"percent": 50}}], session
+        )
+        assert session["discount"] == 100
+        session.rollback(snapshot)
+
+        assert session["discount"] == 20
+        assert list(session["results"]) == [
+            {"job": "add_discount", "return": 20}
+        ]
+
+    def test_run_many(self):
+        engine = build_engine()
+        base = {"order": {"total": 10}}
+
+        results = list(
+            engine.run_many(
+                [{"name": "add_discount"}], (Session(base) for _ in range(2))
+            )
+        )
+
+        assert [session["discount"] for session in results] == [1, 1]
+        assert "discount" not in base
@@ -0,0 +1,89 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict
+
+from sauron.engine import Engine
+from sauron.rule_engine import RuleEngine
+
+engine = RuleEngine()
+
+
+@engine.condition()
+def owns_session(session) -> bool:
+    return session["owner"] == threading.get_ident()
+
+
+@engine.action()
+def record_owner(session) -> None:
+    time.sleep(0)
+    session.setdefault("owners", []).append(session["owner"])
+
+
+rule = engine.compile(
+    {
+        "conditions": [{"name": "owns_session"}],
+        "actions": [{"name": "record_owner"}, {"name": "record_owner"}],
+    }
+)
+
+
+def run_many_times(runs):
+    owner = threading.get_ident()
+    sessions = []
+    for _ in range(runs):
+        session: Dict[str, Any] = {"owner": owner}
+        engine.run(rule, session)
+        assert engine.session is session
+        sessions.append(session)
+    return owner, sessions
+
+
+class TestThreadSafetyCases:
+    def test_concurrent_runs_dont_share_sessions(self):
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            outcomes = list(executor.map(run_many_times, [200] * 16))
+
+        for owner, sessions in outcomes:
+            for session in sessions:
+                assert session["owners"] == [owner, owner]
+                assert [result["job"] for result in session["results"]] == [
+                    "owns_session",
+                    "record_owner",
+                    "record_owner",
+                ]
+
+    def test_engines_dont_share_state(self):
+        first, second = Engine(context={"name": "first"}), Engine()
+
+        @first.job()
+        def first_job(session):
+            return True
+
+        first.run([{"name": "first_job"}], {"foo": "bar"})
+
+        assert "first_job" in first.runtime_metrics["jobs"]
+        assert second.runtime_metrics["jobs"] == {}
+        assert second.session == {}
+        assert second.parsed_rule == []
+        assert first.signals["pre_job_call"] is not None
+        assert first.signals is not second.signals
+
+    def test_last_session_is_tracked_per_thread(self):
+        local_engine = Engine(context={"name": "default"})
+
+        @local_engine.job()
+        def noop(session):
+            return True
+
+        local_engine.run([{"name": "noop"}], {"name": "main"})
+
+        seen = []
+        thread = threading.Thread(
+            target=lambda: seen.append(local_engine.session["name"])
+        )
+        thread.start()
+        thread.join()
+
+        assert seen == ["default"]
+        assert local_engine.session["name"] == "main"
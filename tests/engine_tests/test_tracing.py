@@ -0,0 +1,127 @@
+import asyncio
+
+import pytest
+
+from sauron.async_engine import AsyncRuleEngine
+from sauron.rule_engine import RuleEngine
+from sauron.tracing import (
+    InMemoryTracer,
+    NoOpTracer,
+    RecordedSpan,
+    Span,
+    Tracer,
+)
+
+RULE = {
+    "conditions": [
+        {"name": "is_positive", "args": {"number": 1}},
+        {"name": "is_positive", "args": {"number": -1}},
+    ],
+    "actions": [{"name": "mark"}],
+}
+
+
+def register_jobs(engine):
+    @engine.condition()
+    def is_positive(session, number: int = 0) -> bool:
+        return number > 0
+
+    @engine.action()
+    def mark(session) -> None:
+        session["marked"] = True
+
+    @engine.action()
+    def fail(session) -> None:
+        raise RuntimeError("failed")
+
+    return engine
+
+
+class TestTracingCases:
+    def test_nothing_is_traced_by_default(self):
+        engine = register_jobs(RuleEngine())
+
+        engine.run(RULE, {})
+
+        assert isinstance(engine.tracer, NoOpTracer)
+
+    def test_interfaces_are_abstract(self):
+        with pytest.raises(TypeError):
+            Tracer()  # type: ignore[abstract]
+        with pytest.raises(TypeError):
+            Span()  # type: ignore[abstract]
+        # spans keep their slots, no instance dict
+        assert not hasattr(RecordedSpan(InMemoryTracer(), "run"), "__dict__")
+
+    def test_run_and_job_spans(self):
+        # given:
+        tracer = InMemoryTracer()
+        engine = register_jobs(RuleEngine(tracer=tracer))
+
+        # when:
+        engine.run(RULE, {})
+
+        # then:
+        run_span = tracer.spans[-1]
+        assert run_span.name == "sauron.run"
+        assert run_span.parent is None
+        job_spans = tracer.children(run_span)
+        assert [span.attributes for span in job_spans] == [
+            {
+                "job.name": "is_positive",
+                "job.type": "condition",
+                "job.args": {"number": 1},
+                "condition.result": True,
+            },
+            {
+                "job.name": "is_positive",
+                "job.type": "condition",
+                "job.args": {"number": -1},
+                "condition.result": False,
+            },
+        ]
+        for span in job_spans:
+            assert run_span.start_ns <= span.start_ns <= span.end_ns
+            assert span.end_ns <= run_span.end_ns
+
+    def test_errors_are_recorded(self):
+        tracer = InMemoryTracer()
+        engine = register_jobs(RuleEngine(tracer=tracer))
+
+        with pytest.raises(RuntimeError):
+            engine.run({"actions": [{"name": "fail"}]}, {})
+
+        job_span, run_span = tracer.spans
+        assert job_span.parent is run_span
+        assert isinstance(job_span.error, RuntimeError)
+        assert run_span.error is job_span.error
+
+    def test_traced_and_profiled_runs(self):
+        tracer = InMemoryTracer()
+        engine = register_jobs(RuleEngine(tracer=tracer, profile_every=1))
+
+        engine.run(RULE, {})
+
+        assert len(tracer.spans) == 3
+        names = [span[0] for span in engine.profiler.profiles[0].spans]
+        assert names.count("is_positive") == 2
+
+    def test_async_runs(self):
+        tracer = InMemoryTracer()
+        engine = register_jobs(
+            AsyncRuleEngine(tracer=tracer, concurrent_conditions=True)
+        )
+
+        session = {}
+        asyncio.run(engine.arun(RULE, session))
+
+        run_span = tracer.spans[-1]
+        assert run_span.name == "sauron.run"
+        results = {
+            span.attributes["job.args"]["number"]: span.attributes.get(
+                "condition.result"
+            )
+            for span in tracer.children(run_span)
+        }
+        assert results[-1] is False
+        assert "marked" not in session
@@ -0,0 +1,119 @@
+import asyncio
+import threading
+from typing import Any, Dict
+
+import pytest
+
+from sauron.async_engine import AsyncRuleEngine
+from sauron.rule_engine import RuleEngine
+from sauron.ruleset import RuleSet
+
+rule = {
+    "conditions": [
+        {"name": "is_cached", "args": {"key": "order"}},
+        {"name": "is_small", "args": {"limit": 10}},
+    ],
+    "actions": [{"name": "store_thread"}, {"name": "mark_done"}],
+}
+
+
+def create_engine(**kwargs):
+    engine = AsyncRuleEngine(**kwargs)
+
+    @engine.condition()
+    async def is_cached(session, key: str) -> bool:
+        await asyncio.sleep(0)
+        return key in session
+
+    @engine.condition()
+    def is_small(session, limit: int) -> bool:
+        return session["order"] < limit
+
+    @engine.action()
+    def store_thread(session) -> None:
+        session["thread"] = threading.get_ident()
+
+    @engine.action()
+    async def mark_done(session) -> None:
+        session["done"] = True
+
+    return engine
+
+
+def test_arun_awaits_async_jobs_and_runs_sync_inline():
+    engine = create_engine()
+    session: Dict[str, Any] = {"order": 1}
+    asyncio.run(engine.arun(rule, session))
+    assert session["done"] is True
+    assert session["thread"] == threading.get_ident()
+    assert [result["return"] for result in session["results"]] == [
+        True,
+        True,
+        None,
+        None,
+    ]
+
+
+def test_arun_can_run_sync_jobs_in_threads():
+    engine = create_engine(run_sync_in_thread=True)
+    session = {"order": 1}
+    asyncio.run(engine.arun(rule, session))
+    assert session["thread"] != threading.get_ident()
+
+
+def test_arun_respects_conditions():
+    engine = create_engine()
+    session = {"order": 100}
+    asyncio.run(engine.arun(rule, session))
+    assert "done" not in session
+
+
+def test_arun_emits_signals():
+    engine = create_engine()
+    called = []
+
+    def on_job(sender, **kwargs):
+        called.append(kwargs["job_name"])
+
+    signal = engine.get_signal("post_job_call")
+    signal.connect(on_job, sender=engine)
+    try:
+        asyncio.run(engine.arun(rule, {"order": 1}))
+    finally:
+        signal.disconnect(on_job)
+    assert called == ["is_cached", "is_small", "store_thread", "mark_done"]
+
+
+def test_sync_run_rejects_async_jobs():
+    with pytest.raises(ValueError):
+        create_engine().run(rule, {"order": 1})
+
+
+def test_sync_run_rejects_async_jobs_before_running_any():
+    engine = create_engine()
+    session = {"order": 1}
+    sync_first = {
+        "conditions": [{"name": "is_small", "args": {"limit": 10}}],
+        "actions": [{"name": "store_thread"}, {"name": "mark_done"}],
+    }
+
+    with pytest.raises(ValueError, match="'mark_done' is a coroutine"):
+        engine.run(sync_first, session)
+    with pytest.raises(ValueError, match="'mark_done' is a coroutine"):
+        engine.run_batch(sync_first, [session])
+    with pytest.raises(ValueError, match="'mark_done' is a coroutine"):
+        list(engine.run_many(sync_first, [session]))
+    with pytest.raises(ValueError, match="'mark_done' is a coroutine"):
+        RuleSet(engine, [sync_first])
+    assert session == {"order": 1}
+
+
+def test_sync_engine_rejects_async_jobs_at_compile_time():
+    engine = RuleEngine()
+
+    @engine.condition()
+    async def is_cached(session, key: str) -> bool:
+        return True
+
+    with pytest.raises(ValueError):
+        engine.compile({"conditions": [{"name": "is_cached"}]})
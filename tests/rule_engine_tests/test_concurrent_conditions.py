@@ -0,0 +1,133 @@
+import asyncio
+import threading
+import time
+from typing import Any, Dict
+
+import pytest
+
+from sauron.async_engine import AsyncRuleEngine
+
+
+def create_engine(finished):
+    engine = AsyncRuleEngine(concurrent_conditions=True)
+
+    @engine.condition()
+    async def slow_check(session, delay: float, value: bool = True) -> bool:
+        await asyncio.sleep(delay)
+        finished.append(delay)
+        return value
+
+    @engine.condition()
+    def blocking_check(session, delay: float) -> bool:
+        time.sleep(delay)
+        return True
+
+    @engine.action()
+    def approve(session) -> None:
+        session["approved"] = True
+
+    return engine
+
+
+def test_conditions_run_concurrently():
+    finished = []
+    engine = create_engine(finished)
+    rule = {
+        "conditions": [
+            {"name": "slow_check", "args": {"delay": 0.2}},
+            {"name": "slow_check", "args": {"delay": 0.2}},
+            {"name": "blocking_check", "args": {"delay": 0.2}},
+        ],
+        "actions": [{"name": "approve"}],
+    }
+    session: Dict[str, Any] = {"order": 1}
+
+    tick_start = time.perf_counter()
+    asyncio.run(engine.arun(rule, session))
+    elapsed = time.perf_counter() - tick_start
+
+    assert session["approved"] is True
+    assert elapsed < 0.5
+    assert len(session["results"]) == 4
+    assert session["results"][-1]["job"] == "approve"
+
+
+def test_first_false_condition_cancels_the_rest():
+    finished = []
+    engine = create_engine(finished)
+    rule = {
+        "conditions": [
+            {"name": "slow_check", "args": {"delay": 5}},
+            {"name": "slow_check", "args": {"delay": 0.01, "value": False}},
+        ],
+        "actions": [{"name": "approve"}],
+    }
+    session: Dict[str, Any] = {"order": 1}
+
+    tick_start = time.perf_counter()
+    asyncio.run(engine.arun(rule, session))
+    elapsed = time.perf_counter() - tick_start
+
+    assert elapsed < 1
+    assert finished == [0.01]
+    assert "approved" not in session
+    assert [result["return"] for result in session["results"]] == [False]
+
+
+def test_condition_errors_cancel_the_rest():
+    engine = AsyncRuleEngine(concurrent_conditions=True)
+    finished = []
+
+    @engine.condition()
+    async def slow_check(session) -> bool:
+        await asyncio.sleep(5)
+        finished.append(True)
+        return True
+
+    @engine.condition()
+    async def broken_check(session) -> bool:
+        raise RuntimeError("boom")
+
+    rule = {
+        "conditions": [{"name": "slow_check"}, {"name": "broken_check"}],
+        "actions": [],
+    }
+    with pytest.raises(RuntimeError):
+        asyncio.run(engine.arun(rule, {"order": 1}))
+    assert finished == []
+
+
+def test_regular_conditions_are_abandoned_not_interrupted():
+    engine = AsyncRuleEngine(concurrent_conditions=True)
+    release = threading.Event()
+    finished = []
+
+    @engine.condition()
+    def blocking_check(session) -> bool:
+        release.wait(5)
+        finished.append(True)
+        return True
+
+    @engine.condition()
+    async def failing_check(session) -> bool:
+        return False
+
+    rule = {
+        "conditions": [{"name": "blocking_check"}, {"name": "failing_check"}],
+        "actions": [],
+    }
+    session: Dict[str, Any] = {"order": 1}
+
+    async def run_and_release():
+        await engine.arun(rule, session)
+        # arun returned while the thread was still blocked
+        abandoned = finished == []
+        release.set()
+        return abandoned
+
+    assert asyncio.run(run_and_release()) is True
+    # the thread ran to completion, its result was dropped
+    assert finished == [True]
+    assert [result["job"] for result in session["results"]] == [
+        "failing_check"
+    ]
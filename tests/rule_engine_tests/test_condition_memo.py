@@ -0,0 +1,88 @@
+import time
+from typing import Any, Dict
+
+import pytest
+
+from sauron.cache import LRUCache
+from sauron.rule_engine import RuleEngine
+
+
+def create_engine(calls, **kwargs):
+    engine = RuleEngine(**kwargs)
+
+    @engine.condition(cacheable=True, session_keys=("order",))
+    def amount_sufficient(session, min_amount: int = 10) -> bool:
+        calls.append(min_amount)
+        return session["order"]["total"] >= min_amount
+
+    @engine.condition(cacheable=True)
+    def feature_enabled(session) -> bool:
+        calls.append("feature")
+        return True
+
+    @engine.action()
+    def approve(session, label: str = "approved") -> None:
+        session.setdefault("labels", []).append(label)
+
+    return engine
+
+
+def rule(min_amount, label):
+    return {
+        "conditions": [
+            {"name": "amount_sufficient", "args": {"min_amount": min_amount}},
+            {"name": "feature_enabled"},
+        ],
+        "actions": [{"name": "approve", "args": {"label": label}}],
+    }
+
+
+def test_memo_shares_results_between_rules():
+    calls = []
+    engine = create_engine(calls)
+    session: Dict[str, Any] = {"order": {"total": 50}}
+    memo: Dict[Any, Any] = {}
+    engine.run(rule(10, "first"), session, memo=memo)
+    engine.run(rule(10, "second"), session, memo=memo)
+    engine.run(rule(20, "third"), session, memo=memo)
+
+    assert session["labels"] == ["first", "second", "third"]
+    assert calls == [10, "feature", 20]
+    assert [result["return"] for result in session["results"]].count(True) == 6
+    info = engine.memo_info()
+    assert (info.hits, info.misses) == (3, 3)
+    assert info.hit_ratio == 0.5
+
+
+def test_without_memo_each_run_evaluates_again():
+    calls = []
+    engine = create_engine(calls)
+    session = {"order": {"total": 50}}
+    engine.run(rule(10, "first"), session)
+    engine.run(rule(10, "second"), session)
+    assert calls == [10, "feature", 10, "feature"]
+
+
+def test_condition_cache_is_keyed_by_session_keys():
+    calls = []
+    engine = create_engine(calls, condition_cache_size=16)
+    engine.run(rule(10, "a"), {"order": {"total": 50}})
+    engine.run(rule(10, "b"), {"order": {"total": 50}})
+    engine.run(rule(10, "c"), {"order": {"total": 5}})
+    assert calls == [10, "feature", 10]
+    assert engine.condition_cache is not None
+    assert len(engine.condition_cache) == 3
+
+
+def test_condition_cache_entries_expire():
+    cache = LRUCache(maxsize=2, ttl=0.01)
+    cache.set("key", True)
+    assert cache.get("key") is True
+    time.sleep(0.02)
+    assert cache.get("key") is None
+    assert "key" not in cache
+
+
+def test_invalid_ttl():
+    with pytest.raises(ValueError):
+        LRUCache(maxsize=2, ttl=0)
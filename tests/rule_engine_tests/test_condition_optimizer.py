@@ -0,0 +1,136 @@
+import time
+
+from sauron.optimizer import ConditionOptimizer
+from sauron.rule_engine import RuleEngine
+
+
+def compile_rule(engine, names):
+    return engine.compile(
+        {
+            "conditions": [{"name": name} for name in names],
+            "actions": [{"name": "approve"}],
+        }
+    )
+
+
+def args_keys(compiled):
+    return {job.name: job.args_key for job in compiled.jobs}
+
+
+def create_engine(**kwargs):
+    engine = RuleEngine(**kwargs)
+
+    @engine.condition(pure=True)
+    def slow_and_permissive(session) -> bool:
+        time.sleep(0.001)
+        return True
+
+    @engine.condition(pure=True)
+    def fast_and_selective(session) -> bool:
+        return session["number"] % 2 == 0
+
+    @engine.condition(pure=True)
+    def is_above(session, number: int = 0) -> bool:
+        return session["number"] > number
+
+    @engine.condition()
+    def with_side_effects(session) -> bool:
+        session["checked"] = True
+        return True
+
+    @engine.action()
+    def approve(session) -> None:
+        session["approved"] = True
+
+    return engine
+
+
+def test_pure_flag_is_collected():
+    engine = create_engine()
+    assert engine.callables_collected["slow_and_permissive"]["pure"] is True
+    assert engine.callables_collected["with_side_effects"]["pure"] is False
+
+
+def test_optimizer_disabled_by_default():
+    engine = create_engine()
+    compiled = compile_rule(
+        engine, ["slow_and_permissive", "fast_and_selective"]
+    )
+    assert engine.condition_optimizer is None
+    assert engine._plan_rule(compiled) is compiled
+
+
+def test_cheap_selective_conditions_move_first():
+    engine = create_engine(optimize_conditions=True)
+    compiled = compile_rule(
+        engine, ["slow_and_permissive", "fast_and_selective"]
+    )
+    for number in range(200):
+        engine.run(compiled, {"number": number})
+
+    planned = engine._plan_rule(compiled)
+    assert [job.name for job in planned.jobs] == [
+        "fast_and_selective",
+        "slow_and_permissive",
+        "approve",
+    ]
+    stats = engine.condition_optimizer.stats[
+        args_keys(compiled)["fast_and_selective"]
+    ]
+    assert 0.4 < stats.pass_rate < 0.6
+
+
+def test_impure_conditions_are_barriers():
+    optimizer = ConditionOptimizer(min_calls=1, reorder_interval=1)
+    engine = create_engine()
+    compiled = compile_rule(
+        engine,
+        ["slow_and_permissive", "with_side_effects", "fast_and_selective"],
+    )
+    keys = args_keys(compiled)
+    optimizer.record(keys["slow_and_permissive"], 1.0, True)
+    optimizer.record(keys["fast_and_selective"], 0.0, False)
+    assert [job.name for job in optimizer.plan(compiled).jobs] == [
+        "slow_and_permissive",
+        "with_side_effects",
+        "fast_and_selective",
+        "approve",
+    ]
+
+
+def test_plans_are_reused_until_next_interval():
+    optimizer = ConditionOptimizer(min_calls=1, reorder_interval=2)
+    engine = create_engine()
+    compiled = compile_rule(
+        engine, ["slow_and_permissive", "fast_and_selective"]
+    )
+    first_plan = optimizer.plan(compiled)
+    assert optimizer.plan(compiled) is first_plan
+
+    keys = args_keys(compiled)
+    optimizer.record(keys["slow_and_permissive"], 1.0, True)
+    optimizer.record(keys["fast_and_selective"], 0.0, False)
+    second_plan = optimizer.plan(compiled)
+    assert second_plan is not first_plan
+    assert second_plan.jobs[0].name == "fast_and_selective"
+
+
+def test_conditions_are_tracked_by_args():
+    optimizer = ConditionOptimizer(min_calls=1, reorder_interval=1)
+    engine = create_engine()
+    compiled = engine.compile(
+        {
+            "conditions": [
+                {"name": "is_above", "args": {"number": 0}},
+                {"name": "is_above", "args": {"number": 1000}},
+            ],
+            "actions": [{"name": "approve"}],
+        }
+    )
+    permissive, selective = compiled.jobs[:2]
+    assert permissive.args_key != selective.args_key
+
+    optimizer.record(permissive.args_key, 1.0, True)
+    optimizer.record(selective.args_key, 1.0, False)
+
+    assert optimizer.plan(compiled).jobs[:2] == (selective, permissive)
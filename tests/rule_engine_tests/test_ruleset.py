@@ -0,0 +1,113 @@
+from sauron.rule_engine import RuleEngine
+from sauron.ruleset import RuleSet
+
+
+def create_engine(calls):
+    engine = RuleEngine()
+
+    @engine.condition()
+    def has_items(session) -> bool:
+        calls.append("has_items")
+        return len(session["items"]) > 0
+
+    @engine.condition()
+    def amount_above(session, amount: int) -> bool:
+        calls.append(f"amount_above_{amount}")
+        return session["total"] > amount
+
+    @engine.action()
+    def add_label(session, label: str) -> None:
+        session.setdefault("labels", []).append(label)
+
+    return engine
+
+
+def rule(label, *conditions):
+    return {
+        "conditions": list(conditions),
+        "actions": [{"name": "add_label", "args": {"label": label}}],
+    }
+
+
+has_items = {"name": "has_items"}
+
+
+def amount_above(amount):
+    return {"name": "amount_above", "args": {"amount": amount}}
+
+
+def test_identical_conditions_share_nodes():
+    engine = create_engine([])
+    ruleset = RuleSet(
+        engine,
+        [
+            rule("small", has_items, amount_above(10)),
+            rule("medium", has_items, amount_above(100)),
+            rule("large", has_items, amount_above(100), amount_above(1000)),
+        ],
+    )
+    assert len(ruleset.nodes) == 4
+    assert [node.conditions for node in ruleset.rules] == [
+        (0, 1),
+        (0, 2),
+        (0, 2, 3),
+    ]
+    assert ruleset.dependents == [(0, 1, 2), (0,), (1, 2), (2,)]
+
+
+def test_each_condition_runs_once_and_matching_rules_fire():
+    calls = []
+    engine = create_engine(calls)
+    ruleset = RuleSet(
+        engine,
+        [
+            rule("small", has_items, amount_above(10)),
+            rule("medium", has_items, amount_above(100)),
+            rule("large", has_items, amount_above(100), amount_above(1000)),
+            rule("any", amount_above(10)),
+        ],
+    )
+    session = {"items": [1], "total": 500}
+    assert ruleset.run(session) == [0, 1, 3]
+    assert session["labels"] == ["small", "medium", "any"]
+    assert calls == [
+        "has_items",
+        "amount_above_10",
+        "amount_above_100",
+        "amount_above_1000",
+    ]
+
+
+def test_failing_shared_condition_skips_dependent_rules():
+    calls = []
+    engine = create_engine(calls)
+    ruleset = RuleSet(
+        engine,
+        [
+            rule("small", has_items, amount_above(10)),
+            rule("medium", has_items, amount_above(100)),
+        ],
+    )
+    session = {"items": [], "total": 500}
+    assert ruleset.run(session) == []
+    assert "labels" not in session
+    assert calls == ["has_items"]
+
+
+def test_failing_node_rejects_rules_without_scanning_them():
+    calls = []
+    engine = create_engine(calls)
+    ruleset = RuleSet(
+        engine,
+        [
+            rule("small", amount_above(10), has_items),
+            rule("medium", has_items, amount_above(100)),
+            rule("large", amount_above(1000), amount_above(10)),
+        ],
+    )
+    ruleset.rules[1] = ruleset.rules[1]._replace(conditions=(99,))
+    session = {"items": [], "total": 500}
+
+    # rule 1 was rejected by has_items, its bogus node is never looked up
+    assert ruleset.match(session) == []
+    assert calls == ["amount_above_10", "has_items", "amount_above_1000"]
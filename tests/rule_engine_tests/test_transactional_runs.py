@@ -0,0 +1,164 @@
+import asyncio
+from typing import Any, Dict
+
+import pytest
+
+from sauron.async_engine import AsyncRuleEngine
+from sauron.rule_engine import RuleEngine
+from sauron.session import Session
+
+RULE = {
+    "conditions": [{"name": "has_order"}],
+    "actions": [
+        {"name": "reserve_stock"},
+        {"name": "charge"},
+        {"name": "ship"},
+    ],
+}
+
+
+def register_jobs(engine, fail_at):
+    @engine.condition()
+    def has_order(session) -> bool:
+        return "order" in session
+
+    @engine.action()
+    def reserve_stock(session):
+        session["reserved"] = True
+        session["log"].append("reserved")
+
+    @engine.action()
+    def charge(session):
+        session["charged"] = session["order"]["total"]
+        del session["coupon"]
+        session["log"].append("charged")
+
+    @engine.action()
+    def ship(session):
+        if fail_at["ship"]:
+            raise RuntimeError("carrier unavailable")
+        session["shipped"] = True
+
+    return engine
+
+
+def new_session() -> Dict[str, Any]:
+    return {"order": {"total": 30}, "coupon": "WELCOME", "log": []}
+
+
+@pytest.fixture
+def fail_at():
+    return {"ship": True}
+
+
+@pytest.fixture
+def engine(fail_at):
+    return register_jobs(RuleEngine(), fail_at)
+
+
+def test_failed_run_leaves_the_session_untouched(engine):
+    session = new_session()
+
+    with pytest.raises(RuntimeError):
+        engine.run(RULE, session, transactional=True)
+
+    assert session == new_session()
+
+
+def test_successful_run_commits_every_change(engine, fail_at):
+    session = new_session()
+    fail_at["ship"] = False
+
+    engine.run(RULE, session, transactional=True)
+
+    assert "coupon" not in session
+    assert session["reserved"] is True
+    assert session["charged"] == 30
+    assert session["shipped"] is True
+    assert session["log"] == ["reserved", "charged"]
+    assert len(session["results"]) == 4
+
+
+def test_nested_changes_are_rolled_back():
+    engine = RuleEngine()
+
+    @engine.action()
+    def add_item(session):
+        session["order"]["items"].append("pen")
+        session["order"]["status"] = "pending"
+
+    @engine.action()
+    def fail(session):
+        raise RuntimeError("payment refused")
+
+    session: Dict[str, Any] = {"order": {"items": ["book"]}}
+    rule = {"actions": [{"name": "add_item"}, {"name": "fail"}]}
+
+    with pytest.raises(RuntimeError):
+        engine.run(rule, session, transactional=True)
+
+    assert session == {"order": {"items": ["book"]}}
+
+
+def test_only_changed_keys_are_committed(engine, fail_at):
+    session = new_session()
+    order, log = session["order"], session["log"]
+    fail_at["ship"] = False
+
+    engine.run(RULE, session, transactional=True)
+
+    assert session["order"] is order
+    assert session["log"] == ["reserved", "charged"]
+    assert session["log"] is not log
+    assert log == []
+
+
+def test_retry_of_a_compiled_rule(engine, fail_at):
+    compiled_rule = engine.compile(RULE)
+    session = new_session()
+
+    with pytest.raises(RuntimeError):
+        engine.run(compiled_rule, session, transactional=True)
+    fail_at["ship"] = False
+    engine.run(compiled_rule, session, transactional=True)
+
+    assert session["log"] == ["reserved", "charged"]
+    assert len(session["results"]) == 4
+
+
+def test_runs_are_not_transactional_by_default(engine):
+    session = new_session()
+
+    with pytest.raises(RuntimeError):
+        engine.run(RULE, session)
+
+    assert session["reserved"] is True
+    assert "coupon" not in session
+
+
+def test_layered_session(engine, fail_at):
+    base = {"order": {"total": 30}}
+    session = Session(base, {"coupon": "WELCOME", "log": []})
+
+    with pytest.raises(RuntimeError):
+        engine.run(RULE, session, transactional=True)
+    assert session.changes() == {"coupon": "WELCOME", "log": []}
+
+    fail_at["ship"] = False
+    engine.run(RULE, session, transactional=True)
+    assert session.depth == 0
+    assert session["log"] == ["reserved", "charged"]
+    assert base == {"order": {"total": 30}}
+
+
+def test_async_transactional_run(fail_at):
+    engine = register_jobs(AsyncRuleEngine(), fail_at)
+    session = new_session()
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(engine.arun(RULE, session, transactional=True))
+    assert session == new_session()
+
+    fail_at["ship"] = False
+    asyncio.run(engine.arun(RULE, session, transactional=True))
+    assert session["shipped"] is True
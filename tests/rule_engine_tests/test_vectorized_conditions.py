@@ -0,0 +1,172 @@
+from typing import Any, Dict
+
+import pytest
+
+from sauron.batch import SessionBatch
+from sauron.rule_engine import RuleEngine
+
+RULE = {
+    "conditions": [
+        {"name": "high_value", "args": {"minimum": 100}},
+        {"name": "is_domestic"},
+    ],
+    "actions": [{"name": "flag"}],
+}
+
+
+@pytest.fixture
+def calls():
+    return []
+
+
+@pytest.fixture
+def engine(calls):
+    engine = RuleEngine()
+
+    @engine.condition(vectorized=True)
+    def high_value(batch: SessionBatch, minimum: float = 0):
+        calls.append(("high_value", len(batch)))
+        return [total >= minimum for total in batch.column("total", 0)]
+
+    @engine.condition(vectorized=True)
+    def is_domestic(batch: SessionBatch):
+        calls.append(("is_domestic", len(batch)))
+        return [country == "BR" for country in batch.column("country")]
+
+    @engine.condition()
+    def not_flagged(session) -> bool:
+        calls.append(("not_flagged", 1))
+        return not session.get("flagged")
+
+    @engine.action()
+    def flag(session):
+        calls.append(("flag", 1))
+        session["flagged"] = True
+
+    return engine
+
+
+def orders():
+    return [
+        {"id": 1, "total": 150, "country": "BR"},
+        {"id": 2, "total": 50, "country": "BR"},
+        {"id": 3, "total": 300, "country": "PT"},
+        {"id": 4, "total": 100, "country": "BR"},
+    ]
+
+
+def test_actions_only_run_on_surviving_sessions(engine, calls):
+    sessions = orders()
+
+    passed = engine.run_batch(RULE, sessions)
+
+    assert [session["id"] for session in passed] == [1, 4]
+    assert [session.get("flagged", False) for session in sessions] == [
+        True,
+        False,
+        False,
+        True,
+    ]
+    # rejected sessions are left out of later conditions
+    assert calls == [
+        ("high_value", 4),
+        ("is_domestic", 3),
+        ("flag", 1),
+        ("flag", 1),
+    ]
+
+
+def test_results_are_recorded_per_session(engine):
+    sessions = orders()
+
+    engine.run_batch(RULE, sessions)
+
+    assert sessions[1]["results"] == [{"job": "high_value", "return": False}]
+    assert sessions[3]["results"] == [
+        {"job": "high_value", "return": True},
+        {"job": "is_domestic", "return": True},
+        {"job": "flag", "return": None},
+    ]
+    high_value = engine.metrics.jobs["high_value"]
+    # one call, but passes and failures are counted per session
+    assert high_value.count == 1
+    assert (high_value.passes, high_value.failures) == (3, 1)
+    assert engine.metrics.jobs["flag"].count == 2
+
+
+def test_mixes_with_row_conditions(engine, calls):
+    sessions = orders()
+    sessions[0]["flagged"] = True
+    rule = {
+        "conditions": [
+            {"name": "high_value", "args": {"minimum": 100}},
+            {"name": "not_flagged"},
+        ],
+        "actions": [{"name": "flag"}],
+    }
+
+    passed = engine.run_batch(rule, sessions)
+
+    assert [session["id"] for session in passed] == [3, 4]
+    assert calls.count(("not_flagged", 1)) == 3
+
+
+def test_stops_once_every_session_is_rejected(engine, calls):
+    rule = {
+        "conditions": [
+            {"name": "high_value", "args": {"minimum": 1000}},
+            {"name": "is_domestic"},
+        ],
+        "actions": [{"name": "flag"}],
+    }
+
+    assert engine.run_batch(rule, orders()) == []
+    assert calls == [("high_value", 4)]
+
+
+def test_vectorized_conditions_in_row_runs(engine):
+    session: Dict[str, Any] = {"total": 150, "country": "BR"}
+
+    engine.run(RULE, session)
+
+    assert session["flagged"] is True
+    assert session["results"][0] == {"job": "high_value", "return": True}
+
+
+def test_mask_size_is_checked():
+    engine = RuleEngine()
+
+    @engine.condition(vectorized=True)
+    def broken(batch):
+        return [True]
+
+    with pytest.raises(ValueError, match="mask of 1 values"):
+        engine.run_batch({"conditions": [{"name": "broken"}]}, orders())
+
+
+def test_vectorized_conditions_take_a_batch():
+    engine = RuleEngine()
+
+    @engine.condition(vectorized=True)
+    def no_batch(session):
+        return []
+
+    with pytest.raises(ValueError, match="doesn't accept a batch argument"):
+        engine.compile({"conditions": [{"name": "no_batch"}]})
+
+
+def test_numpy_masks(engine):
+    numpy = pytest.importorskip("numpy")
+
+    @engine.condition(vectorized=True)
+    def small(batch, maximum: float = 0):
+        return batch.array("total", dtype=float) <= maximum
+
+    rule = {
+        "conditions": [{"name": "small", "args": {"maximum": 150}}],
+        "actions": [{"name": "flag"}],
+    }
+    passed = engine.run_batch(rule, orders())
+
+    assert [session["id"] for session in passed] == [1, 2, 4]
+    assert isinstance(SessionBatch(passed).array("total"), numpy.ndarray)
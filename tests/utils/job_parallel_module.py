@@ -0,0 +1,16 @@
+import os
+
+
+def is_even(session) -> bool:
+    """
+    Checks if the session number is even
+    """
+    return session["number"] % 2 == 0
+
+
+def square(session) -> None:
+    """
+    Squares the session number and records the worker pid
+    """
+    session["number"] = session["number"] ** 2
+    session["pid"] = os.getpid()